@@ -0,0 +1,155 @@
+"""Concurrent throughput of the blocking Session path against AsyncSession.
+
+The sync path reproduces what the controllers used to do: a blocking
+``Session.exec`` inside an ``async def``. The async path goes through
+``UserController`` on an ``AsyncSession`` backed by asyncpg. Both run the same
+username lookup as ``get_current_user`` under the same concurrency, while a
+probe task measures how long the event loop is stalled.
+
+    python -m benchmarks.async_session --concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, func, select
+
+from leveluplife.auth.hash import get_password_hash
+from leveluplife.controllers.user import UserController
+from leveluplife.database import (
+    create_app_engine,
+    create_async_app_engine,
+    create_session_factory,
+)
+from leveluplife.models.table import User
+from leveluplife.models.user import Tribe
+from leveluplife.settings import Settings
+
+USERNAME_PREFIX = "bench_user_"
+
+
+def seed_users(engine, count: int) -> list[str]:
+    SQLModel.metadata.create_all(engine)
+    usernames = [f"{USERNAME_PREFIX}{i}" for i in range(count)]
+    with Session(engine) as session:
+        existing = session.exec(
+            select(func.count())
+            .select_from(User)
+            .where(User.username.startswith(USERNAME_PREFIX))
+        ).one()
+        if existing < count:
+            password = get_password_hash("benchmark")
+            for username in usernames[existing:]:
+                session.add(
+                    User(
+                        username=username,
+                        email=f"{username}@bench.leveluplife.dev",
+                        tribe=random.choice(list(Tribe)),
+                        password=password,
+                    )
+                )
+            session.commit()
+    return usernames
+
+
+async def probe_event_loop(stop: asyncio.Event, lags: list[float]) -> None:
+    interval = 0.001
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(
+    lookup: Callable[[str], Awaitable[None]],
+    usernames: list[str],
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    lags: list[float] = []
+
+    async def one_request(username: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await lookup(username)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_event_loop(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(one_request(random.choice(usernames)) for _ in range(requests))
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        "loop_lag_max_ms": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    settings = Settings(DB_ECHO=False, DB_POOL_SIZE=args.concurrency)
+    sync_engine = create_app_engine(settings)
+    async_engine = create_async_app_engine(settings)
+    session_factory = create_session_factory(async_engine)
+    usernames = seed_users(sync_engine, args.users)
+    slow_query = text("SELECT pg_sleep(:seconds)")
+    seconds = args.slow_ms / 1000
+
+    async def sync_lookup(username: str) -> None:
+        with Session(sync_engine) as session:
+            if seconds:
+                session.exec(slow_query, params={"seconds": seconds})
+            session.exec(select(User).where(User.username == username)).one()
+
+    async def async_lookup(username: str) -> None:
+        async with session_factory() as session:
+            if seconds:
+                await session.exec(slow_query, params={"seconds": seconds})
+            await UserController(session).get_user_by_username_with_password(username)
+
+    results = {}
+    for name, lookup in (("sync", sync_lookup), ("async", async_lookup)):
+        # Warm up the pool so both paths start with open connections.
+        await run(lookup, usernames, args.concurrency, args.concurrency)
+        results[name] = await run(lookup, usernames, args.requests, args.concurrency)
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--slow-ms", type=float, default=0, help="server-side delay per request"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    benchmark_results = asyncio.run(main(arguments))
+    for path, result in benchmark_results.items():
+        print(f"{path:>5}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark_results, output, indent=2)
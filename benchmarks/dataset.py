@@ -0,0 +1,275 @@
+"""Seed the database with a reproducible synthetic dataset.
+
+Rows are generated with the same ``Faker("fr_FR")`` setup as the test suite
+and bulk inserted, so a million rows load in minutes. The scale is the total
+number of rows across every table.
+
+    python -m benchmarks.dataset --scale 100k --reset
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterator
+from uuid import UUID, uuid4
+
+from faker import Faker
+from sqlalchemy import Engine, insert
+from sqlmodel import SQLModel
+
+from leveluplife.auth.hash import get_password_hash
+from leveluplife.database import create_app_engine
+from leveluplife.models.quest import Type
+from leveluplife.models.reaction import ReactionType
+from leveluplife.models.relationship import QuestStatus, UserItemLink, UserQuestLink
+from leveluplife.models.table import Comment, Item, Quest, Rating, Reaction, Task, User
+from leveluplife.models.user import Tribe
+from leveluplife.settings import Settings
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BENCHMARK_PASSWORD = "benchmark"
+BATCH_SIZE = 5_000
+
+# Share of the total rows given to each table
+PROPORTIONS = {
+    "users": 0.04,
+    "items": 0.01,
+    "quests": 0.01,
+    "tasks": 0.20,
+    "item_links": 0.06,
+    "quest_links": 0.06,
+    "ratings": 0.20,
+    "comments": 0.20,
+    "reactions": 0.22,
+}
+
+
+@dataclass
+class Dataset:
+    scale: int
+    counts: dict[str, int] = field(default_factory=dict)
+    user_ids: list[UUID] = field(default_factory=list)
+    usernames: list[str] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    item_ids: list[UUID] = field(default_factory=list)
+    item_names: list[str] = field(default_factory=list)
+    quest_ids: list[UUID] = field(default_factory=list)
+    task_ids: list[UUID] = field(default_factory=list)
+    task_titles: list[str] = field(default_factory=list)
+    rating_ids: list[UUID] = field(default_factory=list)
+    comment_ids: list[UUID] = field(default_factory=list)
+    reaction_ids: list[UUID] = field(default_factory=list)
+
+
+def parse_scale(value: str) -> int:
+    return SCALES.get(value.lower()) or int(value)
+
+
+def _batches(rows: Iterator[dict], size: int = BATCH_SIZE) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _pairs(count: int, left: list[UUID], right: list[UUID]) -> Iterator[tuple]:
+    # Each left row is paired with consecutive right rows from its own
+    # offset, so pairs are distinct and spread over the whole right side.
+    for index in range(min(count, len(left) * len(right))):
+        row, lap = index % len(left), index // len(left)
+        yield left[row], right[(lap + row * 7919) % len(right)]
+
+
+def _created_at(index: int) -> datetime:
+    return datetime(2024, 1, 1) + timedelta(seconds=index)
+
+
+def seed(engine: Engine, scale: int, seed_value: int = 0, reset: bool = False):
+    faker = Faker("fr_FR")
+    Faker.seed(seed_value)
+    rng = random.Random(seed_value)
+
+    if reset:
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    counts = {table: max(1, int(scale * share)) for table, share in PROPORTIONS.items()}
+    dataset = Dataset(scale=scale, counts=counts)
+    password = get_password_hash(BENCHMARK_PASSWORD)
+
+    def users():
+        for index in range(counts["users"]):
+            user_id = uuid4()
+            username = f"{faker.user_name()[:10]}_{index}"
+            email = f"{username}@{faker.free_email_domain()}"
+            dataset.user_ids.append(user_id)
+            dataset.usernames.append(username)
+            dataset.emails.append(email)
+            yield {
+                "id": user_id,
+                "username": username,
+                "email": email,
+                "tribe": rng.choice(list(Tribe)),
+                "biography": faker.text(max_nb_chars=200),
+                "created_at": _created_at(index),
+                "strength": rng.randint(0, 20),
+                "intelligence": rng.randint(0, 20),
+                "agility": rng.randint(0, 20),
+                "wise": rng.randint(0, 20),
+                "psycho": rng.randint(0, 20),
+                "experience": rng.randint(0, 5000),
+                "password": password,
+            }
+
+    def items():
+        for index in range(counts["items"]):
+            item_id = uuid4()
+            name = f"{faker.word()}_{index}"
+            dataset.item_ids.append(item_id)
+            dataset.item_names.append(name)
+            yield {
+                "id": item_id,
+                "name": name,
+                "description": faker.sentence(),
+                "price_sell": rng.randint(0, 1000),
+                "strength": rng.randint(0, 10),
+                "intelligence": rng.randint(0, 10),
+                "agility": rng.randint(0, 10),
+                "wise": rng.randint(0, 10),
+                "psycho": rng.randint(0, 10),
+                "created_at": _created_at(index),
+            }
+
+    def quests():
+        for index in range(counts["quests"]):
+            quest_id = uuid4()
+            dataset.quest_ids.append(quest_id)
+            yield {
+                "id": quest_id,
+                "name": f"{faker.word()}_{index}",
+                "description": faker.sentence(),
+                "xp_reward": rng.randint(0, 500),
+                "type": rng.choice(list(Type)),
+                "created_at": _created_at(index),
+            }
+
+    def tasks():
+        for index in range(counts["tasks"]):
+            task_id = uuid4()
+            title = f"{faker.word()}_{index}"
+            dataset.task_ids.append(task_id)
+            dataset.task_titles.append(title)
+            yield {
+                "id": task_id,
+                "title": title,
+                "description": faker.text(max_nb_chars=300),
+                "completed": rng.random() < 0.5,
+                "category": faker.word(),
+                "user_id": rng.choice(dataset.user_ids),
+                "created_at": _created_at(index),
+            }
+
+    def item_links():
+        for user_id, item_id in _pairs(
+            counts["item_links"], dataset.user_ids, dataset.item_ids
+        ):
+            yield {
+                "user_id": user_id,
+                "item_id": item_id,
+                "equipped": rng.random() < 0.3,
+            }
+
+    def quest_links():
+        for user_id, quest_id in _pairs(
+            counts["quest_links"], dataset.user_ids, dataset.quest_ids
+        ):
+            yield {
+                "user_id": user_id,
+                "quest_id": quest_id,
+                "quest_start": datetime(2024, 1, 1),
+                "status": rng.choice(list(QuestStatus)),
+            }
+
+    def task_feedback(table: str, ids: list[UUID], values):
+        for index, (task_id, user_id) in enumerate(
+            _pairs(counts[table], dataset.task_ids, dataset.user_ids)
+        ):
+            row_id = uuid4()
+            ids.append(row_id)
+            yield {
+                "id": row_id,
+                "task_id": task_id,
+                "user_id": user_id,
+                "created_at": _created_at(index),
+                **values(),
+            }
+
+    tables = [
+        ("users", User, users()),
+        ("items", Item, items()),
+        ("quests", Quest, quests()),
+        ("tasks", Task, tasks()),
+        ("item_links", UserItemLink, item_links()),
+        ("quest_links", UserQuestLink, quest_links()),
+        (
+            "ratings",
+            Rating,
+            task_feedback(
+                "ratings", dataset.rating_ids, lambda: {"rating": rng.randint(0, 10)}
+            ),
+        ),
+        (
+            "comments",
+            Comment,
+            task_feedback(
+                "comments",
+                dataset.comment_ids,
+                lambda: {"content": faker.text(max_nb_chars=200)},
+            ),
+        ),
+        (
+            "reactions",
+            Reaction,
+            task_feedback(
+                "reactions",
+                dataset.reaction_ids,
+                lambda: {"reaction": rng.choice(list(ReactionType))},
+            ),
+        ),
+    ]
+    for table, model, rows in tables:
+        inserted = 0
+        with engine.begin() as connection:
+            for batch in _batches(rows):
+                connection.execute(insert(model), batch)
+                inserted += len(batch)
+        counts[table] = inserted
+    return dataset
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1m or a number")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="drop tables first")
+    arguments = parser.parse_args()
+
+    started = time.perf_counter()
+    seed_engine = create_app_engine(Settings(DB_ECHO=False))
+    seeded = seed(
+        seed_engine,
+        parse_scale(arguments.scale),
+        seed_value=arguments.seed,
+        reset=arguments.reset,
+    )
+    seed_engine.dispose()
+    print(
+        f"Seeded {sum(seeded.counts.values())} rows in "
+        f"{time.perf_counter() - started:.1f}s: {seeded.counts}"
+    )
@@ -0,0 +1,361 @@
+"""Drive concurrent virtual users against the application and report latencies.
+
+Each virtual user logs in through ``/token/`` as a seeded user, then loops over
+a weighted mix of browsing users and tasks, reacting and commenting. Requests
+go in-process through ``create_app`` with an httpx ``ASGITransport`` unless
+``--url`` points at a running server (``uvicorn main:app --workers 4``). Works
+offline against any database ``database_url`` points at, Postgres or SQLite.
+
+In process every login comes from one client address, so the app runs with a
+login rate limiter sized to the virtual users unless ``--rate-limit`` keeps
+the configured one. A running server applies its own limits, size them with
+the ``LOGIN_RATE_LIMIT_*`` settings. A virtual user that cannot log in counts
+as an error of ``token.login``.
+
+    python -m benchmarks.loadtest --seed 10k --users 50 --duration 30
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --output load.json
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import platform
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+from loguru import logger
+from sqlmodel import select
+
+from benchmarks.dataset import BENCHMARK_PASSWORD, parse_scale, seed
+from benchmarks.routes import git_revision
+from leveluplife.api import create_app
+from leveluplife.database import (
+    create_app_engine,
+    create_async_app_engine,
+    create_session_factory,
+)
+from leveluplife.models.reaction import ReactionType
+from leveluplife.models.table import User
+from leveluplife.pagination import NEXT_CURSOR_HEADER
+from leveluplife.ratelimit import (
+    BucketPolicy,
+    LoginRateLimiter,
+    MemoryRateLimitBackend,
+    login_rate_limiter,
+)
+from leveluplife.settings import Settings
+from main import lifespan
+
+# Upper bounds in milliseconds of the latency histogram buckets
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Relative weight of each action in the virtual user loop
+MIX = {
+    "users.list": 30,
+    "users.by_id": 25,
+    "tasks.by_id": 25,
+    "reactions.create": 10,
+    "comments.create": 10,
+}
+
+
+@dataclass
+class RouteStats:
+    durations: list[float] = field(default_factory=list)
+    client_errors: int = 0
+    server_errors: int = 0
+    # Server errors, lost connections and failures a virtual user cannot go on after
+    errors: int = 0
+
+    def record(
+        self, duration: float, status_code: int | None, failed: bool = False
+    ) -> None:
+        self.durations.append(duration)
+        if status_code is None or status_code >= 500:
+            self.server_errors += 1
+            failed = True
+        elif status_code >= 400:
+            self.client_errors += 1
+        if failed:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        durations = sorted(self.durations)
+        count = len(durations)
+
+        def percentile(rank: float) -> float:
+            return round(durations[min(count - 1, int(count * rank))] * 1000, 3)
+
+        histogram = [0] * (len(BUCKETS_MS) + 1)
+        for duration in durations:
+            histogram[bisect.bisect_left(BUCKETS_MS, duration * 1000)] += 1
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 2),
+            "client_errors": self.client_errors,
+            "server_errors": self.server_errors,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(durations[-1] * 1000, 3),
+            "histogram": {
+                **{f"<={bound}ms": n for bound, n in zip(BUCKETS_MS, histogram)},
+                f">{BUCKETS_MS[-1]}ms": histogram[-1],
+            },
+        }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.stats: defaultdict[str, RouteStats] = defaultdict(RouteStats)
+        self.usernames: list[str] = []
+        self.user_ids: list[str] = []
+        self.task_ids: list[str] = []
+        self.failed_logins = 0
+
+    async def request(
+        self,
+        route: str,
+        method: str,
+        url: str,
+        expected_status: int | None = None,
+        **kwargs,
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        status_code = response.status_code if response is not None else None
+        self.stats[route].record(
+            time.perf_counter() - started,
+            status_code,
+            failed=expected_status is not None and status_code != expected_status,
+        )
+        return response
+
+    async def sample(self, headers: dict[str, str]) -> None:
+        users = (
+            await self.client.get("/users/", params={"limit": 100}, headers=headers)
+        ).json()
+        tasks = (
+            await self.client.get("/tasks/", params={"limit": 100}, headers=headers)
+        ).json()
+        self.usernames = [user["username"] for user in users]
+        self.user_ids = [user["id"] for user in users]
+        self.task_ids = [task["id"] for task in tasks]
+
+    async def login(self, username: str) -> dict[str, str] | None:
+        response = await self.request(
+            "token.login",
+            "POST",
+            "/token/",
+            expected_status=200,
+            data={"username": username, "password": BENCHMARK_PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            self.failed_logins += 1
+            return None
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def virtual_user(self, number: int, deadline: float) -> None:
+        rng = random.Random(number)
+        username = self.usernames[number % len(self.usernames)]
+        headers = await self.login(username)
+        if headers is None:
+            return
+        me = (await self.client.get("/users/me/", headers=headers)).json()
+        actions, weights = zip(*MIX.items())
+        cursor = None
+
+        while time.perf_counter() < deadline:
+            action = rng.choices(actions, weights)[0]
+            if action == "users.list":
+                params = {"cursor": cursor} if cursor else {}
+                response = await self.request(
+                    action, "GET", "/users/", params=params, headers=headers
+                )
+                cursor = response and response.headers.get(NEXT_CURSOR_HEADER)
+            elif action == "users.by_id":
+                user_id = rng.choice(self.user_ids)
+                await self.request(action, "GET", f"/users/{user_id}", headers=headers)
+            elif action == "tasks.by_id":
+                task_id = rng.choice(self.task_ids)
+                await self.request(action, "GET", f"/tasks/{task_id}", headers=headers)
+            elif action == "reactions.create":
+                await self.request(
+                    action,
+                    "POST",
+                    "/reactions/",
+                    json={
+                        "user_id": me["id"],
+                        "task_id": rng.choice(self.task_ids),
+                        "reaction": rng.choice(list(ReactionType)).value,
+                    },
+                    headers=headers,
+                )
+            elif action == "comments.create":
+                await self.request(
+                    action,
+                    "POST",
+                    "/comments/",
+                    json={
+                        "user_id": me["id"],
+                        "task_id": rng.choice(self.task_ids),
+                        "content": f"Load test comment {rng.random():.6f}",
+                    },
+                    headers=headers,
+                )
+            if self.args.think_ms:
+                await asyncio.sleep(rng.uniform(0, 2 * self.args.think_ms) / 1000)
+
+    async def run(self, username: str) -> dict:
+        headers = await self.login(username)
+        if headers is None:
+            raise SystemExit(f"Cannot log in as {username}, seed a dataset")
+        await self.sample(headers)
+        self.stats.clear()
+        self.failed_logins = 0
+        if not self.usernames or not self.task_ids:
+            raise SystemExit("No users or tasks found, seed a dataset with --seed")
+
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        await asyncio.gather(
+            *(self.virtual_user(number, deadline) for number in range(self.args.users))
+        )
+        elapsed = time.perf_counter() - started
+
+        results = {
+            route: stats.summary(elapsed)
+            for route, stats in sorted(self.stats.items())
+            if stats.durations
+        }
+        total = sum(result["requests"] for result in results.values())
+        return {
+            "meta": {
+                "revision": git_revision(),
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "target": self.args.url or "asgi",
+                "users": self.args.users,
+                "duration_s": round(elapsed, 3),
+                "think_ms": self.args.think_ms,
+                "requests": total,
+                "rps": round(total / elapsed, 2),
+                "failed_logins": self.failed_logins,
+            },
+            "results": results,
+        }
+
+
+async def first_username(app: FastAPI) -> str:
+    async with app.state.session_factory() as session:
+        user = (await session.exec(select(User).order_by(User.username))).first()
+    if user is None:
+        raise SystemExit("No users found, seed a dataset with --seed")
+    return user.username
+
+
+def report(benchmark: dict) -> None:
+    meta = benchmark["meta"]
+    print(
+        f"{meta['users']} users for {meta['duration_s']}s against {meta['target']}: "
+        f"{meta['requests']} requests, {meta['rps']} req/s"
+    )
+    print(
+        f"{'route':<18} {'requests':>8} {'req/s':>8} {'p50':>10} {'p95':>10} "
+        f"{'p99':>10} {'4xx':>6} {'errors':>7}"
+    )
+    for route, result in benchmark["results"].items():
+        print(
+            f"{route:<18} {result['requests']:>8} {result['rps']:>8.1f} "
+            f"{result['p50_ms']:>8.2f}ms {result['p95_ms']:>8.2f}ms "
+            f"{result['p99_ms']:>8.2f}ms {result['client_errors']:>6} "
+            f"{result['error_rate']:>7.2%}"
+        )
+    if meta["failed_logins"]:
+        print(
+            f"{meta['failed_logins']} of {meta['users']} virtual users could not "
+            "log in, their load is missing from the results"
+        )
+
+
+def loadtest_limiter(args: argparse.Namespace) -> LoginRateLimiter:
+    # Every virtual user and the sampling login share the in-process client
+    # address, and seeded usernames repeat past the sampled page
+    policy = BucketPolicy(burst=args.users + 1, per_minute=60)
+    return LoginRateLimiter(
+        MemoryRateLimitBackend(maxsize=args.users + 1),
+        ip_policy=policy,
+        username_policy=policy,
+    )
+
+
+async def main(args: argparse.Namespace) -> dict:
+    settings = Settings(DB_ECHO=False)
+    if args.seed:
+        engine = create_app_engine(settings)
+        seed(engine, parse_scale(args.seed), reset=True)
+        engine.dispose()
+
+    if args.url:
+        if not args.username:
+            raise SystemExit("Pass --username of a seeded user with --url")
+        async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+            return await LoadTest(client, args).run(args.username)
+
+    app = create_app(
+        lifespan=lifespan,
+        rate_limiter=login_rate_limiter if args.rate_limit else loadtest_limiter(args),
+    )
+    async_engine = create_async_app_engine(settings)
+    app.state.engine = async_engine
+    app.state.session_factory = create_session_factory(async_engine)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=30
+        ) as client:
+            username = args.username or await first_username(app)
+            return await LoadTest(client, args).run(username)
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", help="reset and seed a 10k, 100k or 1m dataset")
+    parser.add_argument("--users", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument(
+        "--think-ms", type=float, default=0, help="mean pause between requests"
+    )
+    parser.add_argument("--url", help="base URL of a running server")
+    parser.add_argument("--username", help="seeded user sampling the dataset")
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="keep the configured login rate limits in process",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--log", action="store_true", help="keep request logging")
+    arguments = parser.parse_args()
+
+    if not arguments.log:
+        logger.remove()
+    benchmark = asyncio.run(main(arguments))
+    report(benchmark)
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
@@ -0,0 +1,92 @@
+"""Login throughput with bcrypt inline on the event loop against the process pool.
+
+The inline path reproduces what ``authenticate_user`` used to do: a blocking
+``verify_password`` inside the coroutine. The pool path runs the current
+``authenticate_user`` with ``password_hasher`` resized to each worker count.
+A probe task measures how long the event loop is stalled in both cases. Seed a
+dataset first with ``benchmarks.dataset``.
+
+    python -m benchmarks.login --requests 200 --concurrency 32 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+from loguru import logger
+from sqlmodel import select
+
+from benchmarks.async_session import run
+from benchmarks.dataset import BENCHMARK_PASSWORD
+from leveluplife.auth.hash import verify_password
+from leveluplife.auth.pool import password_hasher
+from leveluplife.auth.utils import authenticate_user
+from leveluplife.controllers.user import UserController
+from leveluplife.database import create_async_app_engine, create_session_factory
+from leveluplife.models.table import User
+from leveluplife.settings import Settings
+
+
+async def main(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    settings = Settings(DB_ECHO=False, DB_POOL_SIZE=args.concurrency)
+    engine = create_async_app_engine(settings)
+    session_factory = create_session_factory(engine)
+    async with session_factory() as session:
+        usernames = (await session.exec(select(User.username).limit(100))).all()
+    if not usernames:
+        raise SystemExit("No users found, seed a dataset with benchmarks.dataset")
+
+    async def inline_login(username: str) -> None:
+        async with session_factory() as session:
+            user = await UserController(session).get_user_by_username_with_password(
+                username
+            )
+            assert verify_password(BENCHMARK_PASSWORD, user.password)
+
+    async def pool_login(username: str) -> None:
+        async with session_factory() as session:
+            assert await authenticate_user(
+                UserController(session), username, BENCHMARK_PASSWORD
+            )
+
+    results = {
+        "inline": await run(inline_login, usernames, args.requests, args.concurrency)
+    }
+    for workers in args.workers:
+        password_hasher.shutdown()
+        password_hasher.workers = workers
+        password_hasher.queue_size = args.requests
+        # Spawn the workers before timing, as the application lifespan does
+        password_hasher.start()
+        await run(pool_login, usernames, workers, workers)
+        results[f"pool_{workers}"] = await run(
+            pool_login, usernames, args.requests, args.concurrency
+        )
+    password_hasher.shutdown()
+
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="pool sizes to measure",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    logger.remove()
+    benchmark_results = asyncio.run(main(arguments))
+    for path, result in benchmark_results.items():
+        print(f"{path:>8}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark_results, output, indent=2)
@@ -0,0 +1,120 @@
+"""Memory and CPU of list pages read as entities against projected columns.
+
+Each list endpoint's page query runs with a large ``--limit`` in two ways:
+selecting the table's entity and validating every row into its view, as the
+controllers used to, and selecting only the view's columns as plain rows
+built with ``construct_views``, as they do now. CPU is process time per page,
+memory the peak traced by ``tracemalloc`` while the page is read and built.
+Seed a dataset with enough rows first, 100k gives 10k-row pages.
+
+    python -m benchmarks.dataset --scale 100k --reset
+    python -m benchmarks.projections --limit 10000 --iterations 5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from sqlmodel import select
+
+from leveluplife.controllers.comment import COMMENT_VIEWS
+from leveluplife.controllers.item import ITEM_VIEWS
+from leveluplife.controllers.quest import QUEST_VIEWS
+from leveluplife.controllers.rating import RATING_VIEWS
+from leveluplife.controllers.reaction import REACTION_VIEWS
+from leveluplife.controllers.task import TASK_VIEWS
+from leveluplife.database import create_async_app_engine, create_session_factory
+from leveluplife.models.table import Comment, Item, Quest, Rating, Reaction, Task
+from leveluplife.models.view import (
+    CommentView,
+    ItemView,
+    QuestView,
+    RatingView,
+    ReactionView,
+    TaskView,
+    construct_views,
+)
+from leveluplife.pagination import paginate
+from leveluplife.settings import Settings
+
+PAGES = {
+    "tasks": (Task, TaskView, TASK_VIEWS),
+    "items": (Item, ItemView, ITEM_VIEWS),
+    "quests": (Quest, QuestView, QUEST_VIEWS),
+    "ratings": (Rating, RatingView, RATING_VIEWS),
+    "comments": (Comment, CommentView, COMMENT_VIEWS),
+    "reactions": (Reaction, ReactionView, REACTION_VIEWS),
+}
+
+
+async def measure(
+    read_page: Callable[[], Awaitable[list]], iterations: int
+) -> dict[str, float]:
+    await read_page()
+    started = time.process_time()
+    for _ in range(iterations):
+        await read_page()
+    cpu_ms = (time.process_time() - started) / iterations * 1000
+
+    tracemalloc.start()
+    page = await read_page()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": len(page), "cpu_ms": cpu_ms, "peak_mib": peak / 2**20}
+
+
+async def main(args: argparse.Namespace) -> dict:
+    engine = create_async_app_engine(Settings(DB_ECHO=False))
+    session_factory = create_session_factory(engine)
+    results = {}
+    async with session_factory() as session:
+        for name, (table, view, projected) in PAGES.items():
+            order_by = (table.created_at, table.id)
+
+            async def read_entities() -> list:
+                session.expunge_all()
+                rows = await session.exec(
+                    paginate(select(table), order_by, 0, args.limit)
+                )
+                return [view.model_validate(row) for row in rows.all()]
+
+            async def read_projections() -> list:
+                rows = await session.exec(paginate(projected, order_by, 0, args.limit))
+                return construct_views(rows, view)
+
+            if not await read_projections():
+                sys.exit(f"No {name} found, seed a dataset with benchmarks.dataset")
+            assert await read_entities() == await read_projections()
+            results[name] = {
+                "entities": await measure(read_entities, args.iterations),
+                "projections": await measure(read_projections, args.iterations),
+            }
+            session.expunge_all()
+    await engine.dispose()
+
+    print(f"{'page':<10} {'rows':>6} {'cpu ms':>21} {'peak MiB':>21}")
+    for name, result in results.items():
+        entities, projections = result["entities"], result["projections"]
+        print(
+            f"{name:<10} {projections['rows']:>6} "
+            f"{entities['cpu_ms']:>9.1f} -> {projections['cpu_ms']:>8.1f} "
+            f"{entities['peak_mib']:>9.1f} -> {projections['peak_mib']:>8.1f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    benchmark = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
@@ -0,0 +1,240 @@
+"""Time every router of the application in-process through its ASGI app.
+
+Requests go through ``create_app`` with an httpx ``ASGITransport``, so the
+numbers include routing, authentication, validation and serialization but no
+network. Seed a dataset first (or pass ``--seed``), then compare runs of two
+branches with ``--compare``.
+
+    python -m benchmarks.routes --seed 100k --output main.json
+    python -m benchmarks.routes --output branch.json --compare main.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+from loguru import logger
+from sqlmodel import select
+
+from benchmarks.dataset import BENCHMARK_PASSWORD, parse_scale, seed
+from leveluplife.api import create_app
+from leveluplife.database import (
+    create_app_engine,
+    create_async_app_engine,
+    create_session_factory,
+)
+from leveluplife.models.table import Comment, Item, Quest, Rating, Reaction, Task, User
+from leveluplife.settings import Settings
+from main import lifespan
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    url: str
+    params: dict = field(default_factory=dict)
+    data: dict | None = None
+    iterations: int | None = None
+
+
+async def build_cases(app: FastAPI, iterations: int) -> list[Case]:
+    async with app.state.session_factory() as session:
+
+        async def first(model, order_by):
+            row = (await session.exec(select(model).order_by(order_by))).first()
+            if row is None:
+                sys.exit(f"No {model.__name__} found, seed a dataset with --seed")
+            return row
+
+        user = await first(User, User.username)
+        task = await first(Task, Task.created_at)
+        item = await first(Item, Item.created_at)
+        quest = await first(Quest, Quest.created_at)
+        rating = await first(Rating, Rating.created_at)
+        comment = await first(Comment, Comment.created_at)
+        reaction = await first(Reaction, Reaction.created_at)
+
+    return [
+        Case(
+            "token.login",
+            "POST",
+            "/token/",
+            data={"username": user.username, "password": BENCHMARK_PASSWORD},
+            # bcrypt dominates this route, a few samples are enough
+            iterations=max(3, iterations // 10),
+        ),
+        Case("users.me", "GET", "/users/me/"),
+        Case("users.list", "GET", "/users/"),
+        Case("users.by_id", "GET", f"/users/{user.id}"),
+        Case(
+            "users.by_username",
+            "GET",
+            "/users/type/username",
+            {"user_username": user.username},
+        ),
+        Case("users.by_email", "GET", "/users/type/email", {"user_email": user.email}),
+        Case(
+            "users.by_tribe",
+            "GET",
+            "/users/type/tribe",
+            {"user_tribe": user.tribe.value},
+        ),
+        Case("tasks.list", "GET", "/tasks/"),
+        Case("tasks.by_id", "GET", f"/tasks/{task.id}"),
+        Case("tasks.by_title", "GET", "/tasks/type/title", {"task_title": task.title}),
+        Case("items.list", "GET", "/items/"),
+        Case("items.by_id", "GET", f"/items/{item.id}"),
+        Case("items.by_name", "GET", "/items/type/name", {"item_name": item.name}),
+        Case("quests.list", "GET", "/quests/"),
+        Case("quests.by_id", "GET", f"/quests/{quest.id}"),
+        Case("ratings.list", "GET", "/ratings/"),
+        Case("ratings.by_id", "GET", f"/ratings/{rating.id}"),
+        Case("comments.list", "GET", "/comments/"),
+        Case("comments.by_id", "GET", f"/comments/{comment.id}"),
+        Case("reactions.list", "GET", "/reactions/"),
+        Case("reactions.by_id", "GET", f"/reactions/{reaction.id}"),
+    ]
+
+
+async def time_case(
+    client: httpx.AsyncClient, case: Case, iterations: int, warmup: int
+) -> dict:
+    durations = []
+    errors = 0
+    for iteration in range(warmup + (case.iterations or iterations)):
+        started = time.perf_counter()
+        response = await client.request(
+            case.method,
+            case.url,
+            params=case.params,
+            data=case.data,
+        )
+        duration = time.perf_counter() - started
+        if iteration < warmup:
+            continue
+        durations.append(duration)
+        if response.status_code >= 400:
+            errors += 1
+
+    durations.sort()
+    return {
+        "iterations": len(durations),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(durations) * 1000, 3),
+        "p50_ms": round(statistics.median(durations) * 1000, 3),
+        "p95_ms": round(durations[int(len(durations) * 0.95)] * 1000, 3),
+        "min_ms": round(durations[0] * 1000, 3),
+        "max_ms": round(durations[-1] * 1000, 3),
+        "response_bytes": len(response.content),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    settings = Settings(DB_ECHO=False)
+    if args.seed:
+        engine = create_app_engine(settings)
+        seed(engine, parse_scale(args.seed), reset=True)
+        engine.dispose()
+
+    app = create_app(lifespan=lifespan)
+    async_engine = create_async_app_engine(settings)
+    app.state.engine = async_engine
+    app.state.session_factory = create_session_factory(async_engine)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        cases = await build_cases(app, args.iterations)
+        login = cases[0]
+        token = (await client.post(login.url, data=login.data)).json()
+        client.headers["Authorization"] = f"Bearer {token['access_token']}"
+        for case in cases:
+            if args.only and not case.name.startswith(tuple(args.only)):
+                continue
+            results[case.name] = await time_case(
+                client, case, args.iterations, args.warmup
+            )
+            print(
+                f"{case.name:<20} p50={results[case.name]['p50_ms']:>9.3f}ms "
+                f"p95={results[case.name]['p95_ms']:>9.3f}ms "
+                f"errors={results[case.name]['errors']}"
+            )
+
+    await async_engine.dispose()
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'route':<20} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        change = result["p50_ms"] / previous["p50_ms"] - 1
+        flag = " REGRESSION" if change > threshold else ""
+        print(
+            f"{name:<20} {previous['p50_ms']:>10.3f}ms {result['p50_ms']:>10.3f}ms "
+            f"{change:>+7.1%}{flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", help="reset and seed a 10k, 100k or 1m dataset")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="route name prefixes to run")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a baseline run")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="p50 slowdown flagged"
+    )
+    parser.add_argument("--log", action="store_true", help="keep request logging")
+    arguments = parser.parse_args()
+
+    if not arguments.log:
+        logger.remove()
+    benchmark = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            if compare(benchmark, json.load(baseline_file), arguments.threshold):
+                sys.exit(1)
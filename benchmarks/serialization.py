@@ -0,0 +1,158 @@
+"""CPU spent turning a page of user views into a JSON response body.
+
+A page of ``--users`` views, each with ``--relations`` tasks, comments,
+ratings and items, goes through the response pipeline of ``GET /users/``. The
+``before`` case replays what the route used to do: validate every view again
+in the route, have FastAPI validate and serialize the ``response_model``, then
+encode it with the standard library. The ``after`` case renders the page as
+the route now returns it, a ``ViewResponse`` that FastAPI passes through as
+it is. No database is needed.
+
+    python -m benchmarks.serialization --users 20 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from leveluplife.api import create_app
+from leveluplife.models.user import Tribe
+from leveluplife.models.view import (
+    CommentView,
+    ItemUserView,
+    RatingView,
+    TaskView,
+    UserView,
+)
+from leveluplife.responses import ViewResponse
+
+
+def build_page(users: int, relations: int) -> list[UserView]:
+    now = datetime.now()
+    page = []
+    for index in range(users):
+        user_id = uuid4()
+        tasks = [
+            TaskView(
+                id=uuid4(),
+                created_at=now,
+                title=f"task-{index}-{number}",
+                description="Finish the chapter and write down the key ideas " * 4,
+                completed=number % 2 == 0,
+                category="reading",
+                user_id=user_id,
+            )
+            for number in range(relations)
+        ]
+        page.append(
+            UserView(
+                id=user_id,
+                created_at=now,
+                username=f"user{index:05d}",
+                email=f"user{index}@example.com",
+                tribe=Tribe.VALHARS,
+                tasks=tasks,
+                comments=[
+                    CommentView(
+                        id=uuid4(),
+                        created_at=now,
+                        content="Well done, keep going! " * 10,
+                        user_id=user_id,
+                        task_id=task.id,
+                    )
+                    for task in tasks
+                ],
+                ratings=[
+                    RatingView(
+                        id=uuid4(),
+                        created_at=now,
+                        rating=4,
+                        user_id=user_id,
+                        task_id=task.id,
+                    )
+                    for task in tasks
+                ],
+                items=[
+                    ItemUserView(
+                        id=uuid4(),
+                        created_at=now,
+                        name=f"item-{number}",
+                        description="A sturdy wooden shield",
+                        strength=number,
+                        equipped=number == 0,
+                    )
+                    for number in range(relations)
+                ],
+            )
+        )
+    return page
+
+
+async def time_per_response(
+    render: Callable[[], Awaitable[bytes]], iterations: int
+) -> float:
+    for _ in range(min(iterations, 50)):
+        await render()
+    started = time.process_time()
+    for _ in range(iterations):
+        await render()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+async def main(args: argparse.Namespace) -> dict:
+    app = create_app(lifespan=None)
+    route = next(
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path == "/users/"
+        and "GET" in route.methods
+    )
+    page = build_page(args.users, args.relations)
+
+    async def before() -> bytes:
+        content = await serialize_response(
+            field=route.response_field,
+            response_content=[UserView.model_validate(user) for user in page],
+        )
+        return JSONResponse(content).body
+
+    async def after() -> bytes:
+        return ViewResponse(page).body
+
+    assert json.loads(await before()) == json.loads(await after())
+    results = {
+        "users": args.users,
+        "relations": args.relations,
+        "bytes": len(await after()),
+        "before_us": await time_per_response(before, args.iterations),
+        "after_us": await time_per_response(after, args.iterations),
+    }
+    print(
+        f"{args.users} users, {results['bytes']} bytes per response\n"
+        f"before {results['before_us']:>10.1f} us CPU per response\n"
+        f"after  {results['after_us']:>10.1f} us CPU per response "
+        f"({results['before_us'] / results['after_us']:.1f}x)"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--relations", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    benchmark = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
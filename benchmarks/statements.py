@@ -0,0 +1,128 @@
+"""Cost of building and compiling controller queries on every call.
+
+The build phase compares what a controller paid for ``select(Task).where(...)``
+on each call (construction, cache key, and compilation when the compiled cache
+misses) with the prebuilt ``TASK_BY_ID`` statement. The execute phase runs
+both styles against the configured database with SQLAlchemy's compiled cache
+and asyncpg's prepared statement cache disabled, then enabled. Seed a dataset
+first with ``benchmarks.dataset``.
+
+    python -m benchmarks.statements --iterations 5000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Callable
+
+from sqlmodel import select
+
+from leveluplife.controllers.task import TASK_BY_ID
+from leveluplife.controllers.user import USER_BY_USERNAME
+from leveluplife.database import create_async_app_engine, create_session_factory
+from leveluplife.models.table import Task, User
+from leveluplife.settings import Settings
+
+
+def time_per_call(function: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def build_phase(dialect, task_id, iterations: int) -> dict[str, float]:
+    def inline():
+        statement = select(Task).where(Task.id == task_id)
+        statement._generate_cache_key()
+        return statement
+
+    def prebuilt():
+        return TASK_BY_ID._generate_cache_key()
+
+    return {
+        "inline_build_us": time_per_call(inline, iterations),
+        "inline_build_compile_us": time_per_call(
+            lambda: inline().compile(dialect=dialect), iterations
+        ),
+        "prebuilt_us": time_per_call(prebuilt, iterations),
+    }
+
+
+async def execute_phase(
+    settings: Settings, task_id, username: str, iterations: int
+) -> dict[str, float]:
+    engine = create_async_app_engine(settings)
+    session_factory = create_session_factory(engine)
+    queries = {
+        "inline": lambda: (
+            select(Task).where(Task.id == task_id),
+            select(User).where(User.username == username),
+            {},
+        ),
+        "prebuilt": lambda: (
+            TASK_BY_ID,
+            USER_BY_USERNAME,
+            {"task_id": task_id, "user_username": username},
+        ),
+    }
+    results = {}
+    async with session_factory() as session:
+        for name, query in queries.items():
+            for iteration in range(iterations + 1):
+                if iteration == 1:
+                    # The first round warms the caches and is not timed
+                    started = time.perf_counter()
+                task_statement, user_statement, params = query()
+                (await session.exec(task_statement, params=params)).one()
+                (await session.exec(user_statement, params=params)).one()
+            results[f"{name}_us"] = (
+                (time.perf_counter() - started) / (iterations * 2) * 1_000_000
+            )
+    await engine.dispose()
+    return results
+
+
+async def main(args: argparse.Namespace) -> dict:
+    settings = Settings(DB_ECHO=False)
+    engine = create_async_app_engine(settings)
+    async with create_session_factory(engine)() as session:
+        task = (await session.exec(select(Task))).first()
+        user = (await session.exec(select(User))).first()
+    dialect = engine.dialect
+    await engine.dispose()
+    if task is None or user is None:
+        sys.exit("No task or user found, seed a dataset with benchmarks.dataset")
+
+    results = {"build": build_phase(dialect, task.id, args.iterations)}
+    for name, overrides in {
+        "uncached": {"DB_QUERY_CACHE_SIZE": 0, "DB_PREPARED_STATEMENT_CACHE_SIZE": 0},
+        "cached": {},
+    }.items():
+        results[f"execute_{name}"] = await execute_phase(
+            settings.model_copy(update=overrides),
+            task.id,
+            user.username,
+            args.iterations // 10,
+        )
+
+    for phase, timings in results.items():
+        print(
+            f"{phase:<18} "
+            + " ".join(f"{key}={value:>8.1f}" for key, value in timings.items())
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    benchmark = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
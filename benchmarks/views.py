@@ -0,0 +1,205 @@
+"""Cost of assembling the collections of user views from database rows.
+
+The ``construct`` phase times only the conversion of rows already fetched:
+ORM entities dumped and validated into views, as the controller used to do,
+against column-projected rows built with ``group_views``. The ``load`` phase
+times the queries of ``UserController`` together with the conversion, so the
+ORM hydration the projected rows skip is counted too. Seed a dataset first
+with ``benchmarks.dataset``.
+
+    python -m benchmarks.views --users 100 --iterations 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+from sqlmodel import func, select
+
+from leveluplife.controllers.user import (
+    _USER_IDS,
+    USER_COMMENTS,
+    USER_ITEMS,
+    USER_QUESTS,
+    USER_RATINGS,
+    USER_REACTIONS,
+    USER_TASKS,
+)
+from leveluplife.database import create_async_app_engine, create_session_factory
+from leveluplife.models.relationship import UserItemLink, UserQuestLink
+from leveluplife.models.table import Comment, Item, Quest, Rating, Reaction, Task
+from leveluplife.models.view import (
+    CommentView,
+    ItemUserView,
+    QuestUserView,
+    RatingView,
+    ReactionView,
+    TaskView,
+    group_views,
+)
+from leveluplife.settings import Settings
+
+# Entity queries and row conversions of the controller before projection
+ENTITY_QUERIES = {
+    "items": select(UserItemLink, Item)
+    .join(Item, UserItemLink.item_id == Item.id)
+    .where(UserItemLink.user_id.in_(_USER_IDS)),
+    "quests": select(UserQuestLink, Quest)
+    .join(Quest, UserQuestLink.quest_id == Quest.id)
+    .where(UserQuestLink.user_id.in_(_USER_IDS)),
+    "tasks": select(Task).where(Task.user_id.in_(_USER_IDS)),
+    "ratings": select(Rating).where(Rating.user_id.in_(_USER_IDS)),
+    "comments": select(Comment).where(Comment.user_id.in_(_USER_IDS)),
+    "reactions": select(Reaction).where(Reaction.user_id.in_(_USER_IDS)),
+}
+ENTITY_VIEWS = {
+    "items": lambda row: (
+        row[0].user_id,
+        ItemUserView(**row[1].model_dump(), equipped=row[0].equipped),
+    ),
+    "quests": lambda row: (
+        row[0].user_id,
+        QuestUserView(
+            quest_start=row[0].quest_start,
+            quest_end=row[0].quest_end,
+            status=row[0].status,
+            **row[1].model_dump(),
+        ),
+    ),
+    "tasks": lambda task: (task.user_id, TaskView(**task.model_dump())),
+    "ratings": lambda rating: (rating.user_id, RatingView(**rating.model_dump())),
+    "comments": lambda comment: (comment.user_id, CommentView(**comment.model_dump())),
+    "reactions": lambda reaction: (
+        reaction.user_id,
+        ReactionView(**reaction.model_dump()),
+    ),
+}
+
+PROJECTED_QUERIES = {
+    "items": (USER_ITEMS, ItemUserView),
+    "quests": (USER_QUESTS, QuestUserView),
+    "tasks": (USER_TASKS, TaskView),
+    "ratings": (USER_RATINGS, RatingView),
+    "comments": (USER_COMMENTS, CommentView),
+    "reactions": (USER_REACTIONS, ReactionView),
+}
+
+
+def build_from_entities(rows: dict[str, list]) -> dict[str, defaultdict]:
+    collections = {}
+    for name, entity_rows in rows.items():
+        views = collections[name] = defaultdict(list)
+        for row in entity_rows:
+            user_id, view = ENTITY_VIEWS[name](row)
+            views[user_id].append(view)
+    return collections
+
+
+def build_from_projections(rows: dict[str, list]) -> dict[str, defaultdict]:
+    return {
+        name: group_views(projected_rows, PROJECTED_QUERIES[name][1])
+        for name, projected_rows in rows.items()
+    }
+
+
+async def time_per_call(
+    call: Callable[[], Awaitable[object]], iterations: int
+) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        await call()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+async def main(args: argparse.Namespace) -> dict:
+    engine = create_async_app_engine(Settings(DB_ECHO=False))
+    session_factory = create_session_factory(engine)
+    async with session_factory() as session:
+        # The users with the most tasks, so the page has collections to build
+        user_ids = (
+            await session.exec(
+                select(Task.user_id)
+                .group_by(Task.user_id)
+                .order_by(func.count().desc())
+                .limit(args.users)
+            )
+        ).all()
+        if not user_ids:
+            sys.exit("No task found, seed a dataset with benchmarks.dataset")
+        params = {"user_ids": list(user_ids)}
+
+        async def fetch_entities() -> dict[str, list]:
+            session.expunge_all()
+            return {
+                name: (await session.exec(query, params=params)).all()
+                for name, query in ENTITY_QUERIES.items()
+            }
+
+        async def fetch_projections() -> dict[str, list]:
+            return {
+                name: (await session.exec(query, params=params)).all()
+                for name, (query, _) in PROJECTED_QUERIES.items()
+            }
+
+        entity_rows = await fetch_entities()
+        projected_rows = await fetch_projections()
+        assert build_from_entities(entity_rows) == build_from_projections(
+            projected_rows
+        )
+
+        async def construct_entities():
+            build_from_entities(entity_rows)
+
+        async def construct_projections():
+            build_from_projections(projected_rows)
+
+        async def load_entities():
+            build_from_entities(await fetch_entities())
+
+        async def load_projections():
+            build_from_projections(await fetch_projections())
+
+        results = {
+            "users": len(user_ids),
+            "rows": sum(len(rows) for rows in projected_rows.values()),
+            "construct_entities_us": await time_per_call(
+                construct_entities, args.iterations
+            ),
+            "construct_projections_us": await time_per_call(
+                construct_projections, args.iterations
+            ),
+            "load_entities_us": await time_per_call(
+                load_entities, args.iterations // 10 or 1
+            ),
+            "load_projections_us": await time_per_call(
+                load_projections, args.iterations // 10 or 1
+            ),
+        }
+    await engine.dispose()
+
+    print(f"{results['users']} users, {results['rows']} collection rows")
+    for phase in ("construct", "load"):
+        entities = results[f"{phase}_entities_us"]
+        projections = results[f"{phase}_projections_us"]
+        print(
+            f"{phase:<10} entities={entities:>10.1f} us "
+            f"projections={projections:>10.1f} us ({entities / projections:.1f}x)"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    arguments = parser.parse_args()
+
+    benchmark = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(benchmark, output, indent=2)
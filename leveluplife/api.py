@@ -3,9 +3,13 @@ from urllib.request import Request
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
+from leveluplife.middleware import LoginRateLimitMiddleware, QueryStatsMiddleware
 from leveluplife.models.error import BaseError
+from leveluplife.pagination import NEXT_CURSOR_HEADER
+from leveluplife.ratelimit import LoginRateLimiter, login_rate_limiter
+from leveluplife.responses import error_response
 from leveluplife.routes.item import router as item_router
 from leveluplife.routes.task import router as task_router
 from leveluplife.routes.user import router as user_router
@@ -14,17 +18,34 @@ from leveluplife.routes.auth import router as auth_router
 from leveluplife.routes.comment import router as comment_router
 from leveluplife.routes.reaction import router as reaction_router
 from leveluplife.routes.quest import router as quest_router
+from leveluplife.routes.metrics import router as metrics_router
 
 
-def create_app(lifespan) -> FastAPI:
+def create_app(
+    lifespan, rate_limiter: LoginRateLimiter = login_rate_limiter
+) -> FastAPI:
     origins = ["*"]
-    app = FastAPI(title="LevelUpLife", lifespan=lifespan)
+    # Routes return views built by the controllers as a ViewResponse, which
+    # skips their response_model. Every other response is encoded with orjson
+    app = FastAPI(
+        title="LevelUpLife", lifespan=lifespan, default_response_class=ORJSONResponse
+    )
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(LoginRateLimitMiddleware, limiter=rate_limiter)
+    # Added last, CORS wraps every other middleware and the responses they send
     app.add_middleware(
         CORSMiddleware,
         allow_origins=origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER,
+            "ETag",
+            "Last-Modified",
+            "Server-Timing",
+            "Retry-After",
+        ],
     )
 
     app.include_router(user_router)
@@ -35,17 +56,11 @@ def create_app(lifespan) -> FastAPI:
     app.include_router(comment_router)
     app.include_router(reaction_router)
     app.include_router(quest_router)
+    app.include_router(metrics_router)
 
     @app.exception_handler(BaseError)
-    async def exception_handler(request: Request, exc: BaseError) -> JSONResponse:
+    async def exception_handler(request: Request, exc: BaseError) -> ORJSONResponse:
         logger.error(f"{type(exc).__name__}: {exc.message}", exc_info=exc)
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "message": exc.message,
-                "name": exc.name,
-                "status_code": exc.status_code,
-            },
-        )
+        return error_response(exc)
 
     return app
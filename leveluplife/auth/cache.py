@@ -0,0 +1,19 @@
+from leveluplife.cache import TTLCache
+from leveluplife.models.table import User
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+# Users resolved by get_current_user, keyed by the token subject. They hold
+# password hashes, so only their invalidations are shared between workers
+principal_cache: TTLCache[User] = TTLCache(
+    "principals", settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL
+)
+
+# Current token version of each user id, a missing user is cached as -1
+token_version_cache: TTLCache[int] = TTLCache(
+    "token_versions",
+    settings.TOKEN_VERSION_CACHE_SIZE,
+    settings.TOKEN_VERSION_CACHE_TTL,
+    int,
+)
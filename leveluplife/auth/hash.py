@@ -1,11 +1,119 @@
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Callable
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Every scheme a stored hash may use, whatever the preferences
+SUPPORTED_SCHEMES = ("bcrypt", "argon2")
+
+# Bounds kept whatever the calibration measures
+BCRYPT_ROUNDS_RANGE = (10, 16)
+ARGON2_TIME_COST_RANGE = (2, 12)
+
+
+@dataclass(frozen=True)
+class HashPolicy:
+    """Schemes in order of preference and their work factors.
+
+    New hashes use the first scheme. Hashes of another scheme, or whose work
+    factor is more than one step away, still verify but need an update. The
+    one step of slack keeps workers whose calibration differs slightly from
+    rehashing each other's passwords.
+    """
+
+    schemes: tuple[str, ...] = ("bcrypt",)
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+
+
+DEFAULT_POLICY = HashPolicy()
+
+
+@lru_cache
+def get_crypt_context(policy: HashPolicy) -> CryptContext:
+    return CryptContext(
+        schemes=[
+            *policy.schemes,
+            *(scheme for scheme in SUPPORTED_SCHEMES if scheme not in policy.schemes),
+        ],
+        default=policy.schemes[0],
+        deprecated="auto",
+        bcrypt__default_rounds=policy.bcrypt_rounds,
+        bcrypt__min_rounds=policy.bcrypt_rounds - 1,
+        bcrypt__max_rounds=policy.bcrypt_rounds + 1,
+        argon2__default_rounds=policy.argon2_time_cost,
+        argon2__min_rounds=policy.argon2_time_cost - 1,
+        argon2__max_rounds=policy.argon2_time_cost + 1,
+        argon2__memory_cost=policy.argon2_memory_cost,
+    )
+
+
+def get_password_hash(password: str, policy: HashPolicy = DEFAULT_POLICY) -> str:
+    return get_crypt_context(policy).hash(password)
+
+
+def verify_password(
+    plain_password: str, hashed_password: str, policy: HashPolicy = DEFAULT_POLICY
+) -> bool:
+    return get_crypt_context(policy).verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str, policy: HashPolicy = DEFAULT_POLICY
+) -> tuple[bool, str | None]:
+    """Verify a password and rehash it when its hash does not match the policy."""
+    return get_crypt_context(policy).verify_and_update(plain_password, hashed_password)
+
+
+def _time_hash(policy: HashPolicy, scheme: str) -> float:
+    context = get_crypt_context(replace(policy, schemes=(scheme,)))
+    started = time.perf_counter()
+    context.hash("calibration")
+    return time.perf_counter() - started
+
 
+def _fit(
+    estimate: Callable[[int], float], target: float, bounds: tuple[int, int]
+) -> int:
+    # Largest cost whose estimated duration stays within the target
+    low, high = bounds
+    fitting = [cost for cost in range(low, high + 1) if estimate(cost) <= target]
+    return max(fitting, default=low)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
 
+def calibrate_policy(schemes: tuple[str, ...], target_ms: float) -> HashPolicy:
+    """Pick the work factor of every scheme hashing in about ``target_ms``.
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    Each scheme hashes once at its lowest cost and the duration is
+    extrapolated, so calibrating takes a fraction of a second.
+    """
+    target = target_ms / 1000
+    policy = HashPolicy(schemes=schemes)
+    if "bcrypt" in schemes:
+        # bcrypt doubles its work with each round
+        rounds = BCRYPT_ROUNDS_RANGE[0]
+        seconds = _time_hash(replace(policy, bcrypt_rounds=rounds), "bcrypt")
+        policy = replace(
+            policy,
+            bcrypt_rounds=_fit(
+                lambda cost: seconds * 2 ** (cost - rounds),
+                target,
+                BCRYPT_ROUNDS_RANGE,
+            ),
+        )
+    if "argon2" in schemes:
+        # argon2 grows linearly with its time cost at a fixed memory cost
+        time_cost = ARGON2_TIME_COST_RANGE[0]
+        seconds = _time_hash(replace(policy, argon2_time_cost=time_cost), "argon2")
+        policy = replace(
+            policy,
+            argon2_time_cost=_fit(
+                lambda cost: seconds * cost / time_cost,
+                target,
+                ARGON2_TIME_COST_RANGE,
+            ),
+        )
+    return policy
@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from loguru import logger
+
+from leveluplife.auth.hash import (
+    DEFAULT_POLICY,
+    HashPolicy,
+    calibrate_policy,
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+from leveluplife.models.error import PasswordHashingUnavailableError
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+
+@dataclass
+class PasswordPoolStats:
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    pending: int = 0
+
+
+class PasswordHasher:
+    """Hash and verify passwords in a process pool off the event loop.
+
+    At most ``workers + queue_size`` calls are in flight, further calls are
+    rejected at once with a 503 instead of queueing behind seconds of bcrypt.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.stats = PasswordPoolStats()
+        self.policy = DEFAULT_POLICY
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            # Spawned workers only import the hashing module, never the
+            # parent's event loop, sockets or database connections.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started password hashing pool of {self.workers} workers")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.stats.pending >= self.workers + self.queue_size:
+            self.stats.rejected += 1
+            raise PasswordHashingUnavailableError()
+        self.start()
+        self.stats.pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, *args
+            )
+        except asyncio.CancelledError:
+            # The caller is gone, the worker still finishes the call
+            self.stats.cancelled += 1
+            raise
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.stats.pending -= 1
+        self.stats.completed += 1
+        return result
+
+    async def configure_policy(self) -> None:
+        schemes = tuple(settings.PASSWORD_HASH_SCHEMES)
+        if settings.PASSWORD_HASH_CALIBRATE:
+            # Calibrate in a worker, where the hashing will actually run
+            self.policy = await self._run(
+                calibrate_policy, schemes, settings.PASSWORD_HASH_TARGET_MS
+            )
+        else:
+            self.policy = HashPolicy(schemes=schemes)
+        logger.info(f"Password hash policy: {self.policy}")
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password, self.policy)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            verify_password, plain_password, hashed_password, self.policy
+        )
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(
+            verify_and_update_password, plain_password, hashed_password, self.policy
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "policy": asdict(self.policy),
+            **asdict(self.stats),
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE
+)
@@ -0,0 +1,142 @@
+import hashlib
+import math
+from datetime import datetime
+from uuid import UUID
+
+from loguru import logger
+
+from leveluplife.controllers.token import TokenController
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+
+class BloomFilter:
+    """Set membership in a fixed bit array, with false positives only.
+
+    Sized for ``capacity`` items at ``error_rate`` false positives, about 1.8
+    bytes per item at 0.1%.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, key: bytes) -> list[int]:
+        # Double hashing derives every position from one digest
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position // 8] |= 1 << (position % 8)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(key)
+        )
+
+
+class RevocationIndex:
+    """Revoked refresh tokens, a bloom filter in front of the revokedtoken table.
+
+    A token missing from the filter was never revoked through this process,
+    which is the common case and costs no query. A hit is confirmed in the
+    table to rule out a false positive. Past its capacity the filter's false
+    positives climb, so it is then rebuilt from the table.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.lookups = 0
+        self.confirmations = 0
+        self.rebuilds = 0
+        # Tokens revoked while the filter is rebuilt, None the rest of the time
+        self._revoked_during_load: list[bytes] | None = None
+
+    async def load(self, token_controller: TokenController) -> None:
+        """Build the filter from the unexpired revoked tokens, once purged.
+
+        The filter holds twice the tokens loaded, and at least ``capacity``,
+        so as many can be revoked again before the next rebuild.
+        """
+        self._revoked_during_load = []
+        try:
+            await token_controller.purge_expired()
+            jtis = await token_controller.get_revoked_token_ids()
+            bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+            for jti in jtis:
+                bloom.add(jti.bytes)
+            # Their rows may have been committed after the table was read
+            for key in self._revoked_during_load:
+                bloom.add(key)
+        finally:
+            self._revoked_during_load = None
+        self.bloom = bloom
+        logger.info(f"Loaded {bloom.count} revoked tokens")
+
+    async def is_revoked(self, token_controller: TokenController, jti: UUID) -> bool:
+        self.lookups += 1
+        if jti.bytes not in self.bloom:
+            return False
+        self.confirmations += 1
+        return await token_controller.is_revoked(jti)
+
+    async def revoke(
+        self,
+        token_controller: TokenController,
+        jti: UUID,
+        user_id: UUID,
+        expires_at: datetime,
+    ) -> bool:
+        """Revoke a token, False when it was already revoked.
+
+        The table is the authority, it also catches tokens revoked by another
+        worker whose filter this process has not seen.
+        """
+        self.bloom.add(jti.bytes)
+        if self._revoked_during_load is not None:
+            self._revoked_during_load.append(jti.bytes)
+        revoked = await token_controller.revoke(jti, user_id, expires_at)
+        if self.bloom.count > self.bloom.capacity and self._revoked_during_load is None:
+            await self.rebuild(token_controller)
+        return revoked
+
+    async def rebuild(self, token_controller: TokenController) -> None:
+        # The token is revoked already, a failed rebuild keeps the full filter
+        try:
+            await self.load(token_controller)
+        except Exception:
+            logger.exception("Failed to rebuild the revoked tokens filter")
+            return
+        self.rebuilds += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "revoked": self.bloom.count,
+            "capacity": self.capacity,
+            "bloom_bytes": self.bloom.nbytes,
+            "lookups": self.lookups,
+            "confirmations": self.confirmations,
+            "rebuilds": self.rebuilds,
+        }
+
+
+revocation_index = RevocationIndex(
+    settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE
+)
@@ -1,10 +1,25 @@
+from uuid import UUID
+
 from leveluplife.models.shared import DBModel
+from leveluplife.models.user import Tribe
 
 
 class Token(DBModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshTokenRequest(DBModel):
+    refresh_token: str
 
 
 class TokenData(DBModel):
     username: str | None = None
+
+
+class Principal(DBModel):
+    id: UUID
+    username: str
+    tribe: Tribe
+    token_version: int
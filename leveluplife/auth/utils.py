@@ -1,13 +1,20 @@
 from datetime import timedelta, datetime, timezone
 from typing import Annotated
+from uuid import UUID, uuid4
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.exc import NoResultFound
 
-from leveluplife.auth.hash import verify_password
-from leveluplife.auth.schemas import TokenData
+from leveluplife.auth.cache import principal_cache, token_version_cache
+from leveluplife.auth.pool import password_hasher
+from leveluplife.auth.revocation import revocation_index
+from leveluplife.auth.schemas import Principal, Token, TokenData
+from leveluplife.controllers.token import TokenController
 from leveluplife.controllers.user import UserController
 from leveluplife.dependencies import get_user_controller
 from leveluplife.models.table import User
@@ -17,6 +24,8 @@ settings = Settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+REFRESH_TOKEN_TYPE = "refresh"
+
 
 async def get_user(user_controller: UserController, user_username: str) -> User:
     return await user_controller.get_user_by_username_with_password(user_username)
@@ -26,8 +35,13 @@ async def authenticate_user(
     user_controller: UserController, user_username: str, password: str
 ):
     user = await get_user(user_controller, user_username)
-    if not verify_password(password, user.password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+    if not valid:
         return False
+    if new_hash is not None:
+        # The hash predates the current policy, replace it while the plain
+        # password is at hand
+        await user_controller.update_password_hash(user, new_hash)
     return user
 
 
@@ -44,31 +58,161 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    user_controller: UserController = Depends(get_user_controller),
-):
-    credentials_exception = HTTPException(
+def get_user_claims(user: User | Principal) -> dict:
+    # The claims are enough to authorize most routes without reading the user
+    return {
+        "sub": user.username,
+        "uid": str(user.id),
+        "tribe": user.tribe.value,
+        "ver": user.token_version,
+    }
+
+
+def create_user_access_token(user: User, expires_delta: timedelta | None = None):
+    return create_access_token(data=get_user_claims(user), expires_delta=expires_delta)
+
+
+def create_tokens(claims: dict) -> Token:
+    access_token = create_access_token(
+        data=claims,
+        expires_delta=timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    refresh_token = create_access_token(
+        data={**claims, "type": REFRESH_TOKEN_TYPE, "jti": str(uuid4())},
+        expires_delta=timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return Token(
+        access_token=access_token, refresh_token=refresh_token, token_type="bearer"
+    )
+
+
+def get_credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token(token: str) -> dict:
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
     except InvalidTokenError:
-        raise credentials_exception
-    user = await get_user(user_controller, token_data.username)
+        raise get_credentials_exception()
+
+
+def decode_access_token(token: str) -> dict:
+    payload = decode_token(token)
+    # A refresh token only buys new tokens, it never authorizes a request
+    if payload.get("type") == REFRESH_TOKEN_TYPE:
+        raise get_credentials_exception()
+    return payload
+
+
+def get_principal(payload: dict) -> Principal:
+    try:
+        return Principal(
+            id=payload.get("uid"),
+            username=payload.get("sub"),
+            tribe=payload.get("tribe"),
+            token_version=payload.get("ver"),
+        )
+    except ValidationError:
+        raise get_credentials_exception()
+
+
+async def get_token_version(user_controller: UserController, user_id: UUID) -> int:
+    token_version = await token_version_cache.get(user_id)
+    if token_version is None:
+        token_version = await user_controller.get_token_version(user_id)
+        if token_version is None:
+            token_version = -1
+        await token_version_cache.set(user_id, token_version)
+    return token_version
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    user_controller: UserController = Depends(get_user_controller),
+):
+    payload = decode_access_token(token)
+    username: str = payload.get("sub")
+    if username is None:
+        raise get_credentials_exception()
+    token_data = TokenData(username=username)
+    user = await principal_cache.get(token_data.username)
     if user is None:
-        raise credentials_exception
+        try:
+            db_user = await get_user(user_controller, token_data.username)
+        except NoResultFound:
+            raise get_credentials_exception()
+        # Cache a copy detached from the request session, it outlives the request
+        user = User(**db_user.model_dump(), token_version=db_user.token_version)
+        await principal_cache.set(token_data.username, user)
+    if payload.get("ver") != user.token_version:
+        raise get_credentials_exception()
     return user
 
 
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    user_controller: UserController = Depends(get_user_controller),
+) -> Principal:
+    """Authorize a request from the token claims alone.
+
+    Only the token version is checked against the user, and it is cached, so
+    routes that never read the user row skip the database.
+    """
+    principal = get_principal(decode_access_token(token))
+    token_version = await get_token_version(user_controller, principal.id)
+    if token_version != principal.token_version:
+        raise get_credentials_exception()
+    return principal
+
+
+async def refresh_tokens(
+    refresh_token: str,
+    user_controller: UserController,
+    token_controller: TokenController,
+) -> Token:
+    """Exchange a refresh token for a new pair, the old one is revoked."""
+    payload = decode_token(refresh_token)
+    if payload.get("type") != REFRESH_TOKEN_TYPE:
+        raise get_credentials_exception()
+    principal = get_principal(payload)
+    token_version = await get_token_version(user_controller, principal.id)
+    if token_version != principal.token_version:
+        raise get_credentials_exception()
+    jti = UUID(payload["jti"])
+    if await revocation_index.is_revoked(
+        token_controller, jti
+    ) or not await revocation_index.revoke(
+        token_controller, jti, principal.id, datetime.fromtimestamp(payload["exp"])
+    ):
+        # A rotated token came back, it leaked: end every session of the user
+        logger.warning(f"Refresh token reused for user: {principal.username}")
+        await user_controller.revoke_user_tokens(principal.id)
+        raise get_credentials_exception()
+    return create_tokens(get_user_claims(principal))
+
+
+async def revoke_refresh_token(
+    refresh_token: str, token_controller: TokenController
+) -> None:
+    payload = decode_token(refresh_token)
+    if payload.get("type") != REFRESH_TOKEN_TYPE:
+        raise get_credentials_exception()
+    principal = get_principal(payload)
+    await revocation_index.revoke(
+        token_controller,
+        UUID(payload["jti"]),
+        principal.id,
+        datetime.fromtimestamp(payload["exp"]),
+    )
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ):
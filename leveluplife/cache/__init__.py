@@ -0,0 +1,255 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
+
+from leveluplife.cache.shared import SharedStore
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    shared_hits: int = 0
+    # Values loaded across an invalidation, never cached
+    stale_sets: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class KeyStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def describe_key(key: Hashable) -> str:
+    """Digest of a key for metrics, keeping only the namespace of tuple keys.
+
+    Keys hold usernames, emails and ids, which metrics must not give away.
+    """
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=6).hexdigest()
+    if isinstance(key, tuple) and key and isinstance(key[0], str):
+        return f"{key[0]}:{digest}"
+    return digest
+
+
+class TTLCache(Generic[V]):
+    """Bounded cache with a time to live, optionally shared between workers.
+
+    Entries expire ``ttl`` seconds after they are set and the least recently
+    used one is evicted once ``maxsize`` is reached. With a ``shared`` store,
+    this local LRU sits in front of it and invalidations are broadcast so
+    every worker evicts together. Values are written to the store only when
+    the cache has a ``value_type``: they are encoded to JSON and validated
+    back as that type, and local misses are looked up there. Without one,
+    values never leave the worker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        value_type: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+        shared: SharedStore | None = None,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.shared = shared if shared is not None else get_shared_store()
+        self._adapter = (
+            TypeAdapter(value_type)
+            if value_type is not None and self.shared is not None
+            else None
+        )
+        self.stats = CacheStats()
+        # Lookups of the most recently used keys, bounded like the entries
+        self.key_stats: OrderedDict[Hashable, KeyStats] = OrderedDict()
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        # Broadcast invalidations are applied from the subscriber thread
+        self._lock = threading.Lock()
+        # Bumped by every local eviction, so a value read from the store while
+        # the key was invalidated is not cached back
+        self._writes = 0
+        if self.shared is not None:
+            self.shared.listen(name, self._on_broadcast)
+        CACHES[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            value = self._get_local(key)
+        if value is None and self._adapter is not None and self.maxsize > 0:
+            writes = self._writes
+            value = self._decode(await self.shared.get(self.name, key))
+            if value is not None:
+                self.stats.shared_hits += 1
+                if writes == self._writes:
+                    self._set_local(key, value)
+        self._count(key, hit=value is not None)
+        return value
+
+    def _decode(self, raw: bytes | None) -> V | None:
+        if raw is None:
+            return None
+        try:
+            return self._adapter.validate_json(raw)
+        except ValidationError as exc:
+            logger.warning(f"Invalid shared entry of cache {self.name}: {exc}")
+            return None
+
+    def _get_local(self, key: Hashable) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _count(self, key: Hashable, hit: bool) -> None:
+        if hit:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        if self.maxsize <= 0:
+            return
+        key_stats = self.key_stats.get(key)
+        if key_stats is None:
+            key_stats = self.key_stats[key] = KeyStats()
+            if len(self.key_stats) > self.maxsize:
+                self.key_stats.popitem(last=False)
+        else:
+            self.key_stats.move_to_end(key)
+        if hit:
+            key_stats.hits += 1
+        else:
+            key_stats.misses += 1
+
+    @property
+    def generation(self) -> int:
+        """Moves on with every invalidation or clear of this cache, see ``set``."""
+        return self._writes
+
+    async def set(self, key: Hashable, value: V, generation: int | None = None) -> None:
+        """Cache ``value`` under ``key``.
+
+        A value loaded from the database passes the ``generation`` read before
+        the load began. When an invalidation ran since, the value may predate
+        the write it dropped and is not cached.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._writes:
+                self.stats.stale_sets += 1
+                return
+            self._set_entry(key, value)
+        if self._adapter is not None:
+            await self.shared.set(
+                self.name, key, self._adapter.dump_json(value), self.ttl
+            )
+
+    def _set_local(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._set_entry(key, value)
+
+    def _set_entry(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def invalidate(self, key: Hashable) -> None:
+        self._invalidate_local(key)
+        if self.shared is not None:
+            await self.shared.invalidate(self.name, key)
+
+    def _invalidate_local(self, key: Hashable) -> None:
+        with self._lock:
+            self._writes += 1
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    async def clear(self) -> None:
+        self._clear_local()
+        if self.shared is not None:
+            await self.shared.clear(self.name)
+
+    def _clear_local(self) -> None:
+        with self._lock:
+            self._writes += 1
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def _on_broadcast(self, action: str, key: Any) -> None:
+        if action == "clear":
+            self._clear_local()
+        else:
+            self._invalidate_local(key)
+
+    @property
+    def backend(self) -> str:
+        if self._adapter is not None:
+            return "shared"
+        # Only the invalidations of this cache are shared
+        return "broadcast" if self.shared is not None else "memory"
+
+    def snapshot(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "backend": self.backend,
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+        }
+
+    def key_snapshot(self, limit: int) -> list[dict]:
+        keys = sorted(
+            self.key_stats.items(),
+            key=lambda item: item[1].hits + item[1].misses,
+            reverse=True,
+        )
+        return [
+            {"key": describe_key(key), **asdict(key_stats)}
+            for key, key_stats in keys[:limit]
+        ]
+
+
+_shared_store: SharedStore | None = None
+
+
+def get_shared_store() -> SharedStore | None:
+    """Store shared by every cache of this worker, None for process-local caches."""
+    global _shared_store
+    if settings.CACHE_BACKEND == "shared" and _shared_store is None:
+        _shared_store = SharedStore(settings.CACHE_URL)
+    return _shared_store
+
+
+# Every cache registers itself here so its metrics can be exposed
+CACHES: dict[str, TTLCache] = {}
@@ -0,0 +1,92 @@
+import socket
+from typing import Any
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    """An error reply of the server."""
+
+
+def encode_command(*args: bytes | str | int) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(f"${len(arg)}\r\n".encode())
+        parts.append(arg + b"\r\n")
+    return b"".join(parts)
+
+
+def read_reply(stream) -> Any:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed by the server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [read_reply(stream) for _ in range(length)]
+    raise RespError(f"Unknown reply type: {line!r}")
+
+
+class RespConnection:
+    """Blocking connection speaking the Redis protocol.
+
+    ``url`` is ``redis://host:port`` or ``unix:///path/to/socket``. Commands
+    block for up to ``timeout`` seconds, so they are never issued from the
+    event loop: ``SharedStore`` runs them on a thread of its own.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        self.url = url
+        self.timeout = timeout
+        self._socket: socket.socket | None = None
+        self._stream = None
+
+    def connect(self) -> None:
+        parsed = urlparse(self.url)
+        if parsed.scheme == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address: Any = parsed.path
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            address = (parsed.hostname or "localhost", parsed.port or 6379)
+        sock.settimeout(self.timeout)
+        sock.connect(address)
+        self._socket = sock
+        self._stream = sock.makefile("rb")
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._stream.close()
+            self._socket.close()
+            self._socket = self._stream = None
+
+    def execute(self, *args: bytes | str | int) -> Any:
+        if self._socket is None:
+            self.connect()
+        try:
+            self._socket.sendall(encode_command(*args))
+            return read_reply(self._stream)
+        except OSError:
+            # The next command reconnects
+            self.close()
+            raise
+
+    def read_message(self) -> Any:
+        """Block until the next pushed message of a subscribed connection."""
+        return read_reply(self._stream)
@@ -0,0 +1,188 @@
+"""Local server speaking the subset of the Redis protocol the shared cache uses.
+
+Workers of one host share their caches through it over a unix socket when no
+Redis is deployed, and tests run against it as a fake Redis.
+
+    python -m leveluplife.cache.server --path /tmp/leveluplife-cache.sock
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+from leveluplife.cache.resp import encode_command
+
+OK = b"+OK\r\n"
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    return f"${len(value)}\r\n".encode() + value + b"\r\n"
+
+
+async def read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, as sent by telnet or redis-cli health checks
+        return line.split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class RespServer:
+    """Keys with an optional expiry, and publish/subscribe on channels."""
+
+    def __init__(self) -> None:
+        self.values: dict[bytes, tuple[bytes, float | None]] = {}
+        self.subscribers: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self.connections: set[asyncio.Task] = set()
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self.values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+    def execute(self, args: list[bytes], writer: asyncio.StreamWriter) -> bytes:
+        command = args[0].upper()
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"GET":
+            return encode_reply(self._get(args[1]))
+        if command == b"SET":
+            expires_at = None
+            options = [arg.upper() for arg in args[3:]]
+            if b"PX" in options:
+                milliseconds = int(args[3 + options.index(b"PX") + 1])
+                expires_at = time.monotonic() + milliseconds / 1000
+            elif b"EX" in options:
+                expires_at = time.monotonic() + int(args[3 + options.index(b"EX") + 1])
+            self.values[args[1]] = (args[2], expires_at)
+            return OK
+        if command == b"DEL":
+            return encode_reply(
+                sum(self.values.pop(key, None) is not None for key in args[1:])
+            )
+        if command == b"INCR":
+            value = int(self._get(args[1]) or 0) + 1
+            self.values[args[1]] = (str(value).encode(), None)
+            return encode_reply(value)
+        if command == b"PUBLISH":
+            subscribers = self.subscribers.get(args[1], set())
+            message = encode_command(b"message", args[1], args[2])
+            for subscriber in subscribers:
+                subscriber.write(message)
+            return encode_reply(len(subscribers))
+        if command == b"SUBSCRIBE":
+            for channel in args[1:]:
+                self.subscribers.setdefault(channel, set()).add(writer)
+            return b"".join(
+                encode_command(b"subscribe", channel, index)
+                for index, channel in enumerate(args[1:], start=1)
+            )
+        if command == b"FLUSHALL":
+            self.values.clear()
+            return OK
+        return f"-ERR unknown command '{command.decode()}'\r\n".encode()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections.add(asyncio.current_task())
+        try:
+            while (args := await read_command(reader)) is not None:
+                if args:
+                    writer.write(self.execute(args, writer))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for subscribers in self.subscribers.values():
+                subscribers.discard(writer)
+            self.connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def close_connections(self) -> None:
+        for connection in self.connections:
+            connection.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+
+class LocalRespServer:
+    """A ``RespServer`` on its own thread and event loop, on a TCP port or socket.
+
+    Used as a context manager, ``url`` is where clients connect to.
+    """
+
+    def __init__(self, path: str | None = None, port: int = 0) -> None:
+        self.path = path
+        self.port = port
+        self.url = ""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="resp-server", daemon=True
+        )
+
+    async def _start(self) -> asyncio.AbstractServer:
+        self.server = RespServer()
+        if self.path is not None:
+            return await asyncio.start_unix_server(self.server.handle, path=self.path)
+        return await asyncio.start_server(self.server.handle, "127.0.0.1", self.port)
+
+    async def _stop(self) -> None:
+        self._listener.close()
+        await self.server.close_connections()
+        await self._listener.wait_closed()
+
+    def __enter__(self) -> "LocalRespServer":
+        self._thread.start()
+        self._listener = asyncio.run_coroutine_threadsafe(
+            self._start(), self._loop
+        ).result()
+        if self.path is not None:
+            self.url = f"unix://{self.path}"
+        else:
+            port = self._listener.sockets[0].getsockname()[1]
+            self.url = f"redis://127.0.0.1:{port}"
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = RespServer()
+    if args.path:
+        listener = await asyncio.start_unix_server(server.handle, path=args.path)
+    else:
+        listener = await asyncio.start_server(server.handle, args.host, args.port)
+    logger.info(f"Serving the shared cache on {args.path or (args.host, args.port)}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="unix socket to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, TypeVar
+from uuid import UUID, uuid4
+
+import orjson
+from loguru import logger
+
+from leveluplife.cache.resp import RespConnection, RespError
+
+INVALIDATION_CHANNEL = "leveluplife:cache:invalidate"
+
+# Seconds without the shared store after a failure, requests use the local tier
+RETRY_AFTER = 5.0
+
+T = TypeVar("T")
+
+
+def encode_key(key: Hashable) -> Any:
+    """JSON form of a cache key, decoded back to an equal key by ``decode_key``.
+
+    Keys are strings, numbers, None, UUIDs or tuples of them.
+    """
+    if isinstance(key, tuple):
+        return [encode_key(part) for part in key]
+    if isinstance(key, UUID):
+        return {"uuid": str(key)}
+    if key is None or isinstance(key, (str, int, float)):
+        return key
+    raise TypeError(f"Unsupported cache key: {key!r}")
+
+
+def decode_key(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(decode_key(part) for part in value)
+    if isinstance(value, dict):
+        return UUID(value["uuid"])
+    return value
+
+
+class SharedStore:
+    """Cache entries kept in a Redis protocol server shared by every worker.
+
+    Each cache keeps its local LRU in front of the store. Values are stored
+    as JSON under ``leveluplife:<cache>:<generation>:<key>``, encoded and
+    validated back by the cache, and clearing a cache moves it to a new
+    generation instead of scanning for its keys. Invalidations are published
+    on ``INVALIDATION_CHANNEL`` and every other worker evicts the key from its
+    local LRU as it receives them.
+
+    Commands are blocking socket round trips, so they run one at a time on a
+    thread of their own and the event loop only awaits them. When the server
+    is unreachable, caches fall back to their local tier and the store is
+    retried after ``RETRY_AFTER`` seconds.
+    """
+
+    def __init__(self, url: str, clock: Callable[[], float] = time.monotonic) -> None:
+        self.url = url
+        self.clock = clock
+        # Tells this worker's own broadcasts apart from the others'
+        self.origin = uuid4().hex
+        self.errors = 0
+        self._connection = RespConnection(url)
+        # A single thread keeps the commands of this worker in order
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="shared-cache"
+        )
+        self._generations: dict[str, bytes] = {}
+        self._listeners: dict[str, Callable[[str, Any], None]] = {}
+        self._subscriber: threading.Thread | None = None
+        self._unavailable_until = 0.0
+
+    def _available(self) -> bool:
+        return self.clock() >= self._unavailable_until
+
+    async def _run(self, command: Callable[..., T], *args: Any) -> T:
+        if not self._available():
+            raise ConnectionError(f"Shared cache {self.url} is unavailable")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, command, *args)
+
+    def _execute(self, *args: bytes | str | int) -> Any:
+        # Commands queued behind a failure give up without a round trip
+        if not self._available():
+            raise ConnectionError(f"Shared cache {self.url} is unavailable")
+        try:
+            return self._connection.execute(*args)
+        except (OSError, RespError) as exc:
+            self.errors += 1
+            self._unavailable_until = self.clock() + RETRY_AFTER
+            logger.warning(f"Shared cache {self.url} failed: {exc}")
+            raise ConnectionError(str(exc)) from exc
+
+    def _generation(self, name: str) -> bytes:
+        generation = self._generations.get(name)
+        if generation is None:
+            generation = self._execute("GET", f"leveluplife:{name}:generation") or b"0"
+            self._generations[name] = generation
+        return generation
+
+    def _key(self, name: str, key: Hashable) -> str:
+        return f"leveluplife:{name}:{self._generation(name).decode()}:{key!r}"
+
+    def _get(self, name: str, key: Hashable) -> bytes | None:
+        return self._execute("GET", self._key(name, key))
+
+    def _set(self, name: str, key: Hashable, value: bytes, ttl: float) -> None:
+        self._execute("SET", self._key(name, key), value, "PX", max(1, int(ttl * 1000)))
+
+    def _invalidate(self, name: str, key: Hashable) -> None:
+        self._execute("DEL", self._key(name, key))
+        self._publish(name, "invalidate", key)
+
+    def _clear(self, name: str) -> None:
+        self._generations[name] = str(
+            self._execute("INCR", f"leveluplife:{name}:generation")
+        ).encode()
+        self._publish(name, "clear", None)
+
+    def _publish(self, name: str, action: str, key: Hashable | None) -> None:
+        message = orjson.dumps([self.origin, name, action, encode_key(key)])
+        self._execute("PUBLISH", INVALIDATION_CHANNEL, message)
+
+    async def get(self, name: str, key: Hashable) -> bytes | None:
+        try:
+            return await self._run(self._get, name, key)
+        except ConnectionError:
+            return None
+
+    async def set(self, name: str, key: Hashable, value: bytes, ttl: float) -> None:
+        try:
+            await self._run(self._set, name, key, value, ttl)
+        except ConnectionError:
+            pass
+
+    async def invalidate(self, name: str, key: Hashable) -> None:
+        try:
+            await self._run(self._invalidate, name, key)
+        except ConnectionError:
+            pass
+
+    async def clear(self, name: str) -> None:
+        try:
+            await self._run(self._clear, name)
+        except ConnectionError:
+            pass
+
+    def listen(self, name: str, listener: Callable[[str, Any], None]) -> None:
+        """Call ``listener(action, key)`` on invalidations broadcast by others.
+
+        ``action`` is ``"invalidate"`` with the key, or ``"clear"``.
+        """
+        self._listeners[name] = listener
+        if self._subscriber is None:
+            self._subscriber = threading.Thread(
+                target=self._subscribe, name="cache-invalidations", daemon=True
+            )
+            self._subscriber.start()
+
+    def _clear_listeners(self) -> None:
+        for listener in list(self._listeners.values()):
+            listener("clear", None)
+
+    def _subscribe(self) -> None:
+        subscribed = missed = False
+        while True:
+            connection = RespConnection(self.url, timeout=None)
+            try:
+                connection.execute("SUBSCRIBE", INVALIDATION_CHANNEL)
+                subscribed = True
+                if missed:
+                    # Invalidations sent while unsubscribed never arrived
+                    self._clear_listeners()
+                    missed = False
+                while True:
+                    self._dispatch(connection.read_message())
+            except (OSError, RespError) as exc:
+                connection.close()
+                missed = True
+                # Drop every local tier once as the subscription is lost, not
+                # on each retry, so the local tier serves the outage
+                if subscribed:
+                    logger.warning(f"Cache invalidations of {self.url} lost: {exc}")
+                    subscribed = False
+                    self._clear_listeners()
+                time.sleep(RETRY_AFTER)
+
+    def _dispatch(self, message: list) -> None:
+        if not message or message[0] != b"message":
+            return
+        try:
+            origin, name, action, key = orjson.loads(message[2])
+            key = decode_key(key)
+        except (ValueError, TypeError, KeyError) as exc:
+            logger.warning(f"Malformed cache invalidation ignored: {exc}")
+            return
+        if origin == self.origin or name not in self._listeners:
+            return
+        if action == "clear":
+            self._generations.pop(name, None)
+            self._listeners[name]("clear", None)
+        else:
+            self._listeners[name]("invalidate", key)
+
+    def snapshot(self) -> dict:
+        return {
+            "url": self.url,
+            "errors": self.errors,
+            "available": self._available(),
+        }
@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+NOT_MODIFIED = 304
+
+
+def get_version(resource: Any) -> datetime:
+    # A row never updated yet has no updated_at
+    return resource.updated_at or resource.created_at
+
+
+def _tag(resource: Any) -> bytes:
+    if hasattr(resource, "updated_at"):
+        return f"{resource.id}@{get_version(resource).isoformat()};".encode()
+    # Users are updated in place without a version, their content is the tag
+    return to_json(resource) + b";"
+
+
+def get_etag(*resources: Any) -> str:
+    """Weak ETag of resources, derived from their ids and versions.
+
+    A list is tagged by every row it holds, so a row added, removed or updated
+    on the page changes its tag. Resources without ``updated_at``, such as the
+    users linked to an item or a quest, are tagged by what they hold.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for resource in resources:
+        digest.update(_tag(resource))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def format_last_modified(value: datetime) -> str:
+    # Naive timestamps are stored in local time
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, W/"x" and "x" match
+    return etag.removeprefix("W/") in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+
+class ConditionalRequest:
+    """Validators of a GET response and the client's preconditions on them.
+
+    ``not_modified`` tags the response with an ETag, plus a Last-Modified for
+    a single resource, and returns a bare 304 when the client already holds
+    that version, before the model is ever serialized.
+    """
+
+    def __init__(self, request: Request, response: Response) -> None:
+        self.request = request
+        self.response = response
+
+    def not_modified(
+        self, *resources: Any, last_modified: datetime | None = None
+    ) -> Response | None:
+        headers = {"ETag": get_etag(*resources)}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_last_modified(last_modified)
+        self.response.headers.update(headers)
+
+        # If-None-Match takes precedence, If-Modified-Since is then ignored
+        if_none_match = self.request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            matches = _etag_matches(if_none_match, headers["ETag"])
+        elif last_modified is not None and (
+            if_modified_since := self.request.headers.get("If-Modified-Since")
+        ):
+            matches = _not_modified_since(if_modified_since, last_modified)
+        else:
+            matches = False
+        if not matches:
+            return None
+        return Response(status_code=NOT_MODIFIED, headers=headers)
@@ -0,0 +1,73 @@
+from typing import Iterable
+from uuid import UUID
+
+from leveluplife.cache import TTLCache
+from leveluplife.models.view import (
+    ItemView,
+    ItemWithUser,
+    QuestView,
+    QuestWithUser,
+    UserView,
+)
+from leveluplife.settings import Settings
+from leveluplife.singleflight import SingleFlight
+
+settings = Settings()
+
+# Item catalog, keyed by ("id", id), ("name", name) and ("page", offset, limit, cursor)
+item_cache: TTLCache[ItemView | ItemWithUser | tuple[ItemView, ...]] = TTLCache(
+    "items",
+    settings.CATALOG_CACHE_SIZE,
+    settings.CATALOG_CACHE_TTL,
+    ItemView | ItemWithUser | tuple[ItemView, ...],
+)
+
+# Quest catalog, keyed by ("id", id) and ("page", offset, limit, cursor)
+quest_cache: TTLCache[QuestWithUser | tuple[QuestView, ...]] = TTLCache(
+    "quests",
+    settings.CATALOG_CACHE_SIZE,
+    settings.CATALOG_CACHE_TTL,
+    QuestWithUser | tuple[QuestView, ...],
+)
+
+# Fully assembled view of each user id, dropped by every write it reflects
+user_view_cache: TTLCache[UserView] = TTLCache(
+    "user_views",
+    settings.USER_VIEW_CACHE_SIZE,
+    settings.USER_VIEW_CACHE_TTL,
+    UserView,
+)
+
+# Lookups known to find nothing, keyed ("username", ...), ("email", ...) and
+# ("item_name", ...), dropped when a write creates the missing key
+missing_cache: TTLCache[bool] = TTLCache(
+    "missing", settings.MISSING_CACHE_SIZE, settings.MISSING_CACHE_TTL, bool
+)
+
+
+# Loads of the same user, item or quest shared by concurrent cache misses
+user_loads: SingleFlight[UserView] = SingleFlight(
+    "users", settings.SINGLE_FLIGHT_TIMEOUT
+)
+item_loads: SingleFlight[ItemWithUser] = SingleFlight(
+    "items", settings.SINGLE_FLIGHT_TIMEOUT
+)
+quest_loads: SingleFlight[QuestWithUser] = SingleFlight(
+    "quests", settings.SINGLE_FLIGHT_TIMEOUT
+)
+
+
+async def invalidate_user_views(user_ids: Iterable[UUID | None]) -> None:
+    for user_id in user_ids:
+        if user_id is not None:
+            await user_view_cache.invalidate(user_id)
+
+
+async def invalidate_linked_catalog(
+    item_ids: Iterable[UUID], quest_ids: Iterable[UUID]
+) -> None:
+    # Cached items and quests embed a summary of each of their users
+    for item_id in item_ids:
+        await item_cache.invalidate(("id", item_id))
+    for quest_id in quest_ids:
+        await quest_cache.invalidate(("id", quest_id))
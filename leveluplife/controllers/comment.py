@@ -1,32 +1,44 @@
-from typing import Sequence
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import bindparam
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from leveluplife.controllers.cache import user_view_cache
 from leveluplife.models.comment import CommentCreate, CommentUpdate
 from leveluplife.models.error import CommentAlreadyExistsError, CommentNotFoundError
 from leveluplife.models.table import Comment
+from leveluplife.models.view import CommentView, construct_views, view_columns
+from leveluplife.pagination import paginate
 from loguru import logger
 
+COMMENT_BY_ID = select(Comment).where(Comment.id == bindparam("comment_id"))
+COMMENT_BY_TASK_AND_USER = select(Comment).where(
+    Comment.task_id == bindparam("task_id"), Comment.user_id == bindparam("user_id")
+)
+
+# Pages of comments, selected as plain rows of the view's columns
+COMMENT_VIEWS = select(*view_columns(CommentView, Comment))
+
 
 class CommentController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def get_comment_by_task_and_user(
+    async def get_comment_by_task_and_user(
         self, task_id: UUID, user_id: UUID
     ) -> Comment | None:
-        statement = select(Comment).where(
-            Comment.task_id == task_id, Comment.user_id == user_id
+        result = await self.session.exec(
+            COMMENT_BY_TASK_AND_USER, params={"task_id": task_id, "user_id": user_id}
         )
-        result = self.session.exec(statement)
         return result.one_or_none()
 
     async def create_comment(self, comment_create: CommentCreate) -> Comment:
         logger.info(
             f"Creating comment for task: {comment_create.task_id} as user: {comment_create.user_id}"
         )
-        existing_comment = self.get_comment_by_task_and_user(
+        existing_comment = await self.get_comment_by_task_and_user(
             comment_create.task_id, comment_create.user_id
         )
         if existing_comment:
@@ -34,19 +46,35 @@ class CommentController:
 
         new_comment = Comment(**comment_create.model_dump())
         self.session.add(new_comment)
-        self.session.commit()
-        self.session.refresh(new_comment)
+        await self.session.commit()
+        await self.session.refresh(new_comment)
+        await user_view_cache.invalidate(new_comment.user_id)
         return new_comment
 
-    async def get_comments(self, offset: int, limit: int) -> Sequence[Comment]:
+    async def get_comments(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> list[CommentView]:
         logger.info("Getting comments")
-        return self.session.exec(select(Comment).offset(offset).limit(limit)).all()
+        return construct_views(
+            await self.session.exec(
+                paginate(
+                    COMMENT_VIEWS,
+                    (Comment.created_at, Comment.id),
+                    offset,
+                    limit,
+                    cursor,
+                )
+            ),
+            CommentView,
+        )
 
     async def get_comment_by_id(self, comment_id: UUID) -> Comment:
         try:
             logger.info(f"Getting comment by id: {comment_id}")
-            return self.session.exec(
-                select(Comment).where(Comment.id == comment_id)
+            return (
+                await self.session.exec(
+                    COMMENT_BY_ID, params={"comment_id": comment_id}
+                )
             ).one()
         except NoResultFound:
             raise CommentNotFoundError(comment_id=comment_id)
@@ -55,14 +83,18 @@ class CommentController:
         self, comment_id: UUID, comment_update: CommentUpdate
     ) -> Comment:
         try:
-            db_comment = self.session.exec(
-                select(Comment).where(Comment.id == comment_id)
+            db_comment = (
+                await self.session.exec(
+                    COMMENT_BY_ID, params={"comment_id": comment_id}
+                )
             ).one()
             db_comment_data = comment_update.model_dump(exclude_unset=True)
             db_comment.sqlmodel_update(db_comment_data)
+            db_comment.updated_at = datetime.now()
             self.session.add(db_comment)
-            self.session.commit()
-            self.session.refresh(db_comment)
+            await self.session.commit()
+            await self.session.refresh(db_comment)
+            await user_view_cache.invalidate(db_comment.user_id)
             logger.info(f"Updated comment: {db_comment.id}")
             return db_comment
         except NoResultFound:
@@ -70,11 +102,14 @@ class CommentController:
 
     async def delete_comment(self, comment_id: UUID) -> None:
         try:
-            db_comment = self.session.exec(
-                select(Comment).where(Comment.id == comment_id)
+            db_comment = (
+                await self.session.exec(
+                    COMMENT_BY_ID, params={"comment_id": comment_id}
+                )
             ).one()
-            self.session.delete(db_comment)
-            self.session.commit()
+            await self.session.delete(db_comment)
+            await self.session.commit()
+            await user_view_cache.invalidate(db_comment.user_id)
             logger.info(f"Deleted comment: {db_comment.id}")
         except NoResultFound:
             raise CommentNotFoundError(comment_id=comment_id)
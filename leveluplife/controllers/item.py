@@ -2,8 +2,19 @@ from datetime import datetime
 from typing import Sequence
 from uuid import UUID
 from loguru import logger
+from sqlalchemy import bindparam
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from leveluplife.controllers.cache import (
+    invalidate_user_views,
+    item_cache,
+    item_loads,
+    missing_cache,
+    user_view_cache,
+)
+from leveluplife.controllers.user import USER_BY_ID, USER_ITEM_LINK
 from leveluplife.models.error import (
     ItemAlreadyExistsError,
     ItemNameNotFoundError,
@@ -13,20 +24,38 @@ from leveluplife.models.error import (
 )
 from leveluplife.models.item import ItemCreate, ItemUpdate
 from leveluplife.models.relationship import UserItemLink, UserItemLinkCreate
-from leveluplife.models.table import Item, User
-from leveluplife.models.view import ItemWithUser
+from leveluplife.models.table import Item
+from leveluplife.models.view import (
+    ItemView,
+    ItemWithUser,
+    construct_views,
+    view_columns,
+)
+from leveluplife.pagination import paginate
+
+ITEM_BY_ID = select(Item).where(Item.id == bindparam("item_id"))
+ITEM_WITH_USERS_BY_ID = ITEM_BY_ID.options(selectinload(Item.users))
+ITEM_BY_NAME = select(Item).where(Item.name == bindparam("item_name"))
+ITEM_USER_IDS = select(UserItemLink.user_id).where(
+    UserItemLink.item_id == bindparam("item_id")
+)
+
+# Pages of the catalog, selected as plain rows of the view's columns
+ITEM_VIEWS = select(*view_columns(ItemView, Item))
 
 
 class ItemController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def create_item(self, item_create: ItemCreate) -> Item:
         try:
             new_item = Item(**item_create.model_dump())
             self.session.add(new_item)
-            self.session.commit()
-            self.session.refresh(new_item)
+            await self.session.commit()
+            await self.session.refresh(new_item)
+            await item_cache.clear()
+            await missing_cache.invalidate(("item_name", new_item.name))
             logger.info(f"New item created: {new_item.name}")
             return new_item
         except IntegrityError:
@@ -34,13 +63,19 @@ class ItemController:
 
     async def update_item(self, item_id: UUID, item_update: ItemUpdate) -> Item:
         try:
-            db_item = self.session.exec(select(Item).where(Item.id == item_id)).one()
+            db_item = (
+                await self.session.exec(ITEM_BY_ID, params={"item_id": item_id})
+            ).one()
             db_item_data = item_update.model_dump(exclude_unset=True)
             db_item.sqlmodel_update(db_item_data)
             self.session.add(db_item)
             db_item.updated_at = datetime.now()
-            self.session.commit()
-            self.session.refresh(db_item)
+            await self.session.commit()
+            await self.session.refresh(db_item)
+            await item_cache.clear()
+            await missing_cache.invalidate(("item_name", db_item.name))
+            # Users holding the item show it in their view
+            await invalidate_user_views(await self._get_user_ids(item_id))
             logger.info(f"Updated item: {db_item.name}")
             return db_item
         except NoResultFound:
@@ -48,31 +83,79 @@ class ItemController:
 
     async def delete_item(self, item_id: UUID) -> None:
         try:
-            db_item = self.session.exec(select(Item).where(Item.id == item_id)).one()
-            self.session.delete(db_item)
+            db_item = (
+                await self.session.exec(ITEM_BY_ID, params={"item_id": item_id})
+            ).one()
+            user_ids = await self._get_user_ids(item_id)
+            await self.session.delete(db_item)
             db_item.updated_at = datetime.now()
-            self.session.commit()
+            await self.session.commit()
+            await item_cache.clear()
+            await invalidate_user_views(user_ids)
             logger.info(f"Deleted item: {db_item.name}")
         except NoResultFound:
             raise ItemNotFoundError(item_id=item_id)
 
-    async def get_items(self, offset: int, limit: int) -> Sequence[Item]:
+    async def get_items(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> Sequence[ItemView]:
+        key = ("page", offset, limit, cursor)
+        if (items := await item_cache.get(key)) is not None:
+            return items
         logger.info("Getting items")
-        return self.session.exec(select(Item).offset(offset).limit(limit)).all()
+        items = tuple(
+            construct_views(
+                await self.session.exec(
+                    paginate(
+                        ITEM_VIEWS,
+                        (Item.created_at, Item.id),
+                        offset,
+                        limit,
+                        cursor,
+                    )
+                ),
+                ItemView,
+            )
+        )
+        await item_cache.set(key, items)
+        return items
+
+    async def get_item_by_id(self, item_id: UUID) -> ItemWithUser:
+        if (item := await item_cache.get(("id", item_id))) is not None:
+            return item
+        return await item_loads.run(item_id, lambda: self._load_item_by_id(item_id))
 
-    async def get_item_by_id(self, item_id: UUID) -> Item:
+    async def _load_item_by_id(self, item_id: UUID) -> ItemWithUser:
         try:
             logger.info(f"Getting item by id: {item_id}")
-            return self.session.exec(select(Item).where(Item.id == item_id)).one()
+            db_item = (
+                await self.session.exec(
+                    ITEM_WITH_USERS_BY_ID, params={"item_id": item_id}
+                )
+            ).one()
         except NoResultFound:
             raise ItemNotFoundError(item_id=item_id)
+        item = ItemWithUser(**db_item.model_dump(), users=db_item.users)
+        await item_cache.set(("id", item_id), item)
+        return item
 
-    async def get_item_by_name(self, item_name: str) -> Item:
+    async def get_item_by_name(self, item_name: str) -> ItemView:
+        if (item := await item_cache.get(("name", item_name))) is not None:
+            return item
+        if await missing_cache.get(("item_name", item_name)):
+            raise ItemNameNotFoundError(item_name=item_name)
+        missing_generation = missing_cache.generation
         try:
             logger.info(f"Getting item by name: {item_name}")
-            return self.session.exec(select(Item).where(Item.name == item_name)).one()
+            db_item = (
+                await self.session.exec(ITEM_BY_NAME, params={"item_name": item_name})
+            ).one()
         except NoResultFound:
+            await missing_cache.set(("item_name", item_name), True, missing_generation)
             raise ItemNameNotFoundError(item_name=item_name)
+        item = ItemView.model_validate(db_item)
+        await item_cache.set(("name", item_name), item)
+        return item
 
     async def give_item_to_user(
         self,
@@ -81,11 +164,16 @@ class ItemController:
         equipped: bool = False,
     ) -> ItemWithUser:
         try:
-            item = self.session.exec(select(Item).where(Item.id == item_id)).one()
+            item = (
+                await self.session.exec(ITEM_BY_ID, params={"item_id": item_id})
+            ).one()
             users = []
             for user_id in user_item_link_create.user_ids:
-                user = self.session.exec(select(User).where(User.id == user_id)).one()
+                user = (
+                    await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+                ).one()
                 users.append(user)
+                username = user.username
 
                 user_item_link = UserItemLink(
                     user_id=user_id, item_id=item_id, equipped=equipped
@@ -95,24 +183,33 @@ class ItemController:
                 if equipped:
                     item.equipped = equipped
 
-            self.session.commit()
-            self.session.refresh(item)
+            await self.session.commit()
+            await self.session.refresh(item)
+            await item_cache.invalidate(("id", item_id))
+            await invalidate_user_views(user_item_link_create.user_ids)
 
             return ItemWithUser(**item.model_dump(), users=users)
         except NoResultFound:
             raise ItemNotFoundError(item_id=item_id)
         except IntegrityError:
-            self.session.rollback()
-            raise ItemAlreadyInUserError(username=user.username, item_id=item_id)
+            await self.session.rollback()
+            raise ItemAlreadyInUserError(username=username, item_id=item_id)
 
     async def remove_item_from_user(self, item_id: UUID, user_id: UUID) -> None:
         try:
-            user_item_link = self.session.exec(
-                select(UserItemLink)
-                .where(UserItemLink.item_id == item_id)
-                .where(UserItemLink.user_id == user_id)
+            user_item_link = (
+                await self.session.exec(
+                    USER_ITEM_LINK, params={"user_id": user_id, "item_id": item_id}
+                )
             ).one()
-            self.session.delete(user_item_link)
-            self.session.commit()
+            await self.session.delete(user_item_link)
+            await self.session.commit()
+            await item_cache.invalidate(("id", item_id))
+            await user_view_cache.invalidate(user_id)
         except NoResultFound:
             raise ItemInUserNotFoundError(item_id=item_id, user_id=user_id)
+
+    async def _get_user_ids(self, item_id: UUID) -> Sequence[UUID]:
+        return (
+            await self.session.exec(ITEM_USER_IDS, params={"item_id": item_id})
+        ).all()
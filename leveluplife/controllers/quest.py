@@ -1,11 +1,21 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy import bindparam
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from loguru import logger
 
+from leveluplife.controllers.cache import (
+    invalidate_user_views,
+    quest_cache,
+    quest_loads,
+    user_view_cache,
+)
+from leveluplife.controllers.user import USER_BY_ID, USER_QUEST_LINK
 from leveluplife.models.error import (
     QuestAlreadyExistsError,
     QuestNotFoundError,
@@ -18,20 +28,36 @@ from leveluplife.models.relationship import (
     UserQuestLink,
     QuestStatus,
 )
-from leveluplife.models.table import Quest, User
-from leveluplife.models.view import QuestWithUser
+from leveluplife.models.table import Quest
+from leveluplife.models.view import (
+    QuestView,
+    QuestWithUser,
+    construct_views,
+    view_columns,
+)
+from leveluplife.pagination import paginate
+
+QUEST_BY_ID = select(Quest).where(Quest.id == bindparam("quest_id"))
+QUEST_WITH_USERS_BY_ID = QUEST_BY_ID.options(selectinload(Quest.users))
+QUEST_USER_IDS = select(UserQuestLink.user_id).where(
+    UserQuestLink.quest_id == bindparam("quest_id")
+)
+
+# Pages of the catalog, selected as plain rows of the view's columns
+QUEST_VIEWS = select(*view_columns(QuestView, Quest))
 
 
 class QuestController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def create_quest(self, quest_create: QuestCreate) -> Quest:
         try:
             new_quest = Quest(**quest_create.model_dump())
             self.session.add(new_quest)
-            self.session.commit()
-            self.session.refresh(new_quest)
+            await self.session.commit()
+            await self.session.refresh(new_quest)
+            await quest_cache.clear()
             logger.info(f"New quest created: {new_quest.name}")
             return new_quest
         except IntegrityError:
@@ -39,15 +65,18 @@ class QuestController:
 
     async def update_quest(self, quest_id: UUID, quest_update: QuestUpdate) -> Quest:
         try:
-            db_quest = self.session.exec(
-                select(Quest).where(Quest.id == quest_id)
+            db_quest = (
+                await self.session.exec(QUEST_BY_ID, params={"quest_id": quest_id})
             ).one()
             db_item_data = quest_update.model_dump(exclude_unset=True)
             db_quest.sqlmodel_update(db_item_data)
             self.session.add(db_quest)
             db_quest.updated_at = datetime.now()
-            self.session.commit()
-            self.session.refresh(db_quest)
+            await self.session.commit()
+            await self.session.refresh(db_quest)
+            await quest_cache.clear()
+            # Users on the quest show it in their view
+            await invalidate_user_views(await self._get_user_ids(quest_id))
             logger.info(f"Updated quest: {db_quest.name}")
             return db_quest
         except NoResultFound:
@@ -55,26 +84,61 @@ class QuestController:
 
     async def delete_quest(self, quest_id: UUID) -> None:
         try:
-            db_quest = self.session.exec(
-                select(Quest).where(Quest.id == quest_id)
+            db_quest = (
+                await self.session.exec(QUEST_BY_ID, params={"quest_id": quest_id})
             ).one()
-            self.session.delete(db_quest)
+            user_ids = await self._get_user_ids(quest_id)
+            await self.session.delete(db_quest)
             db_quest.updated_at = datetime.now()
-            self.session.commit()
+            await self.session.commit()
+            await quest_cache.clear()
+            await invalidate_user_views(user_ids)
             logger.info(f"Deleted quest: {db_quest.name}")
         except NoResultFound:
             raise QuestNotFoundError(quest_id=quest_id)
 
-    async def get_quests(self, offset: int, limit: int) -> Sequence[Quest]:
+    async def get_quests(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> Sequence[QuestView]:
+        key = ("page", offset, limit, cursor)
+        if (quests := await quest_cache.get(key)) is not None:
+            return quests
         logger.info("Getting quests")
-        return self.session.exec(select(Quest).offset(offset).limit(limit)).all()
+        quests = tuple(
+            construct_views(
+                await self.session.exec(
+                    paginate(
+                        QUEST_VIEWS,
+                        (Quest.created_at, Quest.id),
+                        offset,
+                        limit,
+                        cursor,
+                    )
+                ),
+                QuestView,
+            )
+        )
+        await quest_cache.set(key, quests)
+        return quests
+
+    async def get_quest_by_id(self, quest_id: UUID) -> QuestWithUser:
+        if (quest := await quest_cache.get(("id", quest_id))) is not None:
+            return quest
+        return await quest_loads.run(quest_id, lambda: self._load_quest_by_id(quest_id))
 
-    async def get_quest_by_id(self, quest_id: UUID) -> Quest:
+    async def _load_quest_by_id(self, quest_id: UUID) -> QuestWithUser:
         try:
             logger.info(f"Getting quest by id: {quest_id}")
-            return self.session.exec(select(Quest).where(Quest.id == quest_id)).one()
+            db_quest = (
+                await self.session.exec(
+                    QUEST_WITH_USERS_BY_ID, params={"quest_id": quest_id}
+                )
+            ).one()
         except NoResultFound:
             raise QuestNotFoundError(quest_id=quest_id)
+        quest = QuestWithUser(**db_quest.model_dump(), users=db_quest.users)
+        await quest_cache.set(("id", quest_id), quest)
+        return quest
 
     async def assign_quest_to_user(
         self,
@@ -85,11 +149,19 @@ class QuestController:
         status: QuestStatus = QuestStatus.ACTIVE,
     ) -> QuestWithUser:
         try:
-            quest = self.session.exec(select(Quest).where(Quest.id == quest_id)).one()
+            quest = (
+                await self.session.exec(QUEST_BY_ID, params={"quest_id": quest_id})
+            ).one()
+            if quest_end is None:
+                # Without an explicit end the quest lasts as long as its type
+                quest_end = quest_start + timedelta(days=quest.type.duration)
             users = []
             for user_id in user_quest_link_create.user_ids:
-                user = self.session.exec(select(User).where(User.id == user_id)).one()
+                user = (
+                    await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+                ).one()
                 users.append(user)
+                username = user.username
 
                 user_quest_link = UserQuestLink(
                     user_id=user_id,
@@ -100,24 +172,33 @@ class QuestController:
                 )
                 self.session.add(user_quest_link)
 
-            self.session.commit()
-            self.session.refresh(quest)
+            await self.session.commit()
+            await self.session.refresh(quest)
+            await quest_cache.invalidate(("id", quest_id))
+            await invalidate_user_views(user_quest_link_create.user_ids)
 
             return QuestWithUser(**quest.model_dump(), users=users)
         except NoResultFound:
             raise QuestNotFoundError(quest_id=quest_id)
         except IntegrityError:
-            self.session.rollback()
-            raise QuestAlreadyInUserError(username=user.username, quest_id=quest_id)
+            await self.session.rollback()
+            raise QuestAlreadyInUserError(username=username, quest_id=quest_id)
 
     async def remove_quest_from_user(self, quest_id: UUID, user_id: UUID) -> None:
         try:
-            user_quest_link = self.session.exec(
-                select(UserQuestLink)
-                .where(UserQuestLink.quest_id == quest_id)
-                .where(UserQuestLink.user_id == user_id)
+            user_quest_link = (
+                await self.session.exec(
+                    USER_QUEST_LINK, params={"user_id": user_id, "quest_id": quest_id}
+                )
             ).one()
-            self.session.delete(user_quest_link)
-            self.session.commit()
+            await self.session.delete(user_quest_link)
+            await self.session.commit()
+            await quest_cache.invalidate(("id", quest_id))
+            await user_view_cache.invalidate(user_id)
         except NoResultFound:
             raise QuestInUserNotFoundError(quest_id=quest_id, user_id=user_id)
+
+    async def _get_user_ids(self, quest_id: UUID) -> Sequence[UUID]:
+        return (
+            await self.session.exec(QUEST_USER_IDS, params={"quest_id": quest_id})
+        ).all()
@@ -1,35 +1,46 @@
-from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy import bindparam
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from loguru import logger
+from leveluplife.controllers.cache import user_view_cache
 from leveluplife.models.error import (
     RatingAlreadyExistsError,
     RatingNotFoundError,
 )
 from leveluplife.models.rating import RatingCreate, RatingUpdate
 from leveluplife.models.table import Rating
+from leveluplife.models.view import RatingView, construct_views, view_columns
+from leveluplife.pagination import paginate
+
+RATING_BY_ID = select(Rating).where(Rating.id == bindparam("rating_id"))
+RATING_BY_TASK_AND_USER = select(Rating).where(
+    Rating.task_id == bindparam("task_id"), Rating.user_id == bindparam("user_id")
+)
+
+# Pages of ratings, selected as plain rows of the view's columns
+RATING_VIEWS = select(*view_columns(RatingView, Rating))
 
 
 class RatingController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def get_rating_by_task_and_user(
+    async def get_rating_by_task_and_user(
         self, task_id: UUID, user_id: UUID
     ) -> Rating | None:
-        statement = select(Rating).where(
-            Rating.task_id == task_id, Rating.user_id == user_id
+        result = await self.session.exec(
+            RATING_BY_TASK_AND_USER, params={"task_id": task_id, "user_id": user_id}
         )
-        result = self.session.exec(statement)
         return result.one_or_none()
 
     async def create_rating(self, rating_create: RatingCreate) -> Rating:
         logger.info(
             f"Creating rating for task: {rating_create.task_id} as user: {rating_create.user_id}"
         )
-        existing_rating = self.get_rating_by_task_and_user(
+        existing_rating = await self.get_rating_by_task_and_user(
             rating_create.task_id, rating_create.user_id
         )
         if existing_rating:
@@ -37,18 +48,34 @@ class RatingController:
 
         new_rating = Rating(**rating_create.model_dump())
         self.session.add(new_rating)
-        self.session.commit()
-        self.session.refresh(new_rating)
+        await self.session.commit()
+        await self.session.refresh(new_rating)
+        await user_view_cache.invalidate(new_rating.user_id)
         return new_rating
 
-    async def get_ratings(self, offset: int, limit: int) -> Sequence[Rating]:
+    async def get_ratings(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> list[RatingView]:
         logger.info("Getting ratings")
-        return self.session.exec(select(Rating).offset(offset).limit(limit)).all()
+        return construct_views(
+            await self.session.exec(
+                paginate(
+                    RATING_VIEWS,
+                    (Rating.created_at, Rating.id),
+                    offset,
+                    limit,
+                    cursor,
+                )
+            ),
+            RatingView,
+        )
 
     async def get_rating_by_id(self, rating_id: UUID) -> Rating:
         try:
             logger.info(f"Getting rating by id: {rating_id}")
-            return self.session.exec(select(Rating).where(Rating.id == rating_id)).one()
+            return (
+                await self.session.exec(RATING_BY_ID, params={"rating_id": rating_id})
+            ).one()
         except NoResultFound:
             raise RatingNotFoundError(rating_id=rating_id)
 
@@ -56,14 +83,15 @@ class RatingController:
         self, rating_id: UUID, rating_update: RatingUpdate
     ) -> Rating:
         try:
-            db_rating = self.session.exec(
-                select(Rating).where(Rating.id == rating_id)
+            db_rating = (
+                await self.session.exec(RATING_BY_ID, params={"rating_id": rating_id})
             ).one()
             db_rating_data = rating_update.model_dump(exclude_unset=True)
             db_rating.sqlmodel_update(db_rating_data)
             self.session.add(db_rating)
-            self.session.commit()
-            self.session.refresh(db_rating)
+            await self.session.commit()
+            await self.session.refresh(db_rating)
+            await user_view_cache.invalidate(db_rating.user_id)
             logger.info(f"Updated rating: {db_rating.id}")
             return db_rating
         except NoResultFound:
@@ -71,11 +99,12 @@ class RatingController:
 
     async def delete_rating(self, rating_id: UUID) -> None:
         try:
-            db_rating = self.session.exec(
-                select(Rating).where(Rating.id == rating_id)
+            db_rating = (
+                await self.session.exec(RATING_BY_ID, params={"rating_id": rating_id})
             ).one()
-            self.session.delete(db_rating)
-            self.session.commit()
+            await self.session.delete(db_rating)
+            await self.session.commit()
+            await user_view_cache.invalidate(db_rating.user_id)
             logger.info(f"Deleted rating: {db_rating.id}")
         except NoResultFound:
             raise RatingNotFoundError(rating_id=rating_id)
@@ -1,31 +1,43 @@
-from typing import Sequence
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import bindparam
 from sqlalchemy.exc import NoResultFound
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from leveluplife.controllers.cache import user_view_cache
 from leveluplife.models.error import ReactionAlreadyExistsError, ReactionNotFoundError
 from leveluplife.models.reaction import ReactionCreate, ReactionUpdate
 from leveluplife.models.table import Reaction
+from leveluplife.models.view import ReactionView, construct_views, view_columns
+from leveluplife.pagination import paginate
 from loguru import logger
 
+REACTION_BY_ID = select(Reaction).where(Reaction.id == bindparam("reaction_id"))
+REACTION_BY_TASK_AND_USER = select(Reaction).where(
+    Reaction.task_id == bindparam("task_id"), Reaction.user_id == bindparam("user_id")
+)
+
+# Pages of reactions, selected as plain rows of the view's columns
+REACTION_VIEWS = select(*view_columns(ReactionView, Reaction))
+
 
 class ReactionController:
-    def __init__(self, session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def get_reaction_by_task_and_user(self, task_id, user_id) -> Reaction | None:
-        statement = select(Reaction).where(
-            Reaction.task_id == task_id, Reaction.user_id == user_id
+    async def get_reaction_by_task_and_user(self, task_id, user_id) -> Reaction | None:
+        result = await self.session.exec(
+            REACTION_BY_TASK_AND_USER, params={"task_id": task_id, "user_id": user_id}
         )
-        result = self.session.exec(statement)
         return result.one_or_none()
 
     async def create_reaction(self, reaction_create: ReactionCreate) -> Reaction:
         logger.info(
             f"Creating reaction for task: {reaction_create.task_id} as user: {reaction_create.user_id}"
         )
-        existing_reaction = self.get_reaction_by_task_and_user(
+        existing_reaction = await self.get_reaction_by_task_and_user(
             reaction_create.task_id, reaction_create.user_id
         )
         if existing_reaction:
@@ -33,19 +45,35 @@ class ReactionController:
 
         new_reaction = Reaction(**reaction_create.model_dump())
         self.session.add(new_reaction)
-        self.session.commit()
-        self.session.refresh(new_reaction)
+        await self.session.commit()
+        await self.session.refresh(new_reaction)
+        await user_view_cache.invalidate(new_reaction.user_id)
         return new_reaction
 
-    async def get_reactions(self, offset: int, limit: int) -> Sequence[Reaction]:
+    async def get_reactions(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> list[ReactionView]:
         logger.info("Getting reactions")
-        return self.session.exec(select(Reaction).offset(offset).limit(limit)).all()
+        return construct_views(
+            await self.session.exec(
+                paginate(
+                    REACTION_VIEWS,
+                    (Reaction.created_at, Reaction.id),
+                    offset,
+                    limit,
+                    cursor,
+                )
+            ),
+            ReactionView,
+        )
 
     async def get_reaction_by_id(self, reaction_id: UUID) -> Reaction:
         try:
             logger.info(f"Getting reaction by id: {reaction_id}")
-            return self.session.exec(
-                select(Reaction).where(Reaction.id == reaction_id)
+            return (
+                await self.session.exec(
+                    REACTION_BY_ID, params={"reaction_id": reaction_id}
+                )
             ).one()
         except NoResultFound:
             raise ReactionNotFoundError(reaction_id=reaction_id)
@@ -54,14 +82,18 @@ class ReactionController:
         self, reaction_id: UUID, reaction_update: ReactionUpdate
     ) -> Reaction:
         try:
-            db_reaction = self.session.exec(
-                select(Reaction).where(Reaction.id == reaction_id)
+            db_reaction = (
+                await self.session.exec(
+                    REACTION_BY_ID, params={"reaction_id": reaction_id}
+                )
             ).one()
             db_reaction_data = reaction_update.model_dump(exclude_unset=True)
             db_reaction.sqlmodel_update(db_reaction_data)
+            db_reaction.updated_at = datetime.now()
             self.session.add(db_reaction)
-            self.session.commit()
-            self.session.refresh(db_reaction)
+            await self.session.commit()
+            await self.session.refresh(db_reaction)
+            await user_view_cache.invalidate(db_reaction.user_id)
             logger.info(f"Updated comment: {db_reaction.id}")
             return db_reaction
         except NoResultFound:
@@ -69,11 +101,14 @@ class ReactionController:
 
     async def delete_reaction(self, reaction_id: UUID) -> None:
         try:
-            db_reaction = self.session.exec(
-                select(Reaction).where(Reaction.id == reaction_id)
+            db_reaction = (
+                await self.session.exec(
+                    REACTION_BY_ID, params={"reaction_id": reaction_id}
+                )
             ).one()
-            self.session.delete(db_reaction)
-            self.session.commit()
+            await self.session.delete(db_reaction)
+            await self.session.commit()
+            await user_view_cache.invalidate(db_reaction.user_id)
             logger.info(f"Deleted reaction: {db_reaction.id}")
         except NoResultFound:
             raise ReactionNotFoundError(reaction_id=reaction_id)
@@ -1,8 +1,10 @@
-from typing import Sequence
 from uuid import UUID
 from loguru import logger
+from sqlalchemy import bindparam
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from leveluplife.controllers.cache import user_view_cache
 from leveluplife.models.error import (
     TaskAlreadyExistsError,
     TaskNotFoundError,
@@ -10,49 +12,80 @@ from leveluplife.models.error import (
 )
 from leveluplife.models.table import Task
 from leveluplife.models.task import TaskCreate, TaskUpdate
+from leveluplife.models.view import TaskView, construct_views, view_columns
+from leveluplife.pagination import paginate
+
+TASK_BY_ID = select(Task).where(Task.id == bindparam("task_id"))
+TASK_BY_TITLE = select(Task).where(Task.title == bindparam("task_title"))
+
+# Pages of tasks, selected as plain rows of the view's columns
+TASK_VIEWS = select(*view_columns(TaskView, Task))
 
 
 class TaskController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def create_task(self, task_create: TaskCreate) -> Task:
         try:
             new_task = Task(**task_create.model_dump())
             self.session.add(new_task)
-            self.session.commit()
-            self.session.refresh(new_task)
+            await self.session.commit()
+            await self.session.refresh(new_task)
+            await user_view_cache.invalidate(new_task.user_id)
             logger.info(f"New task created: {new_task.title}")
             return new_task
         except IntegrityError:
             raise TaskAlreadyExistsError(title=task_create.title)
 
-    async def get_tasks(self, offset: int, limit: int) -> Sequence[Task]:
+    async def get_tasks(
+        self, offset: int, limit: int, cursor: str | None = None
+    ) -> list[TaskView]:
         logger.info("Getting tasks")
-        return self.session.exec(select(Task).offset(offset).limit(limit)).all()
+        return construct_views(
+            await self.session.exec(
+                paginate(
+                    TASK_VIEWS,
+                    (Task.created_at, Task.id),
+                    offset,
+                    limit,
+                    cursor,
+                )
+            ),
+            TaskView,
+        )
 
     async def get_task_by_id(self, task_id: UUID) -> Task:
         try:
             logger.info(f"Getting task by id: {task_id}")
-            return self.session.exec(select(Task).where(Task.id == task_id)).one()
+            return (
+                await self.session.exec(TASK_BY_ID, params={"task_id": task_id})
+            ).one()
         except NoResultFound:
             raise TaskNotFoundError(task_id=task_id)
 
     async def get_task_by_title(self, task_title: str) -> Task:
         try:
             logger.info(f"Getting task by title: {task_title}")
-            return self.session.exec(select(Task).where(Task.title == task_title)).one()
+            return (
+                await self.session.exec(
+                    TASK_BY_TITLE, params={"task_title": task_title}
+                )
+            ).one()
         except NoResultFound:
             raise TaskTitleNotFoundError(task_title=task_title)
 
     async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Task:
         try:
-            db_task = self.session.exec(select(Task).where(Task.id == task_id)).one()
+            db_task = (
+                await self.session.exec(TASK_BY_ID, params={"task_id": task_id})
+            ).one()
             db_task_data = task_update.model_dump(exclude_unset=True)
             db_task.sqlmodel_update(db_task_data)
             self.session.add(db_task)
-            self.session.commit()
-            self.session.refresh(db_task)
+            await self.session.commit()
+            await self.session.refresh(db_task)
+            await user_view_cache.invalidate(db_task.user_id)
             logger.info(f"Updated task: {db_task.title}")
             return db_task
         except NoResultFound:
@@ -60,9 +93,12 @@ class TaskController:
 
     async def delete_task(self, task_id: UUID) -> None:
         try:
-            db_task = self.session.exec(select(Task).where(Task.id == task_id)).one()
-            self.session.delete(db_task)
-            self.session.commit()
+            db_task = (
+                await self.session.exec(TASK_BY_ID, params={"task_id": task_id})
+            ).one()
+            await self.session.delete(db_task)
+            await self.session.commit()
+            await user_view_cache.invalidate(db_task.user_id)
             logger.info(f"Deleted task: {db_task.title}")
         except NoResultFound:
             raise TaskNotFoundError(task_id=task_id)
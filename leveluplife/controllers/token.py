@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import bindparam, delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from leveluplife.models.token import RevokedToken
+
+REVOKED_TOKEN_BY_JTI = select(RevokedToken.jti).where(
+    RevokedToken.jti == bindparam("jti")
+)
+
+
+class TokenController:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_revoked_token_ids(self) -> Sequence[UUID]:
+        return (
+            await self.session.exec(
+                select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.now())
+            )
+        ).all()
+
+    async def is_revoked(self, jti: UUID) -> bool:
+        return (
+            await self.session.exec(REVOKED_TOKEN_BY_JTI, params={"jti": jti})
+        ).first() is not None
+
+    async def revoke(self, jti: UUID, user_id: UUID, expires_at: datetime) -> bool:
+        """Record a token as revoked, False when it already was."""
+        self.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            return False
+        return True
+
+    async def purge_expired(self) -> None:
+        # Expired tokens are refused on their own, their revocation is moot
+        result = await self.session.exec(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now())
+        )
+        await self.session.commit()
+        logger.info(f"Purged {result.rowcount} expired revoked tokens")
@@ -1,10 +1,21 @@
+from typing import Sequence
 from uuid import UUID
 
 from loguru import logger
+from sqlalchemy import bindparam
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlmodel import Session, select
-
-from leveluplife.auth.hash import get_password_hash
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from leveluplife.auth.cache import principal_cache, token_version_cache
+from leveluplife.auth.pool import password_hasher
+from leveluplife.controllers.cache import (
+    invalidate_linked_catalog,
+    missing_cache,
+    user_loads,
+    user_view_cache,
+)
 from leveluplife.models.error import (
     UserEmailAlreadyExistsError,
     UserEmailNotFoundError,
@@ -19,21 +30,90 @@ from leveluplife.models.user import Tribe, UserCreate, UserUpdate
 from leveluplife.models.view import (
     TaskView,
     UserView,
+    ItemView,
     ItemUserView,
     RatingView,
     CommentView,
     ReactionView,
+    QuestView,
     QuestUserView,
+    construct_view,
+    group_views,
+    view_columns,
+)
+from leveluplife.pagination import paginate
+
+USER_RELATIONSHIPS = ("items", "quests", "tasks", "ratings", "comments", "reactions")
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_BY_USERNAME = select(User).where(User.username == bindparam("user_username"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("user_email"))
+USER_TOKEN_VERSION = select(User.token_version).where(User.id == bindparam("user_id"))
+USER_ITEM_LINK = select(UserItemLink).where(
+    UserItemLink.user_id == bindparam("user_id"),
+    UserItemLink.item_id == bindparam("item_id"),
+)
+USER_ITEM_IDS = select(UserItemLink.item_id).where(
+    UserItemLink.user_id == bindparam("user_id")
+)
+USER_QUEST_IDS = select(UserQuestLink.quest_id).where(
+    UserQuestLink.user_id == bindparam("user_id")
+)
+USER_QUEST_LINK = select(UserQuestLink).where(
+    UserQuestLink.user_id == bindparam("user_id"),
+    UserQuestLink.quest_id == bindparam("quest_id"),
+)
+
+# Collections of a page of users, bound to an expanding list of user ids
+_USER_IDS = bindparam("user_ids", expanding=True)
+USER_ITEMS = (
+    select(UserItemLink.user_id, UserItemLink.equipped, *view_columns(ItemView, Item))
+    .join(Item, UserItemLink.item_id == Item.id)
+    .where(UserItemLink.user_id.in_(_USER_IDS))
+)
+USER_QUESTS = (
+    select(
+        UserQuestLink.user_id,
+        UserQuestLink.status,
+        UserQuestLink.quest_start,
+        UserQuestLink.quest_end,
+        *view_columns(QuestView, Quest),
+    )
+    .join(Quest, UserQuestLink.quest_id == Quest.id)
+    .where(UserQuestLink.user_id.in_(_USER_IDS))
+)
+USER_TASKS = select(*view_columns(TaskView, Task)).where(Task.user_id.in_(_USER_IDS))
+USER_RATINGS = select(*view_columns(RatingView, Rating)).where(
+    Rating.user_id.in_(_USER_IDS)
+)
+USER_COMMENTS = select(*view_columns(CommentView, Comment)).where(
+    Comment.user_id.in_(_USER_IDS)
+)
+USER_REACTIONS = select(*view_columns(ReactionView, Reaction)).where(
+    Reaction.user_id.in_(_USER_IDS)
 )
 
+# Collection queries of a page of users and the view of their rows, by relation
+USER_RELATION_QUERIES = {
+    "items": (USER_ITEMS, ItemUserView),
+    "quests": (USER_QUESTS, QuestUserView),
+    "tasks": (USER_TASKS, TaskView),
+    "ratings": (USER_RATINGS, RatingView),
+    "comments": (USER_COMMENTS, CommentView),
+    "reactions": (USER_REACTIONS, ReactionView),
+}
+
+# Fields of a user's view read from the user row, the collections aside
+USER_VIEW_FIELDS = [column.key for column in view_columns(UserView, User)]
+
 
 class UserController:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def create_user(self, user_create: UserCreate) -> User:
         try:
-            hashing_password = get_password_hash(user_create.password)
+            hashing_password = await password_hasher.hash(user_create.password)
 
             # Calculate initial stats based on the tribe
             initial_stats = self.calculate_initial_stats(user_create.tribe)
@@ -42,20 +122,30 @@ class UserController:
             new_user = User(**user_create.model_dump(), **initial_stats)
             new_user.password = hashing_password
             self.session.add(new_user)
-            self.session.commit()
-            self.session.refresh(new_user)
+            await self.session.commit()
+            await self.session.refresh(new_user)
+            await missing_cache.invalidate(("username", new_user.username))
+            await missing_cache.invalidate(("email", new_user.email))
+            # A new user has no related rows yet, mark its collections as loaded
+            # so they are never lazily fetched outside of the async session.
+            for relationship in USER_RELATIONSHIPS:
+                set_committed_value(new_user, relationship, [])
             logger.info(f"New user created: {new_user.username}")
             return new_user
 
         except IntegrityError:
-            self.session.rollback()
-            existing_user_by_email = self.session.exec(
-                select(User).where(User.email == user_create.email)
+            await self.session.rollback()
+            existing_user_by_email = (
+                await self.session.exec(
+                    USER_BY_EMAIL, params={"user_email": user_create.email}
+                )
             ).first()
             if existing_user_by_email:
                 raise UserEmailAlreadyExistsError(email=user_create.email)
-            existing_user_by_username = self.session.exec(
-                select(User).where(User.username == user_create.username)
+            existing_user_by_username = (
+                await self.session.exec(
+                    USER_BY_USERNAME, params={"user_username": user_create.username}
+                )
             ).first()
             if existing_user_by_username:
                 raise UserUsernameAlreadyExistsError(username=user_create.username)
@@ -103,160 +193,198 @@ class UserController:
                 "psycho": 5,
             }
 
-    async def get_users(self, offset: int, limit: int) -> list[UserView]:
+    async def get_users(
+        self,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        include: tuple[str, ...] = USER_RELATIONSHIPS,
+    ) -> list[UserView]:
         logger.info("Getting users")
-        user_with_items = self.session.exec(
-            select(
-                User,
-                UserItemLink,
-                Item,
-                Task,
-                Rating,
-                Comment,
-                Reaction,
-                UserQuestLink,
-                Quest,
+        generation = user_view_cache.generation
+        users = (
+            await self.session.exec(
+                paginate(select(User), (User.username,), offset, limit, cursor)
             )
-            .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-            .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-            .join(Task, User.id == Task.user_id, isouter=True)
-            .join(Rating, User.id == Rating.user_id, isouter=True)
-            .join(Comment, User.id == Comment.user_id, isouter=True)
-            .join(Reaction, User.id == Reaction.user_id, isouter=True)
-            .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-            .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-            .order_by(User.username)
-            .offset(offset)
-            .limit(limit)
         ).all()
-        return self._construct_user_views(user_with_items)
+        return await self._construct_user_views(users, include, generation)
 
-    async def get_user_by_username(self, user_username: str) -> UserView:
+    async def get_user_by_username(
+        self, user_username: str, include: tuple[str, ...] = USER_RELATIONSHIPS
+    ) -> UserView:
+        if await missing_cache.get(("username", user_username)):
+            raise UserUsernameNotFoundError(user_username=user_username)
         logger.info(f"Getting user by username: {user_username}")
-        user_with_items = self.session.exec(
-            select(User, UserItemLink, Item, UserQuestLink, Quest)
-            .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-            .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-            .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-            .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-            .where(User.username == user_username)
-        ).all()
-        if not user_with_items:
+        generation = user_view_cache.generation
+        missing_generation = missing_cache.generation
+        user = (
+            await self.session.exec(
+                USER_BY_USERNAME, params={"user_username": user_username}
+            )
+        ).first()
+        if not user:
+            await missing_cache.set(
+                ("username", user_username), True, missing_generation
+            )
             raise UserUsernameNotFoundError(user_username=user_username)
-        return self._construct_user_view(user_with_items)
+        return await self._construct_user_view(user, include, generation)
 
     async def get_user_by_username_with_password(self, user_username: str) -> User:
-        return self.session.exec(
-            select(User).where(User.username == user_username)
+        return (
+            await self.session.exec(
+                USER_BY_USERNAME, params={"user_username": user_username}
+            )
         ).one()
 
-    async def get_user_by_email(self, user_email: str) -> UserView:
+    async def get_user_by_email(
+        self, user_email: str, include: tuple[str, ...] = USER_RELATIONSHIPS
+    ) -> UserView:
+        if await missing_cache.get(("email", user_email)):
+            raise UserEmailNotFoundError(user_email=user_email)
         logger.info(f"Getting user by email: {user_email}")
-        user_with_items = self.session.exec(
-            select(User, UserItemLink, Item, UserQuestLink, Quest)
-            .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-            .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-            .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-            .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-            .where(User.email == user_email)
-        ).all()
-        if not user_with_items:
+        generation = user_view_cache.generation
+        missing_generation = missing_cache.generation
+        user = (
+            await self.session.exec(USER_BY_EMAIL, params={"user_email": user_email})
+        ).first()
+        if not user:
+            await missing_cache.set(("email", user_email), True, missing_generation)
             raise UserEmailNotFoundError(user_email=user_email)
-        return self._construct_user_view(user_with_items)
+        return await self._construct_user_view(user, include, generation)
 
     async def get_users_by_tribe(
-        self, user_tribe: Tribe, offset: int, limit: int
+        self,
+        user_tribe: Tribe,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        include: tuple[str, ...] = USER_RELATIONSHIPS,
     ) -> list[UserView]:
         logger.info(f"Getting users by tribe: {user_tribe}")
-        user_with_items = self.session.exec(
-            select(
-                User,
-                UserItemLink,
-                Item,
-                Task,
-                Rating,
-                Comment,
-                Reaction,
-                UserQuestLink,
-                Quest,
+        generation = user_view_cache.generation
+        users = (
+            await self.session.exec(
+                paginate(
+                    select(User).where(User.tribe == user_tribe),
+                    (User.username,),
+                    offset,
+                    limit,
+                    cursor,
+                )
             )
-            .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-            .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-            .join(Task, User.id == Task.user_id, isouter=True)
-            .join(Rating, User.id == Rating.user_id, isouter=True)
-            .join(Comment, User.id == Comment.user_id, isouter=True)
-            .join(Reaction, User.id == Reaction.user_id, isouter=True)
-            .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-            .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-            .offset(offset)
-            .limit(limit)
-            .where(User.tribe == user_tribe)
         ).all()
-
-        return self._construct_user_views(user_with_items)
+        return await self._construct_user_views(users, include, generation)
 
     async def update_user(self, user_id: UUID, user_update: UserUpdate) -> UserView:
         try:
-            db_user = self.session.exec(select(User).where(User.id == user_id)).one()
+            db_user = (
+                await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+            ).one()
+            username, email, tribe = db_user.username, db_user.email, db_user.tribe
             db_user_data = user_update.model_dump(exclude_unset=True)
             db_user.sqlmodel_update(db_user_data)
+            # Tokens carry the username and tribe, revoke those now outdated
+            if (db_user.username, db_user.tribe) != (username, tribe):
+                db_user.token_version += 1
             self.session.add(db_user)
-            self.session.commit()
-            self.session.refresh(db_user)
+            await self.session.commit()
+            await principal_cache.invalidate(username)
+            await token_version_cache.set(db_user.id, db_user.token_version)
+            await user_view_cache.invalidate(db_user.id)
+            if db_user.username != username:
+                await missing_cache.invalidate(("username", db_user.username))
+            if db_user.email != email:
+                await missing_cache.invalidate(("email", db_user.email))
+            await invalidate_linked_catalog(*await self._get_linked_ids(user_id))
+            await self.session.refresh(db_user)
             logger.info(f"Updated user: {db_user.username}")
-            user_with_items = self.session.exec(
-                select(User, UserItemLink, Item, UserQuestLink, Quest)
-                .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-                .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-                .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-                .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-                .where(User.id == db_user.id)
-            ).all()
-            return self._construct_user_view(user_with_items)
+            return await self._construct_user_view(db_user)
         except NoResultFound:
             raise UserNotFoundError(user_id=user_id)
 
     async def delete_user(self, user_id: UUID) -> None:
         try:
-            db_user = self.session.exec(select(User).where(User.id == user_id)).one()
-            self.session.delete(db_user)
-            self.session.commit()
+            db_user = (
+                await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+            ).one()
+            # The links go with the user, read them first
+            linked_ids = await self._get_linked_ids(user_id)
+            await self.session.delete(db_user)
+            await self.session.commit()
+            await principal_cache.invalidate(db_user.username)
+            await token_version_cache.invalidate(db_user.id)
+            await user_view_cache.invalidate(db_user.id)
+            await invalidate_linked_catalog(*linked_ids)
             logger.info(f"Deleted user: {db_user.username}")
         except NoResultFound:
             raise UserNotFoundError(user_id=user_id)
 
     async def update_user_password(self, user_id: UUID, password: str) -> UserView:
         try:
-            db_user = self.session.exec(select(User).where(User.id == user_id)).one()
+            db_user = (
+                await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+            ).one()
             db_user.password = password
+            # Tokens issued before the change are revoked
+            db_user.token_version += 1
             self.session.add(db_user)
-            self.session.commit()
-            self.session.refresh(db_user)
+            await self.session.commit()
+            await principal_cache.invalidate(db_user.username)
+            await token_version_cache.set(db_user.id, db_user.token_version)
+            await self.session.refresh(db_user)
             logger.info(f"Updated user password: {db_user.username}")
-            user_with_items = self.session.exec(
-                select(User, UserItemLink, Item, UserQuestLink, Quest)
-                .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-                .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-                .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-                .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-                .where(User.id == db_user.id)
-            ).all()
-            return self._construct_user_view(user_with_items)
+            return await self._construct_user_view(db_user)
         except NoResultFound:
             raise UserNotFoundError(user_id=user_id)
 
+    async def _get_linked_ids(
+        self, user_id: UUID
+    ) -> tuple[Sequence[UUID], Sequence[UUID]]:
+        params = {"user_id": user_id}
+        return (
+            (await self.session.exec(USER_ITEM_IDS, params=params)).all(),
+            (await self.session.exec(USER_QUEST_IDS, params=params)).all(),
+        )
+
+    async def get_token_version(self, user_id: UUID) -> int | None:
+        return (
+            await self.session.exec(USER_TOKEN_VERSION, params={"user_id": user_id})
+        ).first()
+
+    async def revoke_user_tokens(self, user_id: UUID) -> None:
+        db_user = (
+            await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+        ).first()
+        if db_user is None:
+            return
+        db_user.token_version += 1
+        self.session.add(db_user)
+        await self.session.commit()
+        await principal_cache.invalidate(db_user.username)
+        await token_version_cache.set(db_user.id, db_user.token_version)
+        logger.info(f"Revoked every token of user: {db_user.username}")
+
+    async def update_password_hash(self, user: User, hashed_password: str) -> None:
+        user.password = hashed_password
+        self.session.add(user)
+        await self.session.commit()
+        await principal_cache.invalidate(user.username)
+        logger.info(f"Rehashed password of user: {user.username}")
+
     async def equip_item_to_user(
         self, user_id: UUID, item_id: UUID, equipped: bool
     ) -> UserView:
         try:
-            self.session.exec(select(User).where(User.id == user_id)).one()
+            user = (
+                await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+            ).one()
         except NoResultFound:
             raise UserNotFoundError(user_id=user_id)
 
         try:
-            item_link = self.session.exec(
-                select(UserItemLink).where(
-                    UserItemLink.user_id == user_id, UserItemLink.item_id == item_id
+            item_link = (
+                await self.session.exec(
+                    USER_ITEM_LINK, params={"user_id": user_id, "item_id": item_id}
                 )
             ).one()
         except NoResultFound:
@@ -264,154 +392,82 @@ class UserController:
 
         item_link.equipped = equipped
         self.session.add(item_link)
-        self.session.commit()
-        self.session.refresh(item_link)
-
-        return await self.get_user_by_id(user_id)
-
-    async def get_user_by_id(self, user_id: UUID) -> UserView:
-        user_with_items = self.session.exec(
-            select(User, UserItemLink, Item, UserQuestLink, Quest)
-            .join(UserItemLink, User.id == UserItemLink.user_id, isouter=True)
-            .join(Item, UserItemLink.item_id == Item.id, isouter=True)
-            .join(UserQuestLink, User.id == UserQuestLink.user_id, isouter=True)
-            .join(Quest, UserQuestLink.quest_id == Quest.id, isouter=True)
-            .where(User.id == user_id)
-        ).all()
+        await self.session.commit()
+        await self.session.refresh(item_link)
+        await user_view_cache.invalidate(user_id)
 
-        if not user_with_items:
-            raise UserNotFoundError(user_id=user_id)
+        return await self._construct_user_view(user)
 
-        return self._construct_user_view(user_with_items)
+    async def get_user_by_id(
+        self, user_id: UUID, include: tuple[str, ...] = USER_RELATIONSHIPS
+    ) -> UserView:
+        if (user_view := await user_view_cache.get(user_id)) is not None:
+            return user_view
+        return await user_loads.run(
+            (user_id, include), lambda: self._load_user_by_id(user_id, include)
+        )
 
-    def _construct_user_view(self, user_with_items_and_quests) -> UserView:
-        user, user_item_link, item, user_quest_link, quest = user_with_items_and_quests[
-            0
-        ]
+    async def _load_user_by_id(
+        self, user_id: UUID, include: tuple[str, ...]
+    ) -> UserView:
+        generation = user_view_cache.generation
+        user = (
+            await self.session.exec(USER_BY_ID, params={"user_id": user_id})
+        ).first()
+        if not user:
+            raise UserNotFoundError(user_id=user_id)
+        return await self._construct_user_view(user, include, generation)
 
-        user_items = [
-            ItemUserView(
-                **item.model_dump(),
-                equipped=user_item_link.equipped,
-            )
-            for _, user_item_link, item, _, _ in user_with_items_and_quests
-            if item
-        ]
-
-        user_quests = [
-            QuestUserView(
-                **quest.model_dump(),
-                user_id=user.id,
-                quest_start=user_quest_link.quest_start,
-                quest_end=user_quest_link.quest_end,
-                status=user_quest_link.status,
-            )
-            for _, _, _, user_quest_link, quest in user_with_items_and_quests
-            if quest
-        ]
-
-        return UserView(
-            items=user_items,
-            quests=user_quests,
-            **user.model_dump(exclude={"password"}),
-            tasks=[
-                TaskView(
-                    **task.model_dump(),
-                )
-                for task in user.tasks
-            ],
-            ratings=[
-                RatingView(
-                    **rating.model_dump(),
-                )
-                for rating in user.ratings
-            ],
-            comments=[
-                CommentView(
-                    **comment.model_dump(),
-                )
-                for comment in user.comments
-            ],
-            reactions=[
-                ReactionView(
-                    **reaction.model_dump(),
-                )
-                for reaction in user.reactions
-            ],
-        )
+    async def _construct_user_view(
+        self,
+        user: User,
+        include: tuple[str, ...] = USER_RELATIONSHIPS,
+        generation: int | None = None,
+    ) -> UserView:
+        return (await self._construct_user_views([user], include, generation))[0]
 
-    def _construct_user_views(self, user_with_items_and_quests) -> list[UserView]:
-        users = {}
-        for (
-            user,
-            user_item_link,
-            item,
-            task,
-            rating,
-            comment,
-            reaction,
-            user_quest_link,
-            quest,
-        ) in user_with_items_and_quests:
-            if user.id not in users:
-                users[user.id] = {
-                    "user": user,
-                    "items": {},
-                    "tasks": {},
-                    "ratings": {},
-                    "comments": {},
-                    "reactions": {},
-                    "quests": {},
-                }
-
-            if user_item_link and item:
-                item_key = (item.id, user.id)
-                if item_key not in users[user.id]["items"]:
-                    users[user.id]["items"][item_key] = ItemUserView(
-                        **item.model_dump(), equipped=user_item_link.equipped
-                    )
-
-            if task:
-                if task.id not in users[user.id]["tasks"]:
-                    users[user.id]["tasks"][task.id] = TaskView(**task.model_dump())
-
-            if rating:
-                if rating.id not in users[user.id]["ratings"]:
-                    users[user.id]["ratings"][rating.id] = RatingView(
-                        **rating.model_dump()
-                    )
-
-            if comment:
-                if comment.id not in users[user.id]["comments"]:
-                    users[user.id]["comments"][comment.id] = CommentView(
-                        **comment.model_dump()
-                    )
-
-            if reaction:
-                if reaction.id not in users[user.id]["reactions"]:
-                    users[user.id]["reactions"][reaction.id] = ReactionView(
-                        **reaction.model_dump()
-                    )
-
-            if user_quest_link and quest:
-                quest_key = (quest.id, user.id)
-                if quest_key not in users[user.id]["quests"]:
-                    users[user.id]["quests"][quest_key] = QuestUserView(
-                        quest_start=user_quest_link.quest_start,
-                        quest_end=user_quest_link.quest_end,
-                        status=user_quest_link.status,
-                        **quest.model_dump(),
-                    )
-
-        return [
-            UserView(
-                **user_data["user"].model_dump(exclude={"password"}),
-                items=list(user_data["items"].values()),
-                tasks=list(user_data["tasks"].values()),
-                ratings=list(user_data["ratings"].values()),
-                comments=list(user_data["comments"].values()),
-                reactions=list(user_data["reactions"].values()),
-                quests=list(user_data["quests"].values()),
+    async def _construct_user_views(
+        self,
+        users: Sequence[User],
+        include: tuple[str, ...] = USER_RELATIONSHIPS,
+        generation: int | None = None,
+    ) -> list[UserView]:
+        # Users are paged on their own, then each included collection is loaded
+        # with a single IN query for the whole page instead of joining every
+        # relation. Only users whose view is not cached are assembled, and only
+        # complete views are cached: those left out of ``include`` stay empty.
+        # ``generation`` is that of the view cache before the user rows were
+        # read, a view is not cached when a write dropped views since.
+        complete = include == USER_RELATIONSHIPS
+        if generation is None:
+            generation = user_view_cache.generation
+        user_views = {user.id: await user_view_cache.get(user.id) for user in users}
+        user_ids = [user_id for user_id, view in user_views.items() if view is None]
+        if not user_ids:
+            return [user_views[user.id] for user in users]
+
+        params = {"user_ids": user_ids}
+        relations = {}
+        for relation in include:
+            query, view = USER_RELATION_QUERIES[relation]
+            relations[relation] = group_views(
+                await self.session.exec(query, params=params), view
             )
-            for user_data in users.values()
-        ]
+
+        for user in users:
+            if user_views[user.id] is None:
+                user_views[user.id] = construct_view(
+                    UserView,
+                    {
+                        **{name: getattr(user, name) for name in USER_VIEW_FIELDS},
+                        **{
+                            relation: relations[relation][user.id]
+                            if relation in relations
+                            else []
+                            for relation in USER_RELATIONSHIPS
+                        },
+                    },
+                )
+                if complete:
+                    await user_view_cache.set(user.id, user_views[user.id], generation)
+        return [user_views[user.id] for user in users]
@@ -1,14 +1,125 @@
-from sqlalchemy import Engine, create_engine
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from sqlalchemy import URL, Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from leveluplife.settings import Settings
 
 
-def create_app_engine():
-    settings = Settings()
-    engine = create_engine(settings.database_url, echo=True)
+@dataclass
+class QueryStats:
+    """SQL statements of a request, their database time and the rows returned.
+
+    Rows are those the driver reports in ``cursor.rowcount`` once a query has
+    run, which psycopg and asyncpg set to the rows of a SELECT. SQLite drivers
+    only know them once fetched and report -1, so ``rows`` stays 0 there.
+    """
+
+    statements: int = 0
+    duration: float = 0.0
+    rows: int = 0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Keyed by cursor, so a statement that fails leaves nothing behind
+    conn.info.setdefault("query_start_time", {})[cursor] = time.perf_counter()
+
+
+def _record_statement(conn, cursor) -> QueryStats | None:
+    started = conn.info.get("query_start_time", {}).pop(cursor, None)
+    stats = _query_stats.get()
+    if started is None or stats is None:
+        return None
+    stats.statements += 1
+    stats.duration += time.perf_counter() - started
+    return stats
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _record_statement(conn, cursor)
+    if stats is not None and cursor.description is not None and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements never reach after_cursor_execute, they count here
+    context = exception_context.execution_context
+    if exception_context.connection is not None and context is not None:
+        _record_statement(exception_context.connection, context.cursor)
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def get_async_database_url(database_url: str | URL) -> URL:
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def _engine_options(settings: Settings) -> dict[str, Any]:
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    # SQLite file databases use a pool without size limits.
+    if make_url(settings.database_url).get_backend_name() != "sqlite":
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return options
+
+
+def create_app_engine(settings: Settings | None = None) -> Engine:
+    settings = settings or Settings()
+    engine = create_engine(settings.database_url, **_engine_options(settings))
+    instrument_engine(engine)
     return engine
 
 
-def create_db_and_tables(engine: Engine):
-    SQLModel.metadata.create_all(engine)
+def create_async_app_engine(settings: Settings | None = None) -> AsyncEngine:
+    settings = settings or Settings()
+    url = get_async_database_url(settings.database_url)
+    if url.drivername == "postgresql+asyncpg":
+        # asyncpg prepares every statement server-side and keeps this many per
+        # connection, so repeated queries skip parsing and planning.
+        cache_size = str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)
+        url = url.update_query_dict({"prepared_statement_cache_size": cache_size})
+    engine = create_async_engine(url, **_engine_options(settings))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def create_db_and_tables(engine: AsyncEngine):
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
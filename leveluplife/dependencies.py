@@ -1,5 +1,5 @@
-from fastapi import Depends
-from sqlmodel import Session
+from fastapi import Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from leveluplife.controllers.comment import CommentController
 from leveluplife.controllers.item import ItemController
@@ -7,43 +7,52 @@ from leveluplife.controllers.quest import QuestController
 from leveluplife.controllers.rating import RatingController
 from leveluplife.controllers.reaction import ReactionController
 from leveluplife.controllers.task import TaskController
+from leveluplife.controllers.token import TokenController
 from leveluplife.controllers.user import UserController
-from leveluplife.database import create_app_engine
 
 
-def get_session():
-    engine = create_app_engine()
-    with Session(engine) as session:
+async def get_session(request: Request):
+    async with request.app.state.session_factory() as session:
         yield session
 
 
-def get_user_controller(session: Session = Depends(get_session)) -> UserController:
+def get_user_controller(session: AsyncSession = Depends(get_session)) -> UserController:
     return UserController(session)
 
 
-def get_task_controller(session: Session = Depends(get_session)) -> TaskController:
+def get_task_controller(session: AsyncSession = Depends(get_session)) -> TaskController:
     return TaskController(session)
 
 
-def get_item_controller(session: Session = Depends(get_session)) -> ItemController:
+def get_item_controller(session: AsyncSession = Depends(get_session)) -> ItemController:
     return ItemController(session)
 
 
-def get_rating_controller(session: Session = Depends(get_session)) -> RatingController:
+def get_rating_controller(
+    session: AsyncSession = Depends(get_session),
+) -> RatingController:
     return RatingController(session)
 
 
 def get_reaction_controller(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ) -> ReactionController:
     return ReactionController(session)
 
 
 def get_comment_controller(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ) -> CommentController:
     return CommentController(session)
 
 
-def get_quest_controller(session: Session = Depends(get_session)) -> QuestController:
+def get_quest_controller(
+    session: AsyncSession = Depends(get_session),
+) -> QuestController:
     return QuestController(session)
+
+
+def get_token_controller(
+    session: AsyncSession = Depends(get_session),
+) -> TokenController:
+    return TokenController(session)
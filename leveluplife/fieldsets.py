@@ -0,0 +1,69 @@
+from typing import Sequence
+
+from fastapi import Query, Response
+from pydantic import TypeAdapter
+
+from leveluplife.controllers.user import USER_RELATIONSHIPS
+from leveluplife.models.error import InvalidFieldsetError
+from leveluplife.models.view import UserView
+from leveluplife.responses import ViewResponse
+
+# Fields of a user's view besides its relations
+USER_FIELDS = tuple(
+    name for name in UserView.model_fields if name not in USER_RELATIONSHIPS
+)
+
+_USER_VIEW = TypeAdapter(UserView)
+_USER_VIEWS = TypeAdapter(list[UserView])
+
+
+def _parse(parameter: str, value: str | None, allowed: tuple[str, ...]) -> tuple:
+    if value is None:
+        return allowed
+    names = {name.strip() for name in value.split(",")} - {""}
+    if unknown := sorted(names.difference(allowed)):
+        raise InvalidFieldsetError(parameter=parameter, names=unknown)
+    # Kept in the order of the view, whatever the order asked for
+    return tuple(name for name in allowed if name in names)
+
+
+class UserFieldset:
+    """Query parameters choosing what the user routes return.
+
+    ``fields`` lists the user's own fields and ``include`` the relations to
+    load, both comma separated. Either one left out returns all of its kind,
+    and an empty ``include`` loads no relation at all.
+    """
+
+    def __init__(
+        self,
+        fields: str
+        | None = Query(default=None, description=f"Any of {', '.join(USER_FIELDS)}"),
+        include: str
+        | None = Query(
+            default=None, description=f"Any of {', '.join(USER_RELATIONSHIPS)}"
+        ),
+    ) -> None:
+        self.fields = _parse("fields", fields, USER_FIELDS)
+        self.include = _parse("include", include, USER_RELATIONSHIPS)
+
+    @property
+    def sparse(self) -> bool:
+        return (self.fields, self.include) != (USER_FIELDS, USER_RELATIONSHIPS)
+
+    def render(
+        self, content: UserView | Sequence[UserView], response: Response
+    ) -> Response:
+        """``content`` as the route returns it, cut down to the requested fields.
+
+        The body holds only the requested fields and keeps the headers already
+        set on ``response``, such as the next cursor.
+        """
+        if not self.sparse:
+            return ViewResponse(content, headers=response.headers)
+        include = {*self.fields, *self.include}
+        if isinstance(content, UserView):
+            body = _USER_VIEW.dump_json(content, include=include)
+        else:
+            body = _USER_VIEWS.dump_json(list(content), include={"__all__": include})
+        return Response(body, media_type="application/json", headers=response.headers)
@@ -0,0 +1,174 @@
+import math
+import time
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.formparsers import MultiPartException
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from leveluplife.database import QueryStats, collect_query_stats
+from leveluplife.models.error import (
+    LoginBodyTooLargeError,
+    TooManyLoginAttemptsError,
+)
+from leveluplife.ratelimit import LoginRateLimiter, login_rate_limiter
+from leveluplife.responses import error_response
+
+LOGIN_PATH = "/token/"
+
+# Bytes of a login form read before the request is turned down, a username
+# and a password take a few hundred
+MAX_LOGIN_BODY_SIZE = 16 * 1024
+
+
+def format_server_timing(stats: QueryStats, duration: float) -> str:
+    return (
+        f'db;dur={stats.duration * 1000:.2f};desc="{stats.statements} statements, '
+        f'{stats.rows} rows", app;dur={duration * 1000:.2f}'
+    )
+
+
+class QueryStatsMiddleware:
+    """Report the SQL statements, database time and rows of every request.
+
+    The figures are sent in a ``Server-Timing`` header and logged as one line
+    per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        with collect_query_stats() as stats:
+
+            async def send_with_server_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(stats, time.perf_counter() - started),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_server_timing)
+            finally:
+                duration = time.perf_counter() - started
+                logger.bind(
+                    method=scope["method"],
+                    path=scope["path"],
+                    status_code=status_code,
+                    duration_ms=round(duration * 1000, 2),
+                    db_statements=stats.statements,
+                    db_duration_ms=round(stats.duration * 1000, 2),
+                    db_rows=stats.rows,
+                ).info(
+                    f"{scope['method']} {scope['path']} {status_code} "
+                    f"duration_ms={duration * 1000:.2f} "
+                    f"db_statements={stats.statements} "
+                    f"db_duration_ms={stats.duration * 1000:.2f} "
+                    f"db_rows={stats.rows}"
+                )
+
+
+class LoginRateLimitMiddleware:
+    """Reject login attempts over the rate limit before the route runs.
+
+    The form body, URL encoded or multipart, is read here to find the
+    username, then replayed to the application, so a rejected attempt costs
+    neither a query nor a hash. Bodies over ``max_body_size`` are turned down
+    without being read to the end.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: LoginRateLimiter = login_rate_limiter,
+        max_body_size: int = MAX_LOGIN_BODY_SIZE,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != LOGIN_PATH
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = await self.read_body(scope, receive)
+        if body is None:
+            response = error_response(LoginBodyTooLargeError(self.max_body_size))
+            await response(scope, receive, send)
+            return
+
+        username = await read_username(scope, replay_body(body, receive))
+        ip = scope["client"][0] if scope.get("client") else ""
+        retry_after = await self.limiter.acquire(ip, username)
+        if retry_after:
+            response = error_response(
+                TooManyLoginAttemptsError(),
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, replay_body(body, receive), send)
+
+    async def read_body(self, scope: Scope, receive: Receive) -> bytes | None:
+        """The whole request body, or None past ``max_body_size`` bytes."""
+        content_length = Request(scope).headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            return None
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """Receive ``body`` once, then the messages that follow it, disconnects."""
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+async def read_username(scope: Scope, receive: Receive) -> str:
+    """Username field of a login form, empty when there is none to be read."""
+    request = Request(scope, receive)
+    try:
+        # A login form has no file, a body holding one is malformed here
+        async with request.form(max_files=0, max_fields=10) as form:
+            username = form.get("username")
+    except (HTTPException, MultiPartException):
+        return ""
+    return username if isinstance(username, str) else ""
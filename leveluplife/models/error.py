@@ -366,3 +366,80 @@ class QuestInUserNotFoundError(BaseError):
         super().__init__(
             name=self.name, message=self.message, status_code=self.status_code
         )
+
+
+class InvalidCursorError(BaseError):
+    def __init__(
+        self, cursor: str, status_code: int = 400, name: str = "InvalidCursorError"
+    ):
+        self.name = name
+        self.message = f"Cursor {cursor} is not a valid pagination cursor."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
+
+
+class PasswordHashingUnavailableError(BaseError):
+    def __init__(
+        self, status_code: int = 503, name: str = "PasswordHashingUnavailableError"
+    ):
+        self.name = name
+        self.message = "Too many password operations in progress, retry later."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
+
+
+class LoginBodyTooLargeError(BaseError):
+    def __init__(
+        self,
+        max_size: int,
+        status_code: int = 413,
+        name: str = "LoginBodyTooLargeError",
+    ):
+        self.name = name
+        self.message = f"Login form over {max_size} bytes."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
+
+
+class TooManyLoginAttemptsError(BaseError):
+    def __init__(self, status_code: int = 429, name: str = "TooManyLoginAttemptsError"):
+        self.name = name
+        self.message = "Too many login attempts, retry later."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
+
+
+class InvalidFieldsetError(BaseError):
+    def __init__(
+        self,
+        parameter: str,
+        names: list[str],
+        status_code: int = 400,
+        name: str = "InvalidFieldsetError",
+    ):
+        self.name = name
+        self.message = f"Unknown {parameter}: {', '.join(names)}."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
+
+
+class CacheNotFoundError(BaseError):
+    def __init__(
+        self, cache_name: str, status_code: int = 404, name: str = "CacheNotFoundError"
+    ):
+        self.name = name
+        self.message = f"Cache {cache_name} not found."
+        self.status_code = status_code
+        super().__init__(
+            name=self.name, message=self.message, status_code=self.status_code
+        )
@@ -23,6 +23,7 @@ class User(UserBase, table=True):
     psycho: int = 0
     experience: int = 0
     password: str = Field(min_length=4)
+    token_version: int = Field(default=0, exclude=True)
     tasks: list["Task"] = Relationship(back_populates="user")
     items: list["Item"] = Relationship(back_populates="users", link_model=UserItemLink)
     ratings: list["Rating"] = Relationship(back_populates="user")
@@ -35,7 +36,7 @@ class User(UserBase, table=True):
 
 class Task(TaskBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     user: User | None = Relationship(back_populates="tasks")
     ratings: list["Rating"] = Relationship(back_populates="task")
     comments: list["Comment"] = Relationship(back_populates="task")
@@ -44,7 +45,7 @@ class Task(TaskBase, table=True):
 
 class Item(ItemBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     updated_at: datetime | None = Field(default=None)
     deleted_at: datetime | None = Field(default=None)
     users: list["User"] = Relationship(back_populates="items", link_model=UserItemLink)
@@ -52,14 +53,14 @@ class Item(ItemBase, table=True):
 
 class Rating(RatingBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     user: User | None = Relationship(back_populates="ratings")
     task: Task | None = Relationship(back_populates="ratings")
 
 
 class Comment(CommentBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     updated_at: datetime | None = Field(default=None)
     deleted_at: datetime | None = Field(default=None)
     user: User | None = Relationship(back_populates="comments")
@@ -68,7 +69,7 @@ class Comment(CommentBase, table=True):
 
 class Reaction(ReactionBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     updated_at: datetime | None = Field(default=None)
     deleted_at: datetime | None = Field(default=None)
     user: User | None = Relationship(back_populates="reactions")
@@ -77,7 +78,7 @@ class Reaction(ReactionBase, table=True):
 
 class Quest(QuestBase, table=True):
     id: UUID | None = Field(default_factory=uuid4, primary_key=True, unique=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
     updated_at: datetime | None = Field(default=None)
     deleted_at: datetime | None = Field(default=None)
     users: list["User"] = Relationship(
@@ -0,0 +1,13 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Field
+
+from leveluplife.models.shared import DBModel
+
+
+class RevokedToken(DBModel, table=True):
+    jti: UUID = Field(primary_key=True)
+    user_id: UUID = Field(index=True)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=lambda: datetime.now())
@@ -1,18 +1,24 @@
+from collections import defaultdict
 from datetime import datetime
+from typing import Any, Iterable, Mapping, TypeVar
 from uuid import UUID
 
+from sqlalchemy import Column, Row
+from sqlmodel import SQLModel
+
 from leveluplife.models.comment import CommentBase
 from leveluplife.models.item import ItemBase
 from leveluplife.models.quest import QuestBase
 from leveluplife.models.rating import RatingBase
 from leveluplife.models.reaction import ReactionBase
 from leveluplife.models.relationship import QuestStatus
-from leveluplife.models.table import User
 from leveluplife.models.task import TaskBase
 from leveluplife.models.user import UserBase
 
+V = TypeVar("V", bound=SQLModel)
+
 
-class UserView(UserBase):
+class UserSummaryView(UserBase):
     id: UUID
     created_at: datetime
     strength: int = 0
@@ -21,6 +27,9 @@ class UserView(UserBase):
     wise: int = 0
     psycho: int = 0
     experience: int = 0
+
+
+class UserView(UserSummaryView):
     items: list["ItemUserView"] = []
     tasks: list["TaskView"] = []
     ratings: list["RatingView"] = []
@@ -46,7 +55,7 @@ class ItemUserView(ItemView):
 
 
 class ItemWithUser(ItemView):
-    users: list["User"]
+    users: list[UserSummaryView]
 
 
 class RatingView(RatingBase):
@@ -82,4 +91,45 @@ class QuestUserView(QuestView):
 
 
 class QuestWithUser(QuestView):
-    users: list["User"]
+    users: list[UserSummaryView]
+
+
+# Resolves the relations declared ahead of their views, so the view can be
+# serialized before it is ever validated
+UserView.model_rebuild()
+
+
+def view_columns(view: type[SQLModel], table: type[SQLModel]) -> list[Column]:
+    """Columns of ``table`` backing the fields of ``view``, in field order.
+
+    Selecting them instead of the table's entity returns plain rows, with no
+    ORM instance to hydrate and track for each of them.
+    """
+    columns = table.__table__.columns
+    return [columns[name] for name in view.model_fields if name in columns]
+
+
+def construct_view(view: type[V], values: Mapping[str, Any]) -> V:
+    """Build ``view`` around ``values`` as they are, without validating them.
+
+    ``values`` must be trusted and hold every field of ``view``, any other
+    key of the row is left out.
+    """
+    return view.model_construct(**{name: values[name] for name in view.model_fields})
+
+
+def construct_views(rows: Iterable[Row], view: type[V]) -> list[V]:
+    """Build ``view`` from each row selected through ``view_columns``."""
+    return [construct_view(view, row._mapping) for row in rows]
+
+
+def group_views(rows: Iterable[Row], view: type[V]) -> defaultdict[UUID, list[V]]:
+    """Build ``view`` from each row and group them by the row's ``user_id``.
+
+    Rows come from the database through ``view_columns``, already typed, so
+    the views are constructed without being validated again.
+    """
+    views = defaultdict(list)
+    for row in rows:
+        views[row.user_id].append(construct_view(view, row._mapping))
+    return views
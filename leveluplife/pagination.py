@@ -0,0 +1,80 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from fastapi import Query, Response
+from sqlalchemy import ColumnElement, Select, tuple_
+
+from leveluplife.models.error import InvalidCursorError
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_CURSOR_PARSERS = {"created_at": datetime.fromisoformat, "id": UUID, "username": str}
+
+
+class Pagination:
+    """Query parameters shared by every list route.
+
+    ``offset`` is a page number kept for backwards compatibility, ``cursor``
+    resumes after the last row of a previous page and takes precedence.
+    """
+
+    def __init__(
+        self,
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=settings.PAGE_SIZE, ge=1),
+        cursor: str | None = None,
+    ) -> None:
+        self.limit = min(limit, settings.PAGE_SIZE_MAX)
+        self.offset = offset * self.limit
+        self.cursor = cursor
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), default=str).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence[ColumnElement]) -> tuple:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError(values)
+        return tuple(
+            _CURSOR_PARSERS[column.key](value)
+            for column, value in zip(order_by, values)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorError(cursor=cursor)
+
+
+def paginate(
+    statement: Select,
+    order_by: Sequence[ColumnElement],
+    offset: int,
+    limit: int,
+    cursor: str | None = None,
+) -> Select:
+    statement = statement.order_by(*order_by).limit(limit)
+    if cursor is None:
+        return statement.offset(offset)
+    return statement.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, order_by)))
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[Any],
+    limit: int,
+    keys: Sequence[str] = ("created_at", "id"),
+) -> None:
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(rows[-1], key) for key in keys]
+        )
@@ -0,0 +1,216 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Protocol
+
+from loguru import logger
+
+from leveluplife.settings import Settings
+
+settings = Settings()
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """A bucket holds ``burst`` attempts and regains ``per_minute`` a minute."""
+
+    burst: int
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+    @property
+    def idle(self) -> float:
+        # Seconds after which an untouched bucket is full again, and forgettable
+        return self.burst / self.rate
+
+
+def take_token(
+    tokens: float, updated_at: float, now: float, policy: BucketPolicy
+) -> tuple[bool, float]:
+    """Refill a bucket up to ``now`` and take one token from it if it can."""
+    tokens = min(policy.burst, tokens + (now - updated_at) * policy.rate)
+    if tokens < 1:
+        return False, tokens
+    return True, tokens - 1
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, policy: BucketPolicy) -> bool:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryRateLimitBackend:
+    """Buckets of this process, as ``(tokens, updated_at, forget_at)`` tuples.
+
+    Buckets idle long enough to be full again are dropped, they behave as if
+    they had never been seen. Past ``maxsize`` keys the least recently used
+    bucket is dropped as well.
+    """
+
+    def __init__(
+        self, maxsize: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, policy: BucketPolicy) -> bool:
+        now = self.clock()
+        tokens, updated_at, _ = self._buckets.get(key, (policy.burst, now, now))
+        allowed, tokens = take_token(tokens, updated_at, now, policy)
+        self._buckets[key] = (tokens, now, now + policy.idle)
+        self._buckets.move_to_end(key)
+        self._expire(now)
+        return allowed
+
+    def _expire(self, now: float) -> None:
+        # The least recently used buckets come first, stop at one still in use
+        while self._buckets:
+            key, (_, _, forget_at) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.maxsize and forget_at > now:
+                break
+            del self._buckets[key]
+
+
+class SQLiteRateLimitBackend:
+    """Buckets in a SQLite file, shared by every worker process of a host.
+
+    A local stand-in for a shared store such as Redis: each attempt is one
+    short write transaction, run in a thread off the event loop.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS bucket ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, "
+            "forget_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS bucket_forget_at ON bucket (forget_at)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT count(*) FROM bucket"
+            ).fetchone()
+        return count
+
+    async def take(self, key: str, policy: BucketPolicy) -> bool:
+        return await asyncio.to_thread(self._take, key, policy)
+
+    def _take(self, key: str, policy: BucketPolicy) -> bool:
+        now = self.clock()
+        with self._lock:
+            connection = self._connection
+            # IMMEDIATE takes the write lock before reading, so two workers
+            # cannot both spend the last token
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM bucket WHERE forget_at <= ?", (now,))
+                row = connection.execute(
+                    "SELECT tokens, updated_at FROM bucket WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated_at = row or (policy.burst, now)
+                allowed, tokens = take_token(tokens, updated_at, now, policy)
+                connection.execute(
+                    "INSERT INTO bucket (key, tokens, updated_at, forget_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                    "SET tokens = excluded.tokens, updated_at = excluded.updated_at, "
+                    "forget_at = excluded.forget_at",
+                    (key, tokens, now, now + policy.idle),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return allowed
+
+
+@dataclass
+class RateLimitStats:
+    allowed: int = 0
+    rejected_ip: int = 0
+    rejected_username: int = 0
+
+
+class LoginRateLimiter:
+    """Token buckets on login attempts, one per client IP and one per username.
+
+    The IP bucket is checked first, so a client over its limit cannot drain
+    the bucket of the usernames it tries. An attempt without a username only
+    takes from its IP bucket, it cannot log anyone in.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_policy: BucketPolicy,
+        username_policy: BucketPolicy,
+    ) -> None:
+        self.backend = backend
+        self.ip_policy = ip_policy
+        self.username_policy = username_policy
+        self.stats = RateLimitStats()
+
+    async def acquire(self, ip: str, username: str) -> float:
+        """Seconds to wait before the next attempt, 0 when this one may proceed."""
+        if not await self.backend.take(f"ip:{ip}", self.ip_policy):
+            self.stats.rejected_ip += 1
+            logger.warning(f"Login attempts over the limit from ip: {ip}")
+            return 1 / self.ip_policy.rate
+        if username and not await self.backend.take(
+            f"user:{username}", self.username_policy
+        ):
+            self.stats.rejected_username += 1
+            logger.warning(f"Login attempts over the limit for user: {username}")
+            return 1 / self.username_policy.rate
+        self.stats.allowed += 1
+        return 0
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "buckets": len(self.backend),
+            "ip_policy": asdict(self.ip_policy),
+            "username_policy": asdict(self.username_policy),
+            **asdict(self.stats),
+        }
+
+
+def create_rate_limit_backend(settings: Settings = settings) -> RateLimitBackend:
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimitBackend(settings.LOGIN_RATE_LIMIT_PATH)
+    return MemoryRateLimitBackend(settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+
+
+login_rate_limiter = LoginRateLimiter(
+    create_rate_limit_backend(),
+    ip_policy=BucketPolicy(
+        burst=settings.LOGIN_RATE_LIMIT_IP_BURST,
+        per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+    ),
+    username_policy=BucketPolicy(
+        burst=settings.LOGIN_RATE_LIMIT_USERNAME_BURST,
+        per_minute=settings.LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+    ),
+)
@@ -0,0 +1,38 @@
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic_core import to_json
+
+from leveluplife.models.error import BaseError
+
+
+class ViewResponse(Response):
+    """JSON body of views as the controllers built them.
+
+    FastAPI hands a returned ``Response`` to the client as it is, so a route
+    returning a ``ViewResponse`` skips the validation and serialization of
+    its ``response_model``, which then only documents the route. Only views
+    already built or validated once belong in it. Headers set on the route's
+    ``Response`` parameter are not merged, pass them along with ``headers``.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def error_response(
+    exc: BaseError, headers: dict[str, str] | None = None
+) -> ORJSONResponse:
+    """The response of an error, for the handlers and the middleware alike."""
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "message": exc.message,
+            "name": exc.name,
+            "status_code": exc.status_code,
+        },
+        headers=headers,
+    )
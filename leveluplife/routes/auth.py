@@ -1,14 +1,19 @@
-from datetime import timedelta
 from typing import Annotated
 
 from fastapi import HTTPException, status, APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from leveluplife.auth.schemas import Token
-from leveluplife.auth.utils import authenticate_user, create_access_token
+from leveluplife.auth.schemas import RefreshTokenRequest, Token
+from leveluplife.auth.utils import (
+    authenticate_user,
+    create_tokens,
+    get_user_claims,
+    refresh_tokens,
+    revoke_refresh_token,
+)
+from leveluplife.controllers.token import TokenController
 from leveluplife.controllers.user import UserController
-from leveluplife.dependencies import get_user_controller
-from leveluplife.settings import Settings
+from leveluplife.dependencies import get_token_controller, get_user_controller
 
 router = APIRouter(
     prefix="/token",
@@ -16,8 +21,6 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-settings = Settings()
-
 
 @router.post("/")
 async def login_for_access_token(
@@ -33,8 +36,23 @@ async def login_for_access_token(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    return create_tokens(get_user_claims(user))
+
+
+@router.post("/refresh")
+async def refresh_access_token(
+    refresh_request: RefreshTokenRequest,
+    user_controller: UserController = Depends(get_user_controller),
+    token_controller: TokenController = Depends(get_token_controller),
+) -> Token:
+    return await refresh_tokens(
+        refresh_request.refresh_token, user_controller, token_controller
     )
-    return Token(access_token=access_token, token_type="bearer")
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(
+    refresh_request: RefreshTokenRequest,
+    token_controller: TokenController = Depends(get_token_controller),
+) -> None:
+    await revoke_refresh_token(refresh_request.refresh_token, token_controller)
@@ -1,18 +1,21 @@
 from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_principal
+from leveluplife.conditional import ConditionalRequest, get_version
 from leveluplife.controllers.comment import CommentController
 from leveluplife.dependencies import get_comment_controller
 from leveluplife.models.comment import CommentCreate, CommentUpdate
 from leveluplife.models.view import CommentView
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/comments",
     tags=["comments"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -22,30 +25,45 @@ async def create_comment(
     comment: CommentCreate,
     comment_controller: CommentController = Depends(get_comment_controller),
 ) -> CommentView:
-    return CommentView.model_validate(await comment_controller.create_comment(comment))
+    return ViewResponse(
+        CommentView.model_validate(await comment_controller.create_comment(comment)),
+        status_code=201,
+    )
 
 
 @router.get("/", response_model=Sequence[CommentView])
 async def get_comments(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
+    conditional: ConditionalRequest = Depends(),
     comment_controller: CommentController = Depends(get_comment_controller),
 ) -> Sequence[CommentView]:
-    return [
-        CommentView.model_validate(comment)
-        for comment in await comment_controller.get_comments(offset * 20, 20)
-    ]
+    comments = await comment_controller.get_comments(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, comments, pagination.limit)
+    if (not_modified := conditional.not_modified(*comments)) is not None:
+        return not_modified
+    return ViewResponse(comments, headers=response.headers)
 
 
 @router.get("/{comment_id}", response_model=CommentView)
 async def get_comment_by_id(
     *,
+    response: Response,
     comment_id: UUID,
+    conditional: ConditionalRequest = Depends(),
     comment_controller: CommentController = Depends(get_comment_controller),
 ) -> CommentView:
-    return CommentView.model_validate(
-        await comment_controller.get_comment_by_id(comment_id)
-    )
+    comment = await comment_controller.get_comment_by_id(comment_id)
+    if (
+        not_modified := conditional.not_modified(
+            comment, last_modified=get_version(comment)
+        )
+    ) is not None:
+        return not_modified
+    return ViewResponse(CommentView.model_validate(comment), headers=response.headers)
 
 
 @router.patch("/{comment_id}", response_model=CommentView)
@@ -55,8 +73,10 @@ async def update_comment(
     comment_update: CommentUpdate,
     comment_controller: CommentController = Depends(get_comment_controller),
 ) -> CommentView:
-    return CommentView.model_validate(
-        await comment_controller.update_comment(comment_id, comment_update)
+    return ViewResponse(
+        CommentView.model_validate(
+            await comment_controller.update_comment(comment_id, comment_update)
+        )
     )
 
 
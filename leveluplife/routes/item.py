@@ -1,18 +1,21 @@
 from typing import Sequence
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_principal
+from leveluplife.conditional import ConditionalRequest, get_version
 from leveluplife.controllers.item import ItemController
 from leveluplife.dependencies import get_item_controller
 from leveluplife.models.item import ItemCreate, ItemUpdate
 from leveluplife.models.relationship import UserItemLinkCreate
 from leveluplife.models.view import ItemView, ItemWithUser
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/items",
     tags=["items"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -21,7 +24,10 @@ router = APIRouter(
 async def create_item(
     item: ItemCreate, item_controller: ItemController = Depends(get_item_controller)
 ) -> ItemView:
-    return ItemView.model_validate(await item_controller.create_item(item))
+    return ViewResponse(
+        ItemView.model_validate(await item_controller.create_item(item)),
+        status_code=201,
+    )
 
 
 @router.patch("/{item_id}", response_model=ItemView)
@@ -31,8 +37,8 @@ async def update_item(
     item_update: ItemUpdate,
     item_controller: ItemController = Depends(get_item_controller),
 ) -> ItemView:
-    return ItemView.model_validate(
-        await item_controller.update_item(item_id, item_update)
+    return ViewResponse(
+        ItemView.model_validate(await item_controller.update_item(item_id, item_update))
     )
 
 
@@ -45,26 +51,50 @@ async def delete_item(
 
 @router.get("/", response_model=Sequence[ItemView])
 async def get_items(
-    *, offset: int = 0, item_controller: ItemController = Depends(get_item_controller)
+    *,
+    response: Response,
+    pagination: Pagination = Depends(),
+    conditional: ConditionalRequest = Depends(),
+    item_controller: ItemController = Depends(get_item_controller),
 ) -> Sequence[ItemView]:
-    return [
-        ItemView.model_validate(item)
-        for item in await item_controller.get_items(offset * 20, 20)
-    ]
+    items = await item_controller.get_items(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, items, pagination.limit)
+    if (not_modified := conditional.not_modified(*items)) is not None:
+        return not_modified
+    return ViewResponse(items, headers=response.headers)
 
 
 @router.get("/{item_id}", response_model=ItemWithUser)
 async def get_item_by_id(
-    *, item_id: UUID, item_controller: ItemController = Depends(get_item_controller)
+    *,
+    response: Response,
+    item_id: UUID,
+    conditional: ConditionalRequest = Depends(),
+    item_controller: ItemController = Depends(get_item_controller),
 ) -> ItemWithUser:
-    return ItemWithUser.model_validate(await item_controller.get_item_by_id(item_id))
+    item = await item_controller.get_item_by_id(item_id)
+    # Linked users have no updated_at, the ETag follows their content
+    if (not_modified := conditional.not_modified(item, *item.users)) is not None:
+        return not_modified
+    return ViewResponse(item, headers=response.headers)
 
 
 @router.get("/type/name", response_model=ItemView)
 async def get_item_by_name(
-    *, item_name: str, item_controller: ItemController = Depends(get_item_controller)
+    *,
+    response: Response,
+    item_name: str,
+    conditional: ConditionalRequest = Depends(),
+    item_controller: ItemController = Depends(get_item_controller),
 ) -> ItemView:
-    return ItemView.model_validate(await item_controller.get_item_by_name(item_name))
+    item = await item_controller.get_item_by_name(item_name)
+    if (
+        not_modified := conditional.not_modified(item, last_modified=get_version(item))
+    ) is not None:
+        return not_modified
+    return ViewResponse(item, headers=response.headers)
 
 
 @router.patch("/{item_id}/link_user", response_model=ItemWithUser, status_code=200)
@@ -74,7 +104,7 @@ async def give_item_to_user(
     user_item_link_create: UserItemLinkCreate,
     item_controller: ItemController = Depends(get_item_controller),
 ) -> ItemWithUser:
-    return ItemWithUser.model_validate(
+    return ViewResponse(
         await item_controller.give_item_to_user(item_id, user_item_link_create)
     )
 
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+
+from leveluplife.auth.pool import password_hasher
+from leveluplife.auth.revocation import revocation_index
+from leveluplife.auth.utils import get_current_principal
+from leveluplife.cache import CACHES
+from leveluplife.models.error import CacheNotFoundError
+from leveluplife.ratelimit import login_rate_limiter
+from leveluplife.singleflight import FLIGHTS
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_current_principal)],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/caches")
+async def get_cache_metrics() -> dict[str, dict]:
+    return {name: cache.snapshot() for name, cache in CACHES.items()}
+
+
+@router.get("/caches/{name}/keys")
+async def get_cache_key_metrics(
+    name: str, limit: int = Query(default=20, ge=1, le=1000)
+) -> list[dict]:
+    if name not in CACHES:
+        raise CacheNotFoundError(cache_name=name)
+    return CACHES[name].key_snapshot(limit)
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_metrics() -> dict:
+    return password_hasher.snapshot()
+
+
+@router.get("/revocations")
+async def get_revocation_metrics() -> dict:
+    return revocation_index.snapshot()
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_metrics() -> dict:
+    return login_rate_limiter.snapshot()
+
+
+@router.get("/single-flight")
+async def get_single_flight_metrics() -> dict[str, dict]:
+    return {name: flight.snapshot() for name, flight in FLIGHTS.items()}
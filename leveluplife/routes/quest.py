@@ -1,20 +1,22 @@
 from typing import Sequence
 
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_principal
+from leveluplife.conditional import ConditionalRequest
 from leveluplife.controllers.quest import QuestController
 from leveluplife.dependencies import get_quest_controller
-from leveluplife.models.error import QuestNotFoundError
 from leveluplife.models.quest import QuestCreate, QuestUpdate
 from leveluplife.models.relationship import UserQuestLinkCreate
 from leveluplife.models.view import QuestView, QuestWithUser
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
+from datetime import datetime
+from fastapi import APIRouter, Depends, Response
 from uuid import UUID
 
 router = APIRouter(
     prefix="/quests",
     tags=["quests"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -24,7 +26,10 @@ async def create_quest(
     quest: QuestCreate,
     quest_controller: QuestController = Depends(get_quest_controller),
 ) -> QuestView:
-    return QuestView.model_validate(await quest_controller.create_quest(quest))
+    return ViewResponse(
+        QuestView.model_validate(await quest_controller.create_quest(quest)),
+        status_code=201,
+    )
 
 
 @router.patch("/{quest_id}", response_model=QuestView)
@@ -34,8 +39,10 @@ async def update_quest(
     quest_update: QuestUpdate,
     quest_controller: QuestController = Depends(get_quest_controller),
 ) -> QuestView:
-    return QuestView.model_validate(
-        await quest_controller.update_quest(quest_id, quest_update)
+    return ViewResponse(
+        QuestView.model_validate(
+            await quest_controller.update_quest(quest_id, quest_update)
+        )
     )
 
 
@@ -49,22 +56,33 @@ async def delete_quest(
 @router.get("/", response_model=Sequence[QuestView])
 async def get_quests(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
+    conditional: ConditionalRequest = Depends(),
     quest_controller: QuestController = Depends(get_quest_controller),
 ) -> Sequence[QuestView]:
-    return [
-        QuestView.model_validate(quest)
-        for quest in await quest_controller.get_quests(offset * 20, 20)
-    ]
+    quests = await quest_controller.get_quests(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, quests, pagination.limit)
+    if (not_modified := conditional.not_modified(*quests)) is not None:
+        return not_modified
+    return ViewResponse(quests, headers=response.headers)
 
 
 @router.get("/{quest_id}", response_model=QuestWithUser)
 async def get_quest_by_id(
-    *, quest_id: UUID, quest_controller: QuestController = Depends(get_quest_controller)
+    *,
+    response: Response,
+    quest_id: UUID,
+    conditional: ConditionalRequest = Depends(),
+    quest_controller: QuestController = Depends(get_quest_controller),
 ) -> QuestWithUser:
-    return QuestWithUser.model_validate(
-        await quest_controller.get_quest_by_id(quest_id)
-    )
+    quest = await quest_controller.get_quest_by_id(quest_id)
+    # Linked users have no updated_at, the ETag follows their content
+    if (not_modified := conditional.not_modified(quest, *quest.users)) is not None:
+        return not_modified
+    return ViewResponse(quest, headers=response.headers)
 
 
 @router.patch("/{quest_id}/link_user", response_model=QuestWithUser, status_code=200)
@@ -74,22 +92,11 @@ async def assign_quest_to_user(
     user_quest_link_create: UserQuestLinkCreate,
     quest_controller: QuestController = Depends(get_quest_controller),
 ) -> QuestWithUser:
-    quest_start = datetime.now()
-
-    quest = await quest_controller.get_quest_by_id(quest_id)
-
-    if not quest:
-        raise QuestNotFoundError(quest_id=quest_id)
-
-    quest_duration = timedelta(days=quest.type.duration)
-    quest_end = quest_start + quest_duration
-
-    return QuestWithUser.model_validate(
+    return ViewResponse(
         await quest_controller.assign_quest_to_user(
             quest_id,
             user_quest_link_create,
-            quest_start=quest_start,
-            quest_end=quest_end,
+            quest_start=datetime.now(),
             status=user_quest_link_create.status,
         )
     )
@@ -1,18 +1,20 @@
 from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_principal
 from leveluplife.controllers.rating import RatingController
 from leveluplife.dependencies import get_rating_controller
 from leveluplife.models.rating import RatingCreate, RatingUpdate
 from leveluplife.models.view import RatingView
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/ratings",
     tags=["ratings"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -22,19 +24,24 @@ async def create_rating(
     rating: RatingCreate,
     rating_controller: RatingController = Depends(get_rating_controller),
 ) -> RatingView:
-    return RatingView.model_validate(await rating_controller.create_rating(rating))
+    return ViewResponse(
+        RatingView.model_validate(await rating_controller.create_rating(rating)),
+        status_code=201,
+    )
 
 
 @router.get("/", response_model=Sequence[RatingView])
 async def get_ratings(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
     rating_controller: RatingController = Depends(get_rating_controller),
 ) -> Sequence[RatingView]:
-    return [
-        RatingView.model_validate(rating)
-        for rating in await rating_controller.get_ratings(offset * 20, 20)
-    ]
+    ratings = await rating_controller.get_ratings(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, ratings, pagination.limit)
+    return ViewResponse(ratings, headers=response.headers)
 
 
 @router.get("/{rating_id}", response_model=RatingView)
@@ -43,8 +50,8 @@ async def get_rating_by_id(
     rating_id: UUID,
     rating_controller: RatingController = Depends(get_rating_controller),
 ) -> RatingView:
-    return RatingView.model_validate(
-        await rating_controller.get_rating_by_id(rating_id)
+    return ViewResponse(
+        RatingView.model_validate(await rating_controller.get_rating_by_id(rating_id))
     )
 
 
@@ -55,8 +62,10 @@ async def update_rating(
     rating_update: RatingUpdate,
     rating_controller: RatingController = Depends(get_rating_controller),
 ) -> RatingView:
-    return RatingView.model_validate(
-        await rating_controller.update_rating(rating_id, rating_update)
+    return ViewResponse(
+        RatingView.model_validate(
+            await rating_controller.update_rating(rating_id, rating_update)
+        )
     )
 
 
@@ -1,18 +1,21 @@
 from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_principal
+from leveluplife.conditional import ConditionalRequest, get_version
 from leveluplife.controllers.reaction import ReactionController
 from leveluplife.dependencies import get_reaction_controller
 from leveluplife.models.reaction import ReactionCreate, ReactionUpdate
 from leveluplife.models.view import ReactionView
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/reactions",
     tags=["reactions"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -22,32 +25,47 @@ async def create_reaction(
     reaction: ReactionCreate,
     reaction_controller: ReactionController = Depends(get_reaction_controller),
 ) -> ReactionView:
-    return ReactionView.model_validate(
-        await reaction_controller.create_reaction(reaction)
+    return ViewResponse(
+        ReactionView.model_validate(
+            await reaction_controller.create_reaction(reaction)
+        ),
+        status_code=201,
     )
 
 
 @router.get("/", response_model=Sequence[ReactionView])
 async def get_reactions(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
+    conditional: ConditionalRequest = Depends(),
     reaction_controller: ReactionController = Depends(get_reaction_controller),
 ) -> Sequence[ReactionView]:
-    return [
-        ReactionView.model_validate(reaction)
-        for reaction in await reaction_controller.get_reactions(offset * 20, 20)
-    ]
+    reactions = await reaction_controller.get_reactions(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, reactions, pagination.limit)
+    if (not_modified := conditional.not_modified(*reactions)) is not None:
+        return not_modified
+    return ViewResponse(reactions, headers=response.headers)
 
 
 @router.get("/{reaction_id}", response_model=ReactionView)
 async def get_reaction_by_id(
     *,
+    response: Response,
     reaction_id: UUID,
+    conditional: ConditionalRequest = Depends(),
     reaction_controller: ReactionController = Depends(get_reaction_controller),
 ) -> ReactionView:
-    return ReactionView.model_validate(
-        await reaction_controller.get_reaction_by_id(reaction_id)
-    )
+    reaction = await reaction_controller.get_reaction_by_id(reaction_id)
+    if (
+        not_modified := conditional.not_modified(
+            reaction, last_modified=get_version(reaction)
+        )
+    ) is not None:
+        return not_modified
+    return ViewResponse(ReactionView.model_validate(reaction), headers=response.headers)
 
 
 @router.patch("/{reaction_id}", response_model=ReactionView)
@@ -57,8 +75,10 @@ async def update_reaction(
     reaction_update: ReactionUpdate,
     reaction_controller: ReactionController = Depends(get_reaction_controller),
 ) -> ReactionView:
-    return ReactionView.model_validate(
-        await reaction_controller.update_reaction(reaction_id, reaction_update)
+    return ViewResponse(
+        ReactionView.model_validate(
+            await reaction_controller.update_reaction(reaction_id, reaction_update)
+        )
     )
 
 
@@ -1,16 +1,18 @@
 from typing import Sequence
 from uuid import UUID
-from fastapi import APIRouter, Depends
-from leveluplife.auth.utils import get_current_active_user
+from fastapi import APIRouter, Depends, Response
+from leveluplife.auth.utils import get_current_principal
 from leveluplife.controllers.task import TaskController
 from leveluplife.dependencies import get_task_controller
 from leveluplife.models.task import TaskCreate, TaskUpdate
 from leveluplife.models.view import TaskView
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/tasks",
     tags=["tasks"],
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(get_current_principal)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -19,31 +21,42 @@ router = APIRouter(
 async def create_task(
     task: TaskCreate, task_controller: TaskController = Depends(get_task_controller)
 ) -> TaskView:
-    return TaskView.model_validate(await task_controller.create_task(task))
+    return ViewResponse(
+        TaskView.model_validate(await task_controller.create_task(task)),
+        status_code=201,
+    )
 
 
 @router.get("/", response_model=Sequence[TaskView])
 async def get_tasks(
-    *, offset: int = 0, task_controller: TaskController = Depends(get_task_controller)
+    *,
+    response: Response,
+    pagination: Pagination = Depends(),
+    task_controller: TaskController = Depends(get_task_controller),
 ) -> Sequence[TaskView]:
-    return [
-        TaskView.model_validate(task)
-        for task in await task_controller.get_tasks(offset * 20, 20)
-    ]
+    tasks = await task_controller.get_tasks(
+        pagination.offset, pagination.limit, pagination.cursor
+    )
+    set_next_cursor(response, tasks, pagination.limit)
+    return ViewResponse(tasks, headers=response.headers)
 
 
 @router.get("/{task_id}", response_model=TaskView)
 async def get_task_by_id(
     *, task_id: UUID, task_controller: TaskController = Depends(get_task_controller)
 ) -> TaskView:
-    return TaskView.model_validate(await task_controller.get_task_by_id(task_id))
+    return ViewResponse(
+        TaskView.model_validate(await task_controller.get_task_by_id(task_id))
+    )
 
 
 @router.get("/type/title", response_model=TaskView)
 async def get_task_by_title(
     *, task_title: str, task_controller: TaskController = Depends(get_task_controller)
 ) -> TaskView:
-    return TaskView.model_validate(await task_controller.get_task_by_title(task_title))
+    return ViewResponse(
+        TaskView.model_validate(await task_controller.get_task_by_title(task_title))
+    )
 
 
 @router.patch("/{task_id}", response_model=TaskView)
@@ -53,8 +66,8 @@ async def update_task(
     task_update: TaskUpdate,
     task_controller: TaskController = Depends(get_task_controller),
 ) -> TaskView:
-    return TaskView.model_validate(
-        await task_controller.update_task(task_id, task_update)
+    return ViewResponse(
+        TaskView.model_validate(await task_controller.update_task(task_id, task_update))
     )
 
 
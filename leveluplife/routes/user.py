@@ -1,13 +1,17 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from leveluplife.auth.utils import get_current_active_user
-from leveluplife.controllers.user import UserController
+from leveluplife.auth.schemas import Principal
+from leveluplife.auth.utils import get_current_active_user, get_current_principal
+from leveluplife.controllers.user import USER_VIEW_FIELDS, UserController
 from leveluplife.dependencies import get_user_controller
+from leveluplife.fieldsets import UserFieldset
 from leveluplife.models.table import User
 from leveluplife.models.user import UserCreate, UserUpdate, UserUpdatePassword, Tribe
 from leveluplife.models.view import UserView
+from leveluplife.pagination import Pagination, set_next_cursor
+from leveluplife.responses import ViewResponse
 
 router = APIRouter(
     prefix="/users",
@@ -27,64 +31,95 @@ async def read_users_me(
 async def create_user(
     *, user: UserCreate, user_controller: UserController = Depends(get_user_controller)
 ) -> UserView:
-    return UserView.model_validate(await user_controller.create_user(user))
+    new_user = await user_controller.create_user(user)
+    # A new user has no relation yet, its row holds the whole view
+    return ViewResponse(
+        UserView.model_construct(
+            **{name: getattr(new_user, name) for name in USER_VIEW_FIELDS}
+        ),
+        status_code=201,
+    )
 
 
 @router.get("/", response_model=list[UserView])
 async def get_users(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
+    fieldset: UserFieldset = Depends(),
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> list[UserView]:
-    return [
-        UserView.model_validate(user)
-        for user in await user_controller.get_users(offset * 20, 20)
-    ]
+    users = await user_controller.get_users(
+        pagination.offset, pagination.limit, pagination.cursor, fieldset.include
+    )
+    set_next_cursor(response, users, pagination.limit, keys=("username",))
+    return fieldset.render(users, response)
 
 
 @router.get("/{user_id}", response_model=UserView)
 async def get_user_by_id(
     *,
+    response: Response,
     user_id: UUID,
+    fieldset: UserFieldset = Depends(),
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> UserView:
-    return UserView.model_validate(await user_controller.get_user_by_id(user_id))
+    return fieldset.render(
+        await user_controller.get_user_by_id(user_id, fieldset.include), response
+    )
 
 
 @router.get("/type/username", response_model=UserView)
 async def get_user_by_username(
     *,
+    response: Response,
     user_username: str,
+    fieldset: UserFieldset = Depends(),
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> UserView:
-    return UserView.model_validate(
-        await user_controller.get_user_by_username(user_username)
+    return fieldset.render(
+        await user_controller.get_user_by_username(user_username, fieldset.include),
+        response,
     )
 
 
 @router.get("/type/email", response_model=UserView)
 async def get_user_by_email(
     *,
+    response: Response,
     user_email: str,
+    fieldset: UserFieldset = Depends(),
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> UserView:
-    return UserView.model_validate(await user_controller.get_user_by_email(user_email))
+    return fieldset.render(
+        await user_controller.get_user_by_email(user_email, fieldset.include),
+        response,
+    )
 
 
 @router.get("/type/tribe", response_model=list[UserView])
 async def get_users_by_tribe(
     *,
-    offset: int = 0,
+    response: Response,
+    pagination: Pagination = Depends(),
     user_tribe: Tribe,
+    fieldset: UserFieldset = Depends(),
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> list[UserView]:
-    users = await user_controller.get_users_by_tribe(user_tribe, offset * 20, 20)
-    return [UserView.model_validate(user) for user in users]
+    users = await user_controller.get_users_by_tribe(
+        user_tribe,
+        pagination.offset,
+        pagination.limit,
+        pagination.cursor,
+        fieldset.include,
+    )
+    set_next_cursor(response, users, pagination.limit, keys=("username",))
+    return fieldset.render(users, response)
 
 
 @router.patch("/{user_id}", response_model=UserView)
@@ -93,11 +128,9 @@ async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> UserView:
-    return UserView.model_validate(
-        await user_controller.update_user(user_id, user_update)
-    )
+    return ViewResponse(await user_controller.update_user(user_id, user_update))
 
 
 @router.delete("/{user_id}", status_code=204)
@@ -105,7 +138,7 @@ async def delete_user(
     *,
     user_id: UUID,
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> None:
     await user_controller.delete_user(user_id)
 
@@ -116,9 +149,9 @@ async def update_user_password(
     user_id: UUID,
     user_update_password: UserUpdatePassword,
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> UserView:
-    return UserView.model_validate(
+    return ViewResponse(
         await user_controller.update_user_password(
             user_id, user_update_password.password
         )
@@ -131,8 +164,8 @@ async def equip_item_to_user(
     item_id: UUID,
     equipped: bool,
     user_controller: UserController = Depends(get_user_controller),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> UserView:
-    return UserView.model_validate(
+    return ViewResponse(
         await user_controller.equip_item_to_user(user_id, item_id, equipped)
     )
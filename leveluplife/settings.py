@@ -1,9 +1,48 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
     database_url: str
+    DB_ECHO: bool = True
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    PAGE_SIZE: int = 20
+    PAGE_SIZE_MAX: int = 100
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "unix:///tmp/leveluplife-cache.sock"
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: int = 60
+    TOKEN_VERSION_CACHE_SIZE: int = 10000
+    TOKEN_VERSION_CACHE_TTL: int = 30
+    CATALOG_CACHE_SIZE: int = 1024
+    CATALOG_CACHE_TTL: int = 60
+    USER_VIEW_CACHE_SIZE: int = 1024
+    USER_VIEW_CACHE_TTL: int = 300
+    MISSING_CACHE_SIZE: int = 10000
+    MISSING_CACHE_TTL: int = 30
+    SINGLE_FLIGHT_TIMEOUT: float = 5
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_SCHEMES: list[str] = ["bcrypt"]
+    PASSWORD_HASH_TARGET_MS: float = 250
+    PASSWORD_HASH_CALIBRATE: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_PATH: str = "ratelimit.db"
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_RATE_LIMIT_IP_BURST: int = 20
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 60
+    LOGIN_RATE_LIMIT_USERNAME_BURST: int = 5
+    LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE: float = 5
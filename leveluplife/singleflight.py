@@ -0,0 +1,75 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+
+class SingleFlight(Generic[V]):
+    """Share one in-flight load between concurrent callers of the same key.
+
+    The first caller of a key runs the load, callers arriving meanwhile wait
+    for its result, or its exception, instead of running their own. A caller
+    waits at most ``timeout`` seconds, or until the first caller is cancelled,
+    before loading on its own.
+    """
+
+    def __init__(self, name: str, timeout: float) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.stats = SingleFlightStats()
+        self._flights: dict[Hashable, asyncio.Future[V]] = {}
+        FLIGHTS[name] = self
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> V:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight), self.timeout)
+            except asyncio.TimeoutError:
+                self.stats.timeouts += 1
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+            return await load()
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.stats.leaders += 1
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exc:
+            self.stats.errors += 1
+            flight.set_exception(exc)
+            # Retrieved here, so a flight nobody joined logs nothing
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "timeout": self.timeout,
+            **asdict(self.stats),
+        }
+
+
+# Every single flight registers itself here so its metrics can be exposed
+FLIGHTS: dict[str, SingleFlight] = {}
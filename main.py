@@ -2,15 +2,31 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from leveluplife.api import create_app
-from leveluplife.database import create_app_engine, create_db_and_tables
+from leveluplife.auth.pool import password_hasher
+from leveluplife.auth.revocation import revocation_index
+from leveluplife.controllers.token import TokenController
+from leveluplife.database import (
+    create_async_app_engine,
+    create_db_and_tables,
+    create_session_factory,
+)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
-    engine = create_app_engine()
-    create_db_and_tables(engine)
-    engine.dispose()
-    yield
+async def lifespan(app: FastAPI):
+    engine = create_async_app_engine()
+    await create_db_and_tables(engine)
+    app.state.engine = engine
+    app.state.session_factory = create_session_factory(engine)
+    password_hasher.start()
+    await password_hasher.configure_policy()
+    async with app.state.session_factory() as session:
+        await revocation_index.load(TokenController(session))
+    try:
+        yield
+    finally:
+        password_hasher.shutdown()
+        await engine.dispose()
 
 
 app = create_app(lifespan=lifespan)
@@ -1,13 +1,18 @@
 import pytest
+import pytest_asyncio
 from faker import Faker
 from fastapi import FastAPI
-from sqlalchemy import create_engine
+from sqlalchemy import NullPool, create_engine, event
+from sqlalchemy.engine import ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.testclient import TestClient
 from testcontainers.postgres import PostgresContainer
 
 from leveluplife.api import create_app
-from leveluplife.auth.utils import get_current_active_user
+from leveluplife.auth.utils import get_current_active_user, get_current_principal
+from leveluplife.cache import CACHES
 from leveluplife.controllers.comment import CommentController
 from leveluplife.controllers.item import ItemController
 from leveluplife.controllers.quest import QuestController
@@ -15,6 +20,7 @@ from leveluplife.controllers.rating import RatingController
 from leveluplife.controllers.reaction import ReactionController
 from leveluplife.controllers.task import TaskController
 from leveluplife.controllers.user import UserController
+from leveluplife.database import get_async_database_url, instrument_engine
 from main import lifespan
 
 
@@ -45,6 +51,34 @@ def fixture_session(engine) -> Session:
         yield session
 
 
+@pytest.fixture(name="async_engine", scope="session")
+def fixture_async_engine(postgres) -> AsyncEngine:
+    async_engine = create_async_engine(
+        get_async_database_url(postgres.get_connection_url()), poolclass=NullPool
+    )
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+@pytest.fixture(name="execution_contexts")
+def fixture_execution_contexts(async_engine: AsyncEngine) -> list[ExecutionContext]:
+    # Statement counts come from collect_query_stats, this is for what they ran
+    contexts = []
+
+    def record_context(conn, cursor, statement, parameters, context, executemany):
+        contexts.append(context)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_context)
+    yield contexts
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record_context)
+
+
+@pytest_asyncio.fixture(name="async_session")
+async def fixture_async_session(async_engine: AsyncEngine) -> AsyncSession:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 @pytest.fixture(autouse=True)
 def clear_db(engine):
     yield
@@ -52,45 +86,53 @@ def clear_db(engine):
     SQLModel.metadata.create_all(engine)
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def clear_caches():
+    yield
+    for cache in CACHES.values():
+        await cache.clear()
+
+
 @pytest.fixture(name="user_controller")
-def get_user_controller(session: Session) -> UserController:
-    return UserController(session)
+def get_user_controller(async_session: AsyncSession) -> UserController:
+    return UserController(async_session)
 
 
 @pytest.fixture(name="task_controller")
-def get_task_controller(session: Session) -> TaskController:
-    return TaskController(session)
+def get_task_controller(async_session: AsyncSession) -> TaskController:
+    return TaskController(async_session)
 
 
 @pytest.fixture(name="item_controller")
-def get_item_controller(session: Session) -> ItemController:
-    return ItemController(session)
+def get_item_controller(async_session: AsyncSession) -> ItemController:
+    return ItemController(async_session)
 
 
 @pytest.fixture(name="rating_controller")
-def get_rating_controller(session: Session) -> RatingController:
-    return RatingController(session)
+def get_rating_controller(async_session: AsyncSession) -> RatingController:
+    return RatingController(async_session)
 
 
 @pytest.fixture(name="comment_controller")
-def get_comment_controller(session: Session) -> CommentController:
-    return CommentController(session)
+def get_comment_controller(async_session: AsyncSession) -> CommentController:
+    return CommentController(async_session)
 
 
 @pytest.fixture(name="reaction_controller")
-def get_reaction_controller(session: Session) -> ReactionController:
-    return ReactionController(session)
+def get_reaction_controller(async_session: AsyncSession) -> ReactionController:
+    return ReactionController(async_session)
 
 
 @pytest.fixture(name="quest_controller")
-def get_quest_controller(session: Session) -> QuestController:
-    return QuestController(session)
+def get_quest_controller(async_session: AsyncSession) -> QuestController:
+    return QuestController(async_session)
 
 
 @pytest.fixture(name="app")
 def get_test_app() -> FastAPI:
     app = create_app(lifespan=lifespan)
     app.dependency_overrides[get_current_active_user] = lambda: "mock.jwt.token"
+    app.dependency_overrides[get_current_principal] = lambda: "mock.jwt.token"
     return app
 
 
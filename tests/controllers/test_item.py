@@ -1,9 +1,13 @@
+import asyncio
+
 import pytest
 from faker import Faker
 from sqlmodel import select, Session
 import random
+from leveluplife.controllers.cache import item_cache
 from leveluplife.controllers.item import ItemController
 from leveluplife.controllers.user import UserController
+from leveluplife.database import collect_query_stats
 from leveluplife.models.error import (
     ItemAlreadyExistsError,
     ItemNotFoundError,
@@ -14,7 +18,7 @@ from leveluplife.models.error import (
 from leveluplife.models.item import ItemCreate, ItemUpdate
 from leveluplife.models.relationship import UserItemLinkCreate
 from leveluplife.models.table import Item
-from leveluplife.models.user import UserCreate, Tribe
+from leveluplife.models.user import UserCreate, Tribe, UserUpdate
 
 
 @pytest.mark.asyncio
@@ -129,6 +133,25 @@ async def test_get_item_by_id(item_controller: ItemController, faker: Faker) ->
     assert retrieved_item.psycho == item_create.psycho
 
 
+@pytest.mark.asyncio
+async def test_get_item_by_id_coalesces_concurrent_loads(
+    item_controller: ItemController, faker: Faker
+) -> None:
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.sentence())
+    )
+    await item_cache.clear()
+
+    with collect_query_stats() as stats:
+        items = await asyncio.gather(
+            *(item_controller.get_item_by_id(item.id) for _ in range(5))
+        )
+
+    assert [retrieved_item.id for retrieved_item in items] == [item.id] * 5
+    # The item and its users, loaded once for every caller
+    assert stats.statements == 2
+
+
 @pytest.mark.asyncio
 async def test_get_item_by_id_raise_item_not_found_error(
     item_controller: ItemController, faker: Faker
@@ -165,6 +188,26 @@ async def test_get_item_by_name(item_controller: ItemController, faker: Faker) -
     assert retrieved_item.psycho == item_create.psycho
 
 
+@pytest.mark.asyncio
+async def test_get_item_by_name_caches_missing_name_until_created(
+    item_controller: ItemController, faker: Faker
+) -> None:
+    item_name = faker.unique.word()
+    with pytest.raises(ItemNameNotFoundError):
+        await item_controller.get_item_by_name(item_name)
+
+    with collect_query_stats() as stats:
+        with pytest.raises(ItemNameNotFoundError):
+            await item_controller.get_item_by_name(item_name)
+    assert stats.statements == 0
+
+    item = await item_controller.create_item(
+        ItemCreate(name=item_name, description=faker.sentence())
+    )
+
+    assert (await item_controller.get_item_by_name(item_name)).id == item.id
+
+
 @pytest.mark.asyncio
 async def test_get_item_by_name_raise_item_name_not_found_error(
     item_controller: ItemController, faker: Faker
@@ -429,3 +472,33 @@ async def test_remove_item_from_user_raise_item_in_user_not_found_error(
     # Assert
     with pytest.raises(ItemInUserNotFoundError):
         await item_controller.remove_item_from_user(created_item.id, created_user.id)
+
+
+@pytest.mark.asyncio
+async def test_get_item_by_id_follows_linked_user_writes(
+    item_controller: ItemController, user_controller: UserController, faker: Faker
+) -> None:
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.sentence())
+    )
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    await item_controller.give_item_to_user(
+        item.id, UserItemLinkCreate(user_ids=[user.id])
+    )
+    await item_controller.get_item_by_id(item.id)
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Updated"))
+    [linked_user] = (await item_controller.get_item_by_id(item.id)).users
+    assert linked_user.biography == "Updated"
+
+    await user_controller.delete_user(user.id)
+    # Requests each have a session, this one must not remember the links
+    item_controller.session.expunge_all()
+    assert (await item_controller.get_item_by_id(item.id)).users == []
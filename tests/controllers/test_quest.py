@@ -15,7 +15,7 @@ from leveluplife.models.error import (
 from leveluplife.models.quest import QuestCreate, Type, QuestUpdate
 from leveluplife.models.relationship import UserQuestLinkCreate, QuestStatus
 from leveluplife.models.table import Quest
-from leveluplife.models.user import UserCreate, Tribe
+from leveluplife.models.user import UserCreate, Tribe, UserUpdate
 
 
 @pytest.mark.asyncio
@@ -348,3 +348,41 @@ async def test_remove_quest_from_user_raise_quest_in_user_not_found_error(
     # Assert
     with pytest.raises(QuestInUserNotFoundError):
         await quest_controller.remove_quest_from_user(created_quest.id, created_user.id)
+
+
+@pytest.mark.asyncio
+async def test_get_quest_by_id_follows_linked_user_writes(
+    quest_controller: QuestController, user_controller: UserController, faker: Faker
+) -> None:
+    quest = await quest_controller.create_quest(
+        QuestCreate(
+            name=faker.unique.word(),
+            description=faker.text(max_nb_chars=300),
+            type=Type("daily"),
+        )
+    )
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    await quest_controller.assign_quest_to_user(
+        quest.id,
+        UserQuestLinkCreate(user_ids=[user.id]),
+        quest_start=datetime.now(),
+        status=QuestStatus.ACTIVE,
+        quest_end=None,
+    )
+    await quest_controller.get_quest_by_id(quest.id)
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Updated"))
+    [linked_user] = (await quest_controller.get_quest_by_id(quest.id)).users
+    assert linked_user.biography == "Updated"
+
+    await user_controller.delete_user(user.id)
+    # Requests each have a session, this one must not remember the links
+    quest_controller.session.expunge_all()
+    assert (await quest_controller.get_quest_by_id(quest.id)).users == []
@@ -1,10 +1,13 @@
 import pytest
 from faker import Faker
+from sqlalchemy.engine import ExecutionContext
+from sqlalchemy.engine.default import CACHE_HIT
 from sqlmodel import Session, select
 
 from leveluplife.controllers.task import TaskController
 from leveluplife.controllers.user import UserController
 from leveluplife.models.error import (
+    InvalidCursorError,
     TaskAlreadyExistsError,
     TaskNotFoundError,
     TaskTitleNotFoundError,
@@ -12,6 +15,8 @@ from leveluplife.models.error import (
 from leveluplife.models.table import Task
 from leveluplife.models.task import TaskCreate, TaskUpdate
 from leveluplife.models.user import Tribe, UserCreate
+from leveluplife.models.view import TaskView
+from leveluplife.pagination import encode_cursor
 
 
 @pytest.mark.asyncio
@@ -115,6 +120,82 @@ async def test_get_tasks(
         assert all_tasks[i].user_id == created_task.user_id
 
 
+@pytest.mark.asyncio
+async def test_get_tasks_returns_untracked_views(
+    task_controller: TaskController, user_controller: UserController, faker: Faker
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NOSFERATI,
+        )
+    )
+    task = await task_controller.create_task(
+        TaskCreate(
+            title=faker.unique.word(),
+            description=faker.text(max_nb_chars=400),
+            completed=faker.boolean(),
+            category=faker.word(),
+            user_id=user.id,
+        )
+    )
+    task_controller.session.expunge_all()
+
+    tasks = await task_controller.get_tasks(offset=0, limit=20)
+
+    assert tasks == [TaskView.model_validate(task)]
+    # Rows are read as plain columns, the session tracks none of them
+    assert len(task_controller.session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_with_cursor(
+    task_controller: TaskController, user_controller: UserController, faker: Faker
+) -> None:
+    user_create = UserCreate(
+        username=faker.unique.user_name()[:18],
+        email=faker.unique.email(),
+        password=faker.password(),
+        tribe=Tribe.NOSFERATI,
+    )
+    user = await user_controller.create_user(user_create)
+
+    created_tasks = []
+    for _ in range(5):
+        task_create = TaskCreate(
+            title=faker.unique.word(),
+            description=faker.text(max_nb_chars=400),
+            completed=faker.boolean(),
+            category=faker.word(),
+            user_id=user.id,
+        )
+        created_tasks.append(await task_controller.create_task(task_create))
+
+    pages = []
+    cursor = None
+    while True:
+        page = await task_controller.get_tasks(offset=0, limit=2, cursor=cursor)
+        pages.append(page)
+        if len(page) < 2:
+            break
+        cursor = encode_cursor([page[-1].created_at, page[-1].id])
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [task.id for page in pages for task in page] == [
+        task.id for task in created_tasks
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_raise_invalid_cursor_error(
+    task_controller: TaskController,
+) -> None:
+    with pytest.raises(InvalidCursorError):
+        await task_controller.get_tasks(offset=0, limit=2, cursor="not-a-cursor")
+
+
 @pytest.mark.asyncio
 async def test_get_task_by_id(
     task_controller: TaskController, user_controller: UserController, faker: Faker
@@ -146,6 +227,43 @@ async def test_get_task_by_id(
     assert retrieved_task.user_id == user.id
 
 
+@pytest.mark.asyncio
+async def test_get_task_by_id_reuses_compiled_statement(
+    task_controller: TaskController,
+    user_controller: UserController,
+    execution_contexts: list[ExecutionContext],
+    faker: Faker,
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NOSFERATI,
+        )
+    )
+    tasks = [
+        await task_controller.create_task(
+            TaskCreate(
+                title=faker.unique.word(),
+                description=faker.text(max_nb_chars=400),
+                completed=faker.boolean(),
+                category=faker.word(),
+                user_id=user.id,
+            )
+        )
+        for _ in range(3)
+    ]
+    await task_controller.get_task_by_id(tasks[0].id)
+
+    execution_contexts.clear()
+    for task in tasks:
+        assert (await task_controller.get_task_by_id(task.id)).id == task.id
+
+    cache_hits = [context.cache_hit for context in execution_contexts]
+    assert cache_hits == [CACHE_HIT] * len(tasks)
+
+
 @pytest.mark.asyncio
 async def test_get_task_by_id_raise_task_not_found_error(
     task_controller: TaskController, faker: Faker
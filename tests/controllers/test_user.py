@@ -5,8 +5,12 @@ from faker import Faker
 from sqlmodel import Session, select
 
 from leveluplife.auth.hash import verify_password
+from leveluplife.controllers.cache import user_view_cache
+from leveluplife.controllers.comment import CommentController
 from leveluplife.controllers.item import ItemController
+from leveluplife.controllers.task import TaskController
 from leveluplife.controllers.user import UserController
+from leveluplife.database import collect_query_stats
 from leveluplife.models.error import (
     UserEmailAlreadyExistsError,
     UserEmailNotFoundError,
@@ -15,9 +19,11 @@ from leveluplife.models.error import (
     UserUsernameNotFoundError,
     ItemLinkToUserNotFoundError,
 )
+from leveluplife.models.comment import CommentCreate
 from leveluplife.models.item import ItemCreate
 from leveluplife.models.relationship import UserItemLinkCreate
 from leveluplife.models.table import User
+from leveluplife.models.task import TaskCreate
 from leveluplife.models.user import Tribe, UserCreate, UserUpdate
 from leveluplife.models.view import UserView
 
@@ -274,6 +280,57 @@ async def test_get_users(user_controller: UserController, faker: Faker) -> None:
         assert all_users[i].psycho == created_user.psycho
 
 
+@pytest.mark.asyncio
+async def test_get_users_pages_users_not_joined_rows(
+    user_controller: UserController,
+    task_controller: TaskController,
+    comment_controller: CommentController,
+    faker: Faker,
+) -> None:
+    users = []
+    for username in ["alice", "bob", "carol"]:
+        user_create = UserCreate(
+            username=username,
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.VALHARS,
+        )
+        users.append(await user_controller.create_user(user_create))
+
+    # Several tasks with comments would multiply the rows of a joined query
+    for _ in range(3):
+        task = await task_controller.create_task(
+            TaskCreate(
+                title=faker.unique.word(),
+                description=faker.text(max_nb_chars=400),
+                completed=faker.boolean(),
+                category=faker.word(),
+                user_id=users[0].id,
+            )
+        )
+        await comment_controller.create_comment(
+            CommentCreate(
+                task_id=task.id,
+                user_id=users[0].id,
+                content=faker.text(max_nb_chars=800),
+            )
+        )
+
+    first_page = await user_controller.get_users(offset=0, limit=2)
+    second_page = await user_controller.get_users(offset=2, limit=2)
+    tribe_page = await user_controller.get_users_by_tribe(
+        Tribe.VALHARS, offset=0, limit=2
+    )
+
+    assert [user.username for user in first_page] == ["alice", "bob"]
+    assert [user.username for user in second_page] == ["carol"]
+    assert [user.username for user in tribe_page] == ["alice", "bob"]
+    assert len(first_page[0].tasks) == 3
+    assert len(first_page[0].comments) == 3
+    assert first_page[1].tasks == []
+    assert first_page[1].comments == []
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_id(user_controller: UserController, faker: Faker) -> None:
     user_create = UserCreate(
@@ -292,6 +349,145 @@ async def test_get_user_by_id(user_controller: UserController, faker: Faker) ->
     assert retrieved_user.tribe == user_create.tribe
 
 
+@pytest.mark.asyncio
+async def test_get_user_profile_query_count(
+    user_controller: UserController,
+    task_controller: TaskController,
+    comment_controller: CommentController,
+    item_controller: ItemController,
+    faker: Faker,
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.sentence())
+    )
+    await item_controller.give_item_to_user(
+        item.id, UserItemLinkCreate(user_ids=[user.id])
+    )
+    for _ in range(3):
+        task = await task_controller.create_task(
+            TaskCreate(
+                title=faker.unique.word(),
+                description=faker.text(max_nb_chars=400),
+                completed=faker.boolean(),
+                category=faker.word(),
+                user_id=user.id,
+            )
+        )
+        await comment_controller.create_comment(
+            CommentCreate(
+                task_id=task.id,
+                user_id=user.id,
+                content=faker.text(max_nb_chars=800),
+            )
+        )
+
+    # One query for the user and one per relation, however many rows exist
+    for lookup in [
+        lambda: user_controller.get_user_by_id(user.id),
+        lambda: user_controller.get_user_by_username(user.username),
+        lambda: user_controller.get_user_by_email(user.email),
+    ]:
+        await user_view_cache.clear()
+        with collect_query_stats() as stats:
+            user_view = await lookup()
+        assert stats.statements == 7
+        assert len(user_view.tasks) == 3
+        assert len(user_view.comments) == 3
+        assert len(user_view.items) == 1
+
+
+@pytest.mark.asyncio
+async def test_constructed_user_view_matches_validated_view(
+    user_controller: UserController,
+    task_controller: TaskController,
+    comment_controller: CommentController,
+    item_controller: ItemController,
+    faker: Faker,
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.sentence())
+    )
+    await item_controller.give_item_to_user(
+        item.id, UserItemLinkCreate(user_ids=[user.id])
+    )
+    task = await task_controller.create_task(
+        TaskCreate(
+            title=faker.unique.word(),
+            description=faker.text(max_nb_chars=400),
+            completed=faker.boolean(),
+            category=faker.word(),
+            user_id=user.id,
+        )
+    )
+    await comment_controller.create_comment(
+        CommentCreate(task_id=task.id, user_id=user.id, content=faker.sentence())
+    )
+    await user_view_cache.clear()
+
+    user_view = await user_controller.get_user_by_id(user.id)
+
+    # Built from rows without validation, it holds what validation would give
+    validated = UserView.model_validate(user_view.model_dump())
+    assert user_view == validated
+    assert user_view.model_dump_json() == validated.model_dump_json()
+    assert isinstance(user_view.tribe, Tribe)
+    assert user_view.items[0].id == item.id
+    assert user_view.comments[0].task_id == task.id
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_loads_only_included_relations(
+    user_controller: UserController,
+    task_controller: TaskController,
+    faker: Faker,
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    await task_controller.create_task(
+        TaskCreate(
+            title=faker.unique.word(),
+            description=faker.text(max_nb_chars=400),
+            completed=faker.boolean(),
+            category=faker.word(),
+            user_id=user.id,
+        )
+    )
+    await user_view_cache.clear()
+
+    with collect_query_stats() as stats:
+        user_view = await user_controller.get_user_by_id(user.id, ("tasks",))
+
+    # The user and its tasks, no other relation is queried
+    assert stats.statements == 2
+    assert len(user_view.tasks) == 1
+    # A partial view is never cached in place of the complete one
+    assert await user_view_cache.get(user.id) is None
+    assert len((await user_controller.get_user_by_id(user.id)).tasks) == 1
+    assert await user_view_cache.get(user.id) is not None
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_id_raise_user_not_found_error(
     user_controller: UserController, faker: Faker
@@ -330,6 +526,66 @@ async def test_get_user_by_username_raise_user_username_not_found_error(
         await user_controller.get_user_by_username(non_existent_user_username)
 
 
+@pytest.mark.asyncio
+async def test_missing_username_and_email_are_cached_until_created(
+    user_controller: UserController, faker: Faker
+) -> None:
+    user_create = UserCreate(
+        username=faker.unique.user_name()[:18],
+        email=faker.unique.email(),
+        password=faker.password(),
+        tribe=random.choice(list(Tribe)),
+    )
+    for lookup, error in [
+        (
+            lambda: user_controller.get_user_by_username(user_create.username),
+            UserUsernameNotFoundError,
+        ),
+        (
+            lambda: user_controller.get_user_by_email(user_create.email),
+            UserEmailNotFoundError,
+        ),
+    ]:
+        with pytest.raises(error):
+            await lookup()
+
+    with collect_query_stats() as stats:
+        with pytest.raises(UserUsernameNotFoundError):
+            await user_controller.get_user_by_username(user_create.username)
+        with pytest.raises(UserEmailNotFoundError):
+            await user_controller.get_user_by_email(user_create.email)
+    assert stats.statements == 0
+
+    await user_controller.create_user(user_create)
+
+    user_view = await user_controller.get_user_by_username(user_create.username)
+    assert user_view.email == user_create.email
+    user_view = await user_controller.get_user_by_email(user_create.email)
+    assert user_view.username == user_create.username
+
+
+@pytest.mark.asyncio
+async def test_update_user_drops_missing_username(
+    user_controller: UserController, faker: Faker
+) -> None:
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=random.choice(list(Tribe)),
+        )
+    )
+    new_username = faker.unique.user_name()[:18]
+    with pytest.raises(UserUsernameNotFoundError):
+        await user_controller.get_user_by_username(new_username)
+
+    await user_controller.update_user(user.id, UserUpdate(username=new_username))
+
+    user_view = await user_controller.get_user_by_username(new_username)
+    assert user_view.id == user.id
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_email(user_controller: UserController, faker: Faker) -> None:
     user_create = UserCreate(
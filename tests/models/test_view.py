@@ -0,0 +1,143 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from pydantic_core import to_json
+
+from leveluplife.models.quest import Type
+from leveluplife.models.reaction import ReactionType
+from leveluplife.models.relationship import QuestStatus
+from leveluplife.models.user import Tribe
+from leveluplife.models.view import (
+    CommentView,
+    ItemUserView,
+    QuestUserView,
+    RatingView,
+    ReactionView,
+    TaskView,
+    UserView,
+    construct_view,
+)
+
+CREATED_AT = datetime(2024, 1, 1, 12, 30)
+USER_ID = uuid4()
+TASK_ID = uuid4()
+
+# Row values of each view, typed as the database returns them
+ROWS = {
+    TaskView: {
+        "title": "Run",
+        "description": "Run 5 km",
+        "completed": False,
+        "category": "sport",
+        "user_id": USER_ID,
+        "id": TASK_ID,
+        "created_at": CREATED_AT,
+    },
+    ItemUserView: {
+        "name": "Sword",
+        "description": "Sharp",
+        "price_sell": 10,
+        "strength": 5,
+        "intelligence": None,
+        "agility": 1,
+        "wise": 0,
+        "psycho": None,
+        "id": uuid4(),
+        "created_at": CREATED_AT,
+        "updated_at": None,
+        "deleted_at": None,
+        "equipped": True,
+    },
+    RatingView: {
+        "rating": 4,
+        "user_id": USER_ID,
+        "task_id": TASK_ID,
+        "id": uuid4(),
+        "created_at": CREATED_AT,
+    },
+    CommentView: {
+        "content": "Well done",
+        "user_id": USER_ID,
+        "task_id": TASK_ID,
+        "id": uuid4(),
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+        "deleted_at": None,
+    },
+    ReactionView: {
+        "user_id": USER_ID,
+        "task_id": TASK_ID,
+        "reaction": ReactionType.HAPPY,
+        "id": uuid4(),
+        "created_at": CREATED_AT,
+        "updated_at": None,
+        "deleted_at": None,
+    },
+    QuestUserView: {
+        "name": "Marathon",
+        "description": "Run a marathon",
+        "xp_reward": 100,
+        "type": Type.YEARLY,
+        "id": uuid4(),
+        "created_at": CREATED_AT,
+        "updated_at": None,
+        "deleted_at": None,
+        "status": QuestStatus.ACTIVE,
+        "quest_start": CREATED_AT,
+        "quest_end": None,
+    },
+}
+
+
+def user_row() -> dict:
+    return {
+        "username": "JohnDoe",
+        "email": "john@doe.com",
+        "tribe": Tribe.VALHARS,
+        "biography": None,
+        "profile_picture": None,
+        "background_image": None,
+        "id": USER_ID,
+        "created_at": CREATED_AT,
+        "strength": 1,
+        "intelligence": 2,
+        "agility": 3,
+        "wise": 4,
+        "psycho": 5,
+        "experience": 6,
+        "items": [construct_view(ItemUserView, ROWS[ItemUserView])],
+        "tasks": [construct_view(TaskView, ROWS[TaskView])],
+        "ratings": [construct_view(RatingView, ROWS[RatingView])],
+        "comments": [construct_view(CommentView, ROWS[CommentView])],
+        "reactions": [construct_view(ReactionView, ROWS[ReactionView])],
+        "quests": [construct_view(QuestUserView, ROWS[QuestUserView])],
+    }
+
+
+def assert_matches_validated(constructed, view: type) -> None:
+    validated = view.model_validate(constructed.model_dump())
+
+    assert type(constructed) is view
+    assert constructed == validated
+    assert constructed.model_fields_set == validated.model_fields_set
+    assert constructed.model_dump() == validated.model_dump()
+    assert constructed.model_dump_json() == validated.model_dump_json()
+    assert to_json(constructed) == to_json(validated)
+    assert constructed.__pydantic_extra__ == validated.__pydantic_extra__
+    assert constructed.__pydantic_private__ == validated.__pydantic_private__
+
+
+@pytest.mark.parametrize("view", list(ROWS), ids=lambda view: view.__name__)
+def test_constructed_view_serializes_as_validated(view: type):
+    assert_matches_validated(construct_view(view, ROWS[view]), view)
+
+
+def test_constructed_user_view_serializes_as_validated():
+    assert_matches_validated(construct_view(UserView, user_row()), UserView)
+
+
+def test_construct_view_leaves_out_other_columns():
+    assert construct_view(TaskView, ROWS[TaskView]) == construct_view(
+        TaskView, {**ROWS[TaskView], "unrelated": 1}
+    )
@@ -167,7 +167,7 @@ async def test_get_item_by_id(
 
     def _mock_get_item_by_id():
         item_controller.get_item_by_id = AsyncMock(
-            return_value=Item(
+            return_value=ItemWithUser(
                 id=_id,
                 created_at=datetime(2020, 1, 1),
                 updated_at=datetime(2021, 1, 1),
@@ -179,6 +179,7 @@ async def test_get_item_by_id(
                 agility=10,
                 wise=10,
                 psycho=10,
+                users=[],
             ),
         )
         return item_controller
@@ -203,6 +204,56 @@ async def test_get_item_by_id(
     }
 
 
+@pytest.mark.asyncio
+async def test_get_item_by_id_with_linked_users(
+    item_controller: ItemController, client: TestClient, app: FastAPI
+) -> None:
+    _id = uuid.uuid4()
+    user_id = uuid.uuid4()
+
+    def _mock_get_item_by_id():
+        item_controller.get_item_by_id = AsyncMock(
+            return_value=ItemWithUser(
+                id=_id,
+                created_at=datetime(2020, 1, 1),
+                updated_at=datetime(2021, 1, 1),
+                deleted_at=None,
+                name="Supermarket",
+                description="John Doe is going to the supermarket",
+                price_sell=100,
+                strength=10,
+                intelligence=10,
+                agility=10,
+                wise=10,
+                psycho=10,
+                users=[
+                    User(
+                        id=user_id,
+                        username="JohnDoe",
+                        created_at=datetime(2020, 1, 1),
+                        email="john.doe@test.com",
+                        tribe=Tribe.NOSFERATI,
+                        password="password-hash",
+                    )
+                ],
+            ),
+        )
+        return item_controller
+
+    app.dependency_overrides[get_item_controller] = _mock_get_item_by_id
+    get_item_by_id_response = client.get(f"/items/{_id}")
+    assert get_item_by_id_response.status_code == 200
+    [linked_user] = get_item_by_id_response.json()["users"]
+    assert linked_user["id"] == str(user_id)
+    assert "password" not in linked_user
+
+    not_modified_response = client.get(
+        f"/items/{_id}",
+        headers={"If-None-Match": get_item_by_id_response.headers["ETag"]},
+    )
+    assert not_modified_response.status_code == 304
+
+
 @pytest.mark.asyncio
 async def test_get_item_by_id_raise_item_not_found_error(
     item_controller: ItemController, client: TestClient, app: FastAPI
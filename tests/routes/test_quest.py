@@ -143,7 +143,7 @@ async def test_get_quest_by_id(
 
     def _mock_get_quest_by_id():
         quest_controller.get_quest_by_id = AsyncMock(
-            return_value=Quest(
+            return_value=QuestWithUser(
                 id=_id,
                 created_at=datetime(2020, 1, 1),
                 updated_at=datetime(2021, 1, 1),
@@ -151,6 +151,7 @@ async def test_get_quest_by_id(
                 description="John Doe is going to the supermarket",
                 type=Type("daily"),
                 xp_reward=100,
+                users=[],
             ),
         )
         return quest_controller
@@ -171,6 +172,51 @@ async def test_get_quest_by_id(
     }
 
 
+@pytest.mark.asyncio
+async def test_get_quest_by_id_with_linked_users(
+    quest_controller: QuestController, client: TestClient, app: FastAPI
+) -> None:
+    _id = uuid.uuid4()
+    user_id = uuid.uuid4()
+
+    def _mock_get_quest_by_id():
+        quest_controller.get_quest_by_id = AsyncMock(
+            return_value=QuestWithUser(
+                id=_id,
+                created_at=datetime(2020, 1, 1),
+                updated_at=datetime(2021, 1, 1),
+                deleted_at=None,
+                name="Supermarket",
+                description="John Doe is going to the supermarket",
+                type=Type("daily"),
+                xp_reward=100,
+                users=[
+                    User(
+                        id=user_id,
+                        username="JohnDoe",
+                        created_at=datetime(2020, 1, 1),
+                        email="john.doe@test.com",
+                        tribe=Tribe.NOSFERATI,
+                    )
+                ],
+            ),
+        )
+        return quest_controller
+
+    app.dependency_overrides[get_quest_controller] = _mock_get_quest_by_id
+    get_quest_by_id_response = client.get(f"/quests/{_id}")
+    assert get_quest_by_id_response.status_code == 200
+    assert [user["id"] for user in get_quest_by_id_response.json()["users"]] == [
+        str(user_id)
+    ]
+
+    not_modified_response = client.get(
+        f"/quests/{_id}",
+        headers={"If-None-Match": get_quest_by_id_response.headers["ETag"]},
+    )
+    assert not_modified_response.status_code == 304
+
+
 @pytest.mark.asyncio
 async def test_get_quest_by_id_raise_quest_not_found_error(
     quest_controller: QuestController, client: TestClient, app: FastAPI
@@ -15,6 +15,7 @@ from leveluplife.models.error import (
 )
 from leveluplife.models.table import Task, User
 from leveluplife.models.user import Tribe
+from leveluplife.pagination import encode_cursor
 
 
 @pytest.mark.asyncio
@@ -144,6 +145,42 @@ async def test_get_tasks(
     ]
 
 
+@pytest.mark.asyncio
+async def test_get_tasks_next_cursor(
+    task_controller: TaskController, client: TestClient, app: FastAPI
+) -> None:
+    mock_tasks = [
+        Task(
+            id=uuid.uuid4(),
+            created_at=datetime(2020, 1, day),
+            title=f"Task {day}",
+            description="Task description",
+            completed=False,
+            category="Groceries",
+            user_id=uuid.uuid4(),
+        )
+        for day in (1, 2)
+    ]
+
+    def _mock_get_tasks():
+        task_controller.get_tasks = AsyncMock(return_value=mock_tasks)
+        return task_controller
+
+    app.dependency_overrides[get_task_controller] = _mock_get_tasks
+
+    get_task_response = client.get("/tasks", params={"limit": 2, "offset": 1})
+    assert get_task_response.status_code == 200
+    assert get_task_response.headers["x-next-cursor"] == encode_cursor(
+        [mock_tasks[-1].created_at, mock_tasks[-1].id]
+    )
+    task_controller.get_tasks.assert_awaited_once_with(2, 2, None)
+
+    get_task_response = client.get("/tasks", params={"limit": 5000})
+    assert get_task_response.status_code == 200
+    assert "x-next-cursor" not in get_task_response.headers
+    task_controller.get_tasks.assert_awaited_with(0, 100, None)
+
+
 @pytest.mark.asyncio
 async def test_get_task_by_id(
     task_controller: TaskController, client: TestClient, app: FastAPI
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from unittest.mock import AsyncMock
 
+import fastapi.routing
 import pytest
 from fastapi import FastAPI
 from starlette.testclient import TestClient
@@ -132,21 +133,19 @@ async def test_get_users(
     user_controller: UserController, client: TestClient, app: FastAPI
 ) -> None:
     mock_users = [
-        User(
+        UserView(
             id=uuid.uuid4(),
             created_at=datetime(2020, 1, 1),
             tribe=Tribe("Nosferati"),
             username="JohnDoe",
             email="john.doe@test.com",
-            password="johndoepassword",
         ),
-        User(
+        UserView(
             id=uuid.uuid4(),
             created_at=datetime(2022, 2, 2),
             tribe=Tribe("Saharans"),
             username="JaneDoe",
             email="jane.doe@test.com",
-            password="janedoepassword",
         ),
     ]
 
@@ -193,13 +192,12 @@ async def test_get_user_by_id(
 
     def _mock_get_user_by_id():
         user_controller.get_user_by_id = AsyncMock(
-            return_value=User(
+            return_value=UserView(
                 id=_id,
                 created_at=datetime(2020, 1, 1),
                 tribe=Tribe("Neutrals"),
                 username="JohnDoe",
                 email="john.doe@test.com",
-                password="janedoepassword",
             ),
         )
         return user_controller
@@ -262,13 +260,12 @@ async def test_get_user_by_username(
 
     def _mock_get_user_by_username():
         user_controller.get_user_by_username = AsyncMock(
-            return_value=User(
+            return_value=UserView(
                 id=_id,
                 created_at=datetime(2020, 1, 1),
                 tribe=Tribe("Neutrals"),
                 username="JohnDoe",
                 email="john.doe@test.com",
-                password="janedoepassword",
             ),
         )
         return user_controller
@@ -335,13 +332,12 @@ async def test_get_user_by_email(
 
     def _mock_get_user_by_email():
         user_controller.get_user_by_email = AsyncMock(
-            return_value=User(
+            return_value=UserView(
                 id=_id,
                 created_at=datetime(2020, 1, 1),
                 tribe=Tribe("Neutrals"),
                 username="JohnDoe",
                 email="john.doe@test.com",
-                password="janedoepassword",
             ),
         )
         return user_controller
@@ -405,29 +401,26 @@ async def test_get_users_by_tribe(
     client: TestClient, user_controller: UserController, app: FastAPI
 ) -> None:
     mock_users = [
-        User(
+        UserView(
             id=uuid.uuid4(),
             created_at=datetime(2020, 1, 1),
             tribe=Tribe.NOSFERATI,
             username="JohnDoe",
             email="john.doe@test.com",
-            password="johndoepassword",
         ),
-        User(
+        UserView(
             id=uuid.uuid4(),
             created_at=datetime(2022, 2, 2),
             tribe=Tribe.NOSFERATI,
             username="JaneDoe",
             email="jane.doe@test.com",
-            password="janedoepassword",
         ),
-        User(
+        UserView(
             id=uuid.uuid4(),
             created_at=datetime(2021, 3, 3),
             tribe=Tribe.SAHARANS,
             username="JimDoe",
             email="jim.doe@test.com",
-            password="jimdoepassword",
         ),
     ]
 
@@ -481,7 +474,7 @@ async def test_update_user(
         "email": "john.doe@test.com",
     }
 
-    updated_user = User(
+    updated_user = UserView(
         id=_id,
         created_at=datetime(2020, 1, 1),
         tribe=Tribe(user_update_data["tribe"]),
@@ -583,13 +576,12 @@ async def test_update_user_password(
 
     password_date = {"password": "johndoepassword"}
 
-    updated_user = User(
+    updated_user = UserView(
         id=_id,
         created_at=datetime(2020, 1, 1),
         username="JohnDoe",
         email="john.doe@test.com",
         tribe=Tribe("Neutrals"),
-        password="johndoepassword",
     )
 
     def _mock_update_user_password():
@@ -718,3 +710,105 @@ async def test_equip_item_to_user(
         "reactions": [],
         "quests": [],
     }
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_sparse_fieldset(
+    user_controller: UserController, client: TestClient, app: FastAPI
+) -> None:
+    mock_users = [
+        UserView(
+            id=uuid.uuid4(),
+            created_at=datetime(2020, 1, 1),
+            tribe=Tribe("Valhars"),
+            username=username,
+            email=f"{username.lower()}@test.com",
+            strength=12,
+        )
+        for username in ("JohnDoe", "JaneDoe")
+    ]
+
+    def _mock_get_users():
+        user_controller.get_users = AsyncMock(return_value=mock_users)
+        return user_controller
+
+    app.dependency_overrides[get_user_controller] = _mock_get_users
+
+    response = client.get(
+        "/users",
+        params={"fields": "username, strength", "include": "items", "limit": 2},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"username": user.username, "strength": 12, "items": []} for user in mock_users
+    ]
+    assert "X-Next-Cursor" in response.headers
+    assert user_controller.get_users.call_args.args[-1] == ("items",)
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_without_relations(
+    user_controller: UserController, client: TestClient, app: FastAPI
+) -> None:
+    user_view = UserView(
+        id=uuid.uuid4(),
+        created_at=datetime(2020, 1, 1),
+        tribe=Tribe("Neutrals"),
+        username="JohnDoe",
+        email="john.doe@test.com",
+    )
+
+    def _mock_get_user_by_id():
+        user_controller.get_user_by_id = AsyncMock(return_value=user_view)
+        return user_controller
+
+    app.dependency_overrides[get_user_controller] = _mock_get_user_by_id
+
+    response = client.get(f"/users/{user_view.id}", params={"include": ""})
+    assert response.status_code == 200
+    assert set(response.json()) == set(user_view.model_fields) - {
+        "items",
+        "quests",
+        "tasks",
+        "ratings",
+        "comments",
+        "reactions",
+    }
+    user_controller.get_user_by_id.assert_awaited_once_with(user_view.id, ())
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_unknown_field(client: TestClient) -> None:
+    response = client.get("/users", params={"fields": "username,password"})
+    assert response.status_code == 400
+    assert response.json()["name"] == "InvalidFieldsetError"
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_id_skips_response_model(
+    user_controller: UserController,
+    client: TestClient,
+    app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user_view = UserView(
+        id=uuid.uuid4(),
+        created_at=datetime(2020, 1, 1),
+        tribe=Tribe("Neutrals"),
+        username="JohnDoe",
+        email="john.doe@test.com",
+    )
+
+    def _mock_get_user_by_id():
+        user_controller.get_user_by_id = AsyncMock(return_value=user_view)
+        return user_controller
+
+    async def _serialize_response(**kwargs):
+        raise AssertionError("the view went through the response_model")
+
+    app.dependency_overrides[get_user_controller] = _mock_get_user_by_id
+    monkeypatch.setattr(fastapi.routing, "serialize_response", _serialize_response)
+
+    response = client.get(f"/users/{user_view.id}")
+    assert response.status_code == 200
+    assert response.json() == user_view.model_dump(mode="json")
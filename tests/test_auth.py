@@ -0,0 +1,105 @@
+import pytest
+from faker import Faker
+from fastapi import HTTPException
+
+from leveluplife.auth.utils import (
+    create_access_token,
+    create_user_access_token,
+    get_current_principal,
+    get_current_user,
+)
+from leveluplife.controllers.user import UserController
+from leveluplife.database import collect_query_stats
+from leveluplife.models.user import Tribe, UserCreate, UserUpdate
+
+
+async def create_user(user_controller: UserController, faker: Faker):
+    return await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.VALHARS,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_from_claims(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+
+    with collect_query_stats() as first:
+        principal = await get_current_principal(token, user_controller)
+    with collect_query_stats() as second:
+        assert await get_current_principal(token, user_controller) == principal
+
+    assert principal.id == user.id
+    assert principal.username == user.username
+    assert principal.tribe == Tribe.VALHARS
+    assert principal.token_version == 0
+    assert first.statements == 1
+    assert second.statements == 0
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_rejects_token_without_claims(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_principal(
+            create_access_token({"sub": user.username}), user_controller
+        )
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_password_change_revokes_older_tokens(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+    await get_current_principal(token, user_controller)
+
+    await user_controller.update_user_password(user.id, "new-password-hash")
+
+    for dependency in (get_current_principal, get_current_user):
+        with pytest.raises(HTTPException):
+            await dependency(token, user_controller)
+    new_user = await user_controller.get_user_by_username_with_password(user.username)
+    new_token = create_user_access_token(new_user)
+    assert (await get_current_principal(new_token, user_controller)).token_version == 1
+    assert (await get_current_user(new_token, user_controller)).id == user.id
+
+
+@pytest.mark.asyncio
+async def test_tribe_change_revokes_older_tokens(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Unchanged"))
+    assert await get_current_principal(token, user_controller)
+
+    await user_controller.update_user(user.id, UserUpdate(tribe=Tribe.SAHARANS))
+    with pytest.raises(HTTPException):
+        await get_current_principal(token, user_controller)
+
+
+@pytest.mark.asyncio
+async def test_delete_user_revokes_tokens(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+    await get_current_principal(token, user_controller)
+
+    await user_controller.delete_user(user.id)
+
+    with pytest.raises(HTTPException):
+        await get_current_principal(token, user_controller)
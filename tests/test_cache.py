@@ -0,0 +1,315 @@
+from datetime import datetime
+
+import pytest
+from faker import Faker
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+from leveluplife.api import create_app
+from leveluplife.auth.cache import principal_cache
+from leveluplife.auth.utils import create_user_access_token, get_current_user
+from leveluplife.cache import CACHES, TTLCache
+from leveluplife.controllers.cache import (
+    item_cache,
+    missing_cache,
+    quest_cache,
+    user_view_cache,
+)
+from leveluplife.controllers.comment import CommentController
+from leveluplife.controllers.item import ItemController
+from leveluplife.controllers.quest import QuestController
+from leveluplife.controllers.task import TaskController
+from leveluplife.controllers.user import (
+    USER_BY_USERNAME,
+    USER_TASKS,
+    UserController,
+)
+from leveluplife.database import collect_query_stats
+from leveluplife.models.comment import CommentCreate
+from leveluplife.models.error import UserUsernameNotFoundError
+from leveluplife.models.item import ItemCreate, ItemUpdate
+from leveluplife.models.quest import QuestCreate, Type
+from leveluplife.models.relationship import UserItemLinkCreate, UserQuestLinkCreate
+from leveluplife.models.task import TaskCreate
+from leveluplife.models.user import Tribe, UserCreate, UserUpdate
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache("test_expiry", maxsize=10, ttl=5, clock=clock)
+    await cache.set("key", "value")
+
+    clock.now = 4.9
+    assert await cache.get("key") == "value"
+    clock.now = 5
+    assert await cache.get("key") is None
+    assert len(cache) == 0
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    CACHES.pop("test_expiry")
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache("test_eviction", maxsize=2, ttl=60)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    assert cache.stats.evictions == 1
+    assert cache.snapshot()["hit_rate"] == 0.75
+    CACHES.pop("test_eviction")
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_skips_values_loaded_across_an_invalidation():
+    cache = TTLCache("test_generation", maxsize=10, ttl=60)
+    CACHES.pop("test_generation")
+    generation = cache.generation
+
+    await cache.invalidate("key")
+    await cache.set("key", "stale", generation)
+
+    assert await cache.get("key") is None
+    assert cache.stats.stale_sets == 1
+    await cache.set("key", "fresh", cache.generation)
+    assert await cache.get("key") == "fresh"
+
+
+def write_during(
+    monkeypatch, user_controller: UserController, statement, write
+) -> None:
+    """Run ``write`` right after ``statement``, as a concurrent request would."""
+    exec = user_controller.session.exec
+
+    async def exec_then_write(query, *args, **kwargs):
+        result = await exec(query, *args, **kwargs)
+        if query is statement:
+            await write()
+        return result
+
+    monkeypatch.setattr(user_controller.session, "exec", exec_then_write)
+
+
+async def create_user(user_controller: UserController, faker: Faker):
+    return await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NEUTRALS,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+    hits = principal_cache.stats.hits
+
+    with collect_query_stats() as first:
+        assert (await get_current_user(token, user_controller)).id == user.id
+    with collect_query_stats() as second:
+        assert (await get_current_user(token, user_controller)).id == user.id
+
+    assert first.statements == 1
+    assert second.statements == 0
+    assert principal_cache.stats.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cache_invalidated_on_update(
+    user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    token = create_user_access_token(user)
+    await get_current_user(token, user_controller)
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Updated"))
+    assert await principal_cache.get(user.username) is None
+    assert (await get_current_user(token, user_controller)).biography == "Updated"
+
+    await user_controller.update_user_password(user.id, "new-password-hash")
+    assert await principal_cache.get(user.username) is None
+    with pytest.raises(HTTPException):
+        await get_current_user(token, user_controller)
+
+    await user_controller.delete_user(user.id)
+    with pytest.raises(HTTPException):
+        await get_current_user(token, user_controller)
+
+
+@pytest.mark.asyncio
+async def test_get_cache_metrics(app: FastAPI, client: TestClient):
+    await principal_cache.get("missing")
+
+    response = client.get("/metrics/caches")
+
+    assert response.status_code == 200
+    assert response.json()["principals"]["misses"] >= 1
+
+
+def test_cache_metrics_require_a_token():
+    response = TestClient(create_app(lifespan=None)).get("/metrics/caches")
+
+    assert response.status_code == 401
+
+
+def test_get_unknown_cache_key_metrics(client: TestClient):
+    response = client.get("/metrics/caches/unknown/keys")
+
+    assert response.status_code == 404
+    assert response.json()["name"] == "CacheNotFoundError"
+
+
+@pytest.mark.asyncio
+async def test_item_catalog_is_cached_until_written(
+    item_controller: ItemController, faker: Faker
+):
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.text(max_nb_chars=50))
+    )
+    await item_controller.get_items(offset=0, limit=20)
+    await item_controller.get_item_by_id(item.id)
+    await item_controller.get_item_by_name(item.name)
+    hits = item_cache.stats.hits
+
+    with collect_query_stats() as stats:
+        assert len(await item_controller.get_items(offset=0, limit=20)) == 1
+        assert (await item_controller.get_item_by_id(item.id)).id == item.id
+        assert (await item_controller.get_item_by_name(item.name)).id == item.id
+
+    assert stats.statements == 0
+    assert item_cache.stats.hits == hits + 3
+
+    await item_controller.update_item(item.id, ItemUpdate(description="Updated"))
+    assert len(item_cache) == 0
+    assert (await item_controller.get_item_by_id(item.id)).description == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_quest_cache_invalidated_on_assignment(
+    quest_controller: QuestController, user_controller: UserController, faker: Faker
+):
+    quest = await quest_controller.create_quest(
+        QuestCreate(
+            name=faker.unique.word(),
+            description=faker.text(max_nb_chars=50),
+            type=Type("daily"),
+        )
+    )
+    user = await create_user(user_controller, faker)
+    assert (await quest_controller.get_quest_by_id(quest.id)).users == []
+
+    assigned = await quest_controller.assign_quest_to_user(
+        quest.id, UserQuestLinkCreate(user_ids=[user.id]), quest_start=datetime.now()
+    )
+
+    assert [user.id for user in assigned.users] == [user.id]
+    cached = await quest_controller.get_quest_by_id(quest.id)
+    assert [user.id for user in cached.users] == [user.id]
+    assert quest_cache.stats.invalidations >= 1
+
+
+@pytest.mark.asyncio
+async def test_user_view_is_cached_until_written(
+    user_controller: UserController,
+    item_controller: ItemController,
+    task_controller: TaskController,
+    comment_controller: CommentController,
+    faker: Faker,
+):
+    user = await create_user(user_controller, faker)
+    await user_controller.get_user_by_id(user.id)
+
+    with collect_query_stats() as stats:
+        assert (await user_controller.get_user_by_id(user.id)).id == user.id
+        await user_controller.get_user_by_username(user.username)
+        await user_controller.get_users(offset=0, limit=20)
+    # Only the user rows of the lookup by username and of the page
+    assert stats.statements == 2
+
+    item = await item_controller.create_item(
+        ItemCreate(name=faker.unique.word(), description=faker.text(max_nb_chars=50))
+    )
+    await item_controller.give_item_to_user(
+        item.id, UserItemLinkCreate(user_ids=[user.id])
+    )
+    assert await user_view_cache.get(user.id) is None
+    assert len((await user_controller.get_user_by_id(user.id)).items) == 1
+
+    await item_controller.update_item(item.id, ItemUpdate(description="Updated"))
+    user_view = await user_controller.get_user_by_id(user.id)
+    assert user_view.items[0].description == "Updated"
+
+    task = await task_controller.create_task(
+        TaskCreate(
+            title=faker.unique.word(),
+            description=faker.text(max_nb_chars=50),
+            completed=False,
+            category=faker.word(),
+            user_id=user.id,
+        )
+    )
+    assert len((await user_controller.get_user_by_id(user.id)).tasks) == 1
+    await comment_controller.create_comment(
+        CommentCreate(task_id=task.id, user_id=user.id, content="Well done")
+    )
+    assert len((await user_controller.get_user_by_id(user.id)).comments) == 1
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Updated"))
+    assert (await user_controller.get_user_by_id(user.id)).biography == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_user_view_loaded_across_a_write_is_not_cached(
+    monkeypatch, user_controller: UserController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    await user_view_cache.invalidate(user.id)
+    # The write commits and drops the view while the relations are loading
+    write_during(
+        monkeypatch,
+        user_controller,
+        USER_TASKS,
+        lambda: user_view_cache.invalidate(user.id),
+    )
+
+    await user_controller.get_user_by_id(user.id)
+
+    assert await user_view_cache.get(user.id) is None
+    assert user_view_cache.stats.stale_sets == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_username_created_during_lookup_is_not_cached(
+    monkeypatch, user_controller: UserController, faker: Faker
+):
+    username = faker.unique.user_name()[:18]
+    key = ("username", username)
+    write_during(
+        monkeypatch,
+        user_controller,
+        USER_BY_USERNAME,
+        lambda: missing_cache.invalidate(key),
+    )
+
+    with pytest.raises(UserUsernameNotFoundError):
+        await user_controller.get_user_by_username(username)
+
+    assert await missing_cache.get(key) is None
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from faker import Faker
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from leveluplife.conditional import format_last_modified, get_etag
+from leveluplife.controllers.item import ItemController
+from leveluplife.controllers.user import UserController
+from leveluplife.dependencies import get_item_controller
+from leveluplife.models.relationship import UserItemLinkCreate
+from leveluplife.models.user import Tribe, UserCreate, UserUpdate
+from leveluplife.models.view import UserSummaryView
+
+
+class Resource:
+    def __init__(self, id: int, created_at: datetime, updated_at=None) -> None:
+        self.id = id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+@pytest_asyncio.fixture(name="async_client")
+async def get_async_client(app: FastAPI, item_controller: ItemController):
+    # Requests run on the test's event loop, where the session is bound
+    app.dependency_overrides[get_item_controller] = lambda: item_controller
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def test_get_etag_follows_versions():
+    created_at = datetime(2024, 1, 1)
+    first = Resource(1, created_at)
+    second = Resource(2, created_at)
+
+    assert get_etag(first, second) == get_etag(first, second)
+    assert get_etag(first, second) != get_etag(first)
+    assert get_etag(first) != get_etag(
+        Resource(1, created_at, created_at + timedelta(seconds=1))
+    )
+    assert get_etag(first).startswith('W/"')
+
+
+def test_get_etag_follows_content_without_version():
+    user = UserSummaryView(
+        id=uuid4(),
+        created_at=datetime(2024, 1, 1),
+        username="JohnDoe",
+        email="john@doe.com",
+        tribe=Tribe.NEUTRALS,
+    )
+
+    assert get_etag(user) == get_etag(user.model_copy())
+    assert get_etag(user) != get_etag(user.model_copy(update={"biography": "New"}))
+
+
+@pytest.mark.asyncio
+async def test_item_conditional_get_follows_linked_users(
+    async_client: AsyncClient,
+    item_controller: ItemController,
+    user_controller: UserController,
+    faker: Faker,
+):
+    item = (
+        await async_client.post(
+            "/items/",
+            json={"name": faker.unique.word(), "description": faker.text(50)},
+        )
+    ).json()
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NEUTRALS,
+        )
+    )
+    await item_controller.give_item_to_user(
+        item["id"], UserItemLinkCreate(user_ids=[user.id])
+    )
+    etag = (await async_client.get(f"/items/{item['id']}")).headers["ETag"]
+
+    await user_controller.update_user(user.id, UserUpdate(biography="Updated"))
+    response = await async_client.get(
+        f"/items/{item['id']}", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["users"][0]["biography"] == "Updated"
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_item_conditional_get(async_client: AsyncClient, faker: Faker):
+    item = (
+        await async_client.post(
+            "/items/",
+            json={"name": faker.unique.word(), "description": faker.text(50)},
+        )
+    ).json()
+
+    response = await async_client.get(f"/items/type/name?item_name={item['name']}")
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    assert response.status_code == 200
+    not_modified = await async_client.get(
+        f"/items/type/name?item_name={item['name']}",
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    not_modified_since = await async_client.get(
+        f"/items/type/name?item_name={item['name']}",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert not_modified_since.status_code == 304
+
+    await async_client.patch(f"/items/{item['id']}", json={"description": "Updated"})
+    modified = await async_client.get(
+        f"/items/type/name?item_name={item['name']}",
+        headers={"If-None-Match": etag},
+    )
+    assert modified.status_code == 200
+    assert modified.json()["description"] == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_item_list_conditional_get(async_client: AsyncClient, faker: Faker):
+    await async_client.post(
+        "/items/",
+        json={"name": faker.unique.word(), "description": faker.text(50)},
+    )
+    etag = (await async_client.get("/items/")).headers["ETag"]
+
+    response = await async_client.get("/items/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await async_client.post(
+        "/items/",
+        json={"name": faker.unique.word(), "description": faker.text(50)},
+    )
+    response = await async_client.get("/items/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_if_modified_since_before_last_modified(
+    async_client: AsyncClient, faker: Faker
+):
+    item = (
+        await async_client.post(
+            "/items/",
+            json={"name": faker.unique.word(), "description": faker.text(50)},
+        )
+    ).json()
+    since = format_last_modified(datetime.now() - timedelta(days=1))
+
+    response = await async_client.get(
+        f"/items/type/name?item_name={item['name']}",
+        headers={"If-Modified-Since": since},
+    )
+
+    assert response.status_code == 200
@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from faker import Faker
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.testclient import TestClient
+
+from leveluplife.api import create_app
+from leveluplife.controllers.task import TaskController
+from leveluplife.controllers.user import UserController
+from leveluplife.database import QueryStats, collect_query_stats
+from leveluplife.dependencies import get_task_controller
+from leveluplife.middleware import format_server_timing
+from leveluplife.models.user import Tribe, UserCreate
+
+
+@pytest.mark.asyncio
+async def test_collect_query_stats(user_controller: UserController, faker: Faker):
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NEUTRALS,
+        )
+    )
+
+    with collect_query_stats() as stats:
+        await user_controller.get_user_by_id(user.id)
+
+    assert stats.statements == 7
+    # SQLite drivers report no rowcount for SELECT statements
+    dialect = user_controller.session.bind.dialect.name
+    assert stats.rows == (0 if dialect == "sqlite" else 1)
+    assert stats.duration > 0
+
+
+@pytest.mark.asyncio
+async def test_collect_query_stats_counts_failed_statements(
+    async_engine: AsyncEngine,
+):
+    async with async_engine.connect() as connection:
+        for _ in range(3):
+            with collect_query_stats() as stats:
+                with pytest.raises(DBAPIError):
+                    await connection.execute(text("SELECT * FROM missing_table"))
+            await connection.rollback()
+        started = connection.sync_connection.info["query_start_time"]
+
+        assert stats.statements == 1
+        assert stats.duration > 0
+        assert started == {}
+
+
+def test_format_server_timing():
+    stats = QueryStats(statements=3, duration=0.0125, rows=42)
+
+    assert (
+        format_server_timing(stats, 0.05)
+        == 'db;dur=12.50;desc="3 statements, 42 rows", app;dur=50.00'
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_stats_middleware_adds_server_timing(
+    task_controller: TaskController, app: FastAPI, client: TestClient
+):
+    def _mock_get_tasks():
+        task_controller.get_tasks = AsyncMock(return_value=[])
+        return task_controller
+
+    app.dependency_overrides[get_task_controller] = _mock_get_tasks
+
+    response = client.get("/tasks")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith(
+        'db;dur=0.00;desc="0 statements, 0 rows", app;dur='
+    )
+
+
+def test_cors_exposes_response_headers():
+    client = TestClient(create_app(lifespan=None))
+
+    response = client.get("/missing", headers={"Origin": "http://example.com"})
+
+    exposed = response.headers["Access-Control-Expose-Headers"].split(", ")
+    assert {"X-Next-Cursor", "ETag", "Last-Modified", "Server-Timing"} <= set(exposed)
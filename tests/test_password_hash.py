@@ -0,0 +1,69 @@
+import pytest
+from faker import Faker
+from sqlmodel import Session, select
+
+from leveluplife.auth.hash import (
+    BCRYPT_ROUNDS_RANGE,
+    HashPolicy,
+    calibrate_policy,
+    get_password_hash,
+    verify_and_update_password,
+)
+from leveluplife.auth.pool import password_hasher
+from leveluplife.auth.utils import authenticate_user
+from leveluplife.controllers.user import UserController
+from leveluplife.models.table import User
+from leveluplife.models.user import Tribe, UserCreate
+
+
+def test_calibrate_policy_stays_within_bounds():
+    policy = calibrate_policy(("bcrypt",), target_ms=1)
+
+    assert policy.schemes == ("bcrypt",)
+    assert policy.bcrypt_rounds == BCRYPT_ROUNDS_RANGE[0]
+
+
+def test_verify_and_update_password():
+    policy = HashPolicy(bcrypt_rounds=12)
+
+    current = get_password_hash("password", HashPolicy(bcrypt_rounds=11))
+    outdated = get_password_hash("password", HashPolicy(bcrypt_rounds=10))
+
+    assert verify_and_update_password("password", current, policy) == (True, None)
+    valid, new_hash = verify_and_update_password("password", outdated, policy)
+    assert valid
+    assert new_hash.startswith("$2b$12$")
+    assert verify_and_update_password("wrong", outdated, policy) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_rehashes_outdated_hash(
+    user_controller: UserController, session: Session, faker: Faker
+):
+    password = faker.password()
+    user = await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=password,
+            tribe=Tribe.NEUTRALS,
+        )
+    )
+    await user_controller.update_password_hash(
+        user, get_password_hash(password, HashPolicy(bcrypt_rounds=10))
+    )
+    policy = password_hasher.policy
+    password_hasher.policy = HashPolicy(schemes=("argon2", "bcrypt"))
+    try:
+        assert await authenticate_user(user_controller, user.username, password)
+    finally:
+        password_hasher.policy = policy
+
+    stored_hash = session.exec(select(User.password).where(User.id == user.id)).one()
+    assert stored_hash.startswith("$argon2id$")
+
+    # Hashes of a scheme dropped from the preferences still verify
+    assert await authenticate_user(user_controller, user.username, password)
+    session.expire_all()
+    stored_hash = session.exec(select(User.password).where(User.id == user.id)).one()
+    assert stored_hash.startswith("$2b$12$")
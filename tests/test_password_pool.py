@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+
+from leveluplife.auth.hash import verify_password
+from leveluplife.auth.pool import PasswordHasher
+from leveluplife.models.error import PasswordHashingUnavailableError
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_hash_and_verify():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    try:
+        hashed_password = await hasher.hash("password")
+
+        assert verify_password("password", hashed_password)
+        assert await hasher.verify("password", hashed_password)
+        assert not await hasher.verify("wrong password", hashed_password)
+        assert hasher.snapshot()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    try:
+        results = await asyncio.gather(
+            *(hasher.hash("password") for _ in range(3)), return_exceptions=True
+        )
+
+        rejected = [r for r in results if isinstance(r, BaseException)]
+        assert len(rejected) == 1
+        assert isinstance(rejected[0], PasswordHashingUnavailableError)
+        assert rejected[0].status_code == 503
+        assert hasher.stats.rejected == 1
+        assert hasher.stats.completed == 2
+        assert hasher.stats.failed == 0
+        assert hasher.stats.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_counts_failures_and_cancellations():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    try:
+        with pytest.raises(ValueError):
+            await hasher._run(int, "not a number")
+        call = asyncio.ensure_future(hasher._run(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        assert hasher.snapshot()["completed"] == 0
+        assert hasher.snapshot()["failed"] == 1
+        assert hasher.snapshot()["cancelled"] == 1
+        assert hasher.stats.pending == 0
+    finally:
+        hasher.shutdown()
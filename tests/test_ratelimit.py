@@ -0,0 +1,233 @@
+from typing import Annotated
+
+import pytest
+from fastapi import FastAPI, Form
+from starlette.testclient import TestClient
+
+from leveluplife.api import create_app
+from leveluplife.middleware import LoginRateLimitMiddleware
+from leveluplife.ratelimit import (
+    BucketPolicy,
+    LoginRateLimiter,
+    MemoryRateLimitBackend,
+    SQLiteRateLimitBackend,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+POLICY = BucketPolicy(burst=2, per_minute=6)
+
+BOUNDARY = "loginboundary"
+
+
+def multipart_form(**fields: str) -> bytes:
+    parts = [
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+        f"{value}\r\n"
+        for name, value in fields.items()
+    ]
+    return ("".join(parts) + f"--{BOUNDARY}--\r\n").encode()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_refills_and_expires():
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(maxsize=10, clock=clock)
+
+    assert await backend.take("key", POLICY)
+    assert await backend.take("key", POLICY)
+    assert not await backend.take("key", POLICY)
+    clock.now = 10
+    assert await backend.take("key", POLICY)
+    assert not await backend.take("key", POLICY)
+
+    clock.now = 30
+    await backend.take("other", POLICY)
+    assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded():
+    backend = MemoryRateLimitBackend(maxsize=2, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        await backend.take(key, POLICY)
+
+    assert len(backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "ratelimit.db")
+    first = SQLiteRateLimitBackend(path, clock=clock)
+    second = SQLiteRateLimitBackend(path, clock=clock)
+
+    assert await first.take("key", POLICY)
+    assert await second.take("key", POLICY)
+    assert not await first.take("key", POLICY)
+    clock.now = 10
+    assert await second.take("key", POLICY)
+    clock.now = 100
+    await first.take("other", POLICY)
+    assert len(second) == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_checks_ip_then_username():
+    limiter = LoginRateLimiter(
+        MemoryRateLimitBackend(maxsize=10, clock=FakeClock()),
+        ip_policy=BucketPolicy(burst=3, per_minute=60),
+        username_policy=BucketPolicy(burst=1, per_minute=1),
+    )
+
+    assert await limiter.acquire("1.2.3.4", "alice") == 0
+    assert await limiter.acquire("1.2.3.4", "alice") == 60
+    assert await limiter.acquire("1.2.3.4", "bob") == 0
+    assert await limiter.acquire("1.2.3.4", "carol") == 1
+    assert limiter.snapshot()["allowed"] == 2
+    assert limiter.snapshot()["rejected_username"] == 1
+    assert limiter.snapshot()["rejected_ip"] == 1
+
+
+def create_login_app(calls: list[str], **kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        LoginRateLimitMiddleware,
+        limiter=LoginRateLimiter(
+            MemoryRateLimitBackend(maxsize=10, clock=FakeClock()),
+            ip_policy=BucketPolicy(burst=10, per_minute=60),
+            username_policy=BucketPolicy(burst=2, per_minute=1),
+        ),
+        **kwargs,
+    )
+
+    @app.post("/token/")
+    async def login(username: Annotated[str, Form()]) -> dict:
+        calls.append(username)
+        return {"username": username}
+
+    return app
+
+
+def test_login_rate_limit_middleware_rejects_before_route():
+    calls = []
+    client = TestClient(create_login_app(calls))
+    responses = [
+        client.post("/token/", data={"username": "alice", "password": "wrong"})
+        for _ in range(3)
+    ]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[0].json() == {"username": "alice"}
+    assert responses[2].headers["Retry-After"] == "60"
+    assert responses[2].json() == {
+        "message": "Too many login attempts, retry later.",
+        "name": "TooManyLoginAttemptsError",
+        "status_code": 429,
+    }
+    assert calls == ["alice", "alice"]
+
+
+def test_login_rate_limit_middleware_reads_multipart_forms():
+    calls = []
+    client = TestClient(create_login_app(calls))
+    responses = [
+        client.post(
+            "/token/",
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            content=multipart_form(username=username, password="wrong"),
+        )
+        for username in ("alice", "alice", "bob", "alice")
+    ]
+
+    assert [response.status_code for response in responses] == [200, 200, 200, 429]
+    assert calls == ["alice", "alice", "bob"]
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_middleware_replays_body_once():
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(await receive())
+        received.append(await receive())
+
+    messages = [
+        {"type": "http.request", "body": b"username=alice", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    middleware = LoginRateLimitMiddleware(
+        app,
+        limiter=LoginRateLimiter(
+            MemoryRateLimitBackend(maxsize=10, clock=FakeClock()),
+            ip_policy=POLICY,
+            username_policy=POLICY,
+        ),
+    )
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/token/",
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+        "client": ("1.2.3.4", 1234),
+    }
+    await middleware(scope, receive, None)
+
+    assert received == [
+        {"type": "http.request", "body": b"username=alice", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+
+def test_login_rate_limit_middleware_caps_the_body():
+    calls = []
+    client = TestClient(create_login_app(calls, max_body_size=64))
+    response = client.post("/token/", data={"username": "alice", "password": "x" * 100})
+
+    assert response.status_code == 413
+    assert response.json()["name"] == "LoginBodyTooLargeError"
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_limiter_without_username_only_takes_ip_bucket():
+    backend = MemoryRateLimitBackend(maxsize=10, clock=FakeClock())
+    limiter = LoginRateLimiter(
+        backend,
+        ip_policy=BucketPolicy(burst=3, per_minute=60),
+        username_policy=BucketPolicy(burst=1, per_minute=1),
+    )
+
+    assert [await limiter.acquire("1.2.3.4", "") for _ in range(4)] == [0, 0, 0, 1]
+    assert len(backend) == 1
+
+
+def test_rate_limited_login_carries_cors_headers():
+    limiter = LoginRateLimiter(
+        MemoryRateLimitBackend(maxsize=10, clock=FakeClock()),
+        ip_policy=BucketPolicy(burst=10, per_minute=60),
+        # Every attempt on a username is over the limit
+        username_policy=BucketPolicy(burst=0, per_minute=1),
+    )
+    client = TestClient(create_app(lifespan=None, rate_limiter=limiter))
+
+    response = client.post(
+        "/token/",
+        data={"username": "alice", "password": "wrong"},
+        headers={"Origin": "http://example.com"},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+    assert "Retry-After" in response.headers["Access-Control-Expose-Headers"]
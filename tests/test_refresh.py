@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from faker import Faker
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from leveluplife.auth.revocation import BloomFilter, RevocationIndex
+from leveluplife.auth.utils import (
+    create_tokens,
+    get_current_principal,
+    get_user_claims,
+    refresh_tokens,
+    revoke_refresh_token,
+)
+from leveluplife.controllers.token import TokenController
+from leveluplife.controllers.user import UserController
+from leveluplife.models.user import Tribe, UserCreate
+
+
+@pytest.fixture(name="token_controller")
+def get_token_controller(async_session: AsyncSession) -> TokenController:
+    return TokenController(async_session)
+
+
+async def create_user(user_controller: UserController, faker: Faker):
+    return await user_controller.create_user(
+        UserCreate(
+            username=faker.unique.user_name()[:18],
+            email=faker.unique.email(),
+            password=faker.password(),
+            tribe=Tribe.NEUTRALS,
+        )
+    )
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [index.to_bytes(4, "little") for index in range(1000)]
+    for key in keys[:500]:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys[:500])
+    false_positives = sum(key in bloom for key in keys[500:])
+    assert false_positives < 25
+    assert bloom.count == 500
+
+
+@pytest.mark.asyncio
+async def test_revocation_index_rebuilds_past_capacity(
+    user_controller: UserController, token_controller: TokenController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    index = RevocationIndex(capacity=2, error_rate=0.01)
+    await index.load(token_controller)
+    expired = uuid4()
+    await index.revoke(
+        token_controller, expired, user.id, datetime.now() - timedelta(minutes=1)
+    )
+    jtis = [uuid4() for _ in range(index.bloom.capacity)]
+
+    for jti in jtis:
+        await index.revoke(
+            token_controller, jti, user.id, datetime.now() + timedelta(days=1)
+        )
+
+    assert index.rebuilds == 1
+    assert index.bloom.count <= index.bloom.capacity
+    assert all(jti.bytes in index.bloom for jti in jtis)
+    assert not await token_controller.is_revoked(expired)
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_rotates(
+    user_controller: UserController, token_controller: TokenController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    tokens = create_tokens(get_user_claims(user))
+
+    rotated = await refresh_tokens(
+        tokens.refresh_token, user_controller, token_controller
+    )
+
+    assert rotated.refresh_token != tokens.refresh_token
+    principal = await get_current_principal(rotated.access_token, user_controller)
+    assert principal.id == user.id
+    assert await token_controller.get_revoked_token_ids()
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_every_session(
+    user_controller: UserController, token_controller: TokenController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    tokens = create_tokens(get_user_claims(user))
+    rotated = await refresh_tokens(
+        tokens.refresh_token, user_controller, token_controller
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await refresh_tokens(tokens.refresh_token, user_controller, token_controller)
+    assert exc_info.value.status_code == 401
+
+    for token in (rotated.access_token, tokens.access_token):
+        with pytest.raises(HTTPException):
+            await get_current_principal(token, user_controller)
+    with pytest.raises(HTTPException):
+        await refresh_tokens(rotated.refresh_token, user_controller, token_controller)
+
+
+@pytest.mark.asyncio
+async def test_revoked_refresh_token_is_rejected(
+    user_controller: UserController, token_controller: TokenController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    tokens = create_tokens(get_user_claims(user))
+
+    await revoke_refresh_token(tokens.refresh_token, token_controller)
+
+    with pytest.raises(HTTPException):
+        await refresh_tokens(tokens.refresh_token, user_controller, token_controller)
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(
+    user_controller: UserController, token_controller: TokenController, faker: Faker
+):
+    user = await create_user(user_controller, faker)
+    tokens = create_tokens(get_user_claims(user))
+
+    with pytest.raises(HTTPException):
+        await get_current_principal(tokens.refresh_token, user_controller)
+    with pytest.raises(HTTPException):
+        await refresh_tokens(tokens.access_token, user_controller, token_controller)
@@ -0,0 +1,201 @@
+import asyncio
+import socket
+import time
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from leveluplife.cache import CACHES, TTLCache, describe_key
+from leveluplife.cache import shared as shared_module
+from leveluplife.cache.resp import RespConnection
+from leveluplife.cache.server import LocalRespServer
+from leveluplife.cache.shared import SharedStore, decode_key, encode_key
+from leveluplife.models.user import Tribe
+from leveluplife.models.view import UserView
+
+
+@pytest.fixture(name="server")
+def get_server():
+    with LocalRespServer() as server:
+        yield server
+
+
+def create_caches(url: str, name: str, value_type=int) -> tuple[TTLCache, TTLCache]:
+    # Two workers, each with its own connection and local tier
+    first = TTLCache(name, 10, 60, value_type, shared=SharedStore(url))
+    second = TTLCache(name, 10, 60, value_type, shared=SharedStore(url))
+    CACHES.pop(name)
+    return first, second
+
+
+def wait_for(condition) -> None:
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_resp_connection(server: LocalRespServer):
+    connection = RespConnection(server.url)
+
+    assert connection.execute("PING") == "PONG"
+    assert connection.execute("SET", "key", b"value", "PX", 60000) == "OK"
+    assert connection.execute("GET", "key") == b"value"
+    assert connection.execute("INCR", "counter") == 1
+    assert connection.execute("DEL", "key", "missing") == 1
+    assert connection.execute("GET", "key") is None
+    connection.close()
+
+
+def test_cache_keys_round_trip():
+    user_id = uuid4()
+    for key in ["name", 3, None, user_id, ("page", 0, 20, None), ("id", user_id)]:
+        assert decode_key(encode_key(key)) == key
+    with pytest.raises(TypeError):
+        encode_key(object())
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_between_workers(server: LocalRespServer):
+    first, second = create_caches(server.url, "test_shared", UserView)
+    user_view = UserView(
+        id=uuid4(),
+        created_at=datetime(2024, 1, 1),
+        username="JohnDoe",
+        email="john@doe.com",
+        tribe=Tribe.NEUTRALS,
+    )
+
+    await first.set("user", user_view)
+    shared = await second.get("user")
+
+    assert shared == user_view
+    assert second.stats.shared_hits == 1
+    assert await second.get("user") is not None
+    assert second.stats.shared_hits == 1
+
+    await first.invalidate("user")
+    wait_for(lambda: len(second) == 0)
+    assert await second.get("user") is None
+    assert second.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_clear_is_broadcast(server: LocalRespServer):
+    first, second = create_caches(server.url, "test_shared_clear")
+    await first.set("a", 1)
+    assert await second.get("a") == 1
+
+    await first.clear()
+
+    wait_for(lambda: len(second) == 0)
+    assert await second.get("a") is None
+    await first.set("a", 2)
+    assert await second.get("a") == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_without_value_type_keeps_values_local(
+    server: LocalRespServer,
+):
+    first, second = create_caches(server.url, "test_shared_local", None)
+    await first.set("user", "secret")
+    await second.set("user", "secret")
+
+    assert server.server.values == {}
+    assert first.snapshot()["backend"] == "broadcast"
+    await first.invalidate("user")
+    wait_for(lambda: len(second) == 0)
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_ignores_invalid_entries(server: LocalRespServer):
+    first, _ = create_caches(server.url, "test_shared_invalid")
+    connection = RespConnection(server.url)
+    connection.execute("SET", "leveluplife:test_shared_invalid:0:'key'", b"\x80\x04.")
+    connection.close()
+
+    assert await first.get("key") is None
+    assert first.stats.shared_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_over_unix_socket(tmp_path):
+    with LocalRespServer(path=str(tmp_path / "cache.sock")) as server:
+        first, second = create_caches(server.url, "test_shared_unix", tuple[str, ...])
+        await first.set(("page", 0, 20, None), ("row",))
+
+        assert server.url.startswith("unix://")
+        assert await second.get(("page", 0, 20, None)) == ("row",)
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_falls_back_to_local_tier():
+    store = SharedStore("redis://127.0.0.1:1")
+    cache = TTLCache("test_unavailable", 10, 60, str, shared=store)
+    CACHES.pop("test_unavailable")
+
+    await cache.set("key", "value")
+
+    assert await cache.get("key") == "value"
+    assert await cache.get("other") is None
+    assert store.errors == 1
+    assert store.snapshot()["available"] is False
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_shared_store_does_not_block_the_loop():
+    # Connections are accepted by the kernel, but never answered
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+        store = SharedStore(f"redis://127.0.0.1:{port}")
+        cache = TTLCache("test_unresponsive", 10, 60, str, shared=store)
+        CACHES.pop("test_unresponsive")
+
+        lookup = asyncio.create_task(cache.get("key"))
+        started = time.monotonic()
+        await asyncio.sleep(0.05)
+
+        assert time.monotonic() - started < 0.5
+        assert not lookup.done()
+        assert await lookup is None
+        assert store.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_subscription_clears_local_tier_once(monkeypatch):
+    monkeypatch.setattr(shared_module, "RETRY_AFTER", 0.01)
+    server = LocalRespServer().__enter__()
+    store = SharedStore(server.url)
+    cache = TTLCache("test_subscription", 10, 60, shared=store)
+    CACHES.pop("test_subscription")
+    channel = shared_module.INVALIDATION_CHANNEL.encode()
+    wait_for(lambda: server.server.subscribers.get(channel))
+    await cache.set("before", 1)
+
+    server.__exit__(None, None, None)
+    wait_for(lambda: len(cache) == 0)
+    await cache.set("during", 2)
+    # The subscriber keeps retrying, the local tier keeps serving
+    time.sleep(0.2)
+
+    assert await cache.get("during") == 2
+    assert cache.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_key_snapshot():
+    cache = TTLCache("test_keys", maxsize=2, ttl=60)
+    CACHES.pop("test_keys")
+    await cache.set("a", 1)
+    for _ in range(3):
+        await cache.get("a")
+    await cache.get(("username", "JohnDoe"))
+
+    snapshot = cache.key_snapshot(limit=2)
+    assert snapshot[0] == {"key": describe_key("a"), "hits": 3, "misses": 0}
+    assert snapshot[1]["key"].startswith("username:")
+    assert "JohnDoe" not in snapshot[1]["key"]
+    await cache.get("c")
+    assert list(cache.key_stats) == [("username", "JohnDoe"), "c"]
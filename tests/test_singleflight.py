@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from leveluplife.singleflight import FLIGHTS, SingleFlight
+
+
+class Loader:
+    def __init__(self, value: str = "value", delay: float = 0.01) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight("test-share", timeout=1)
+    load = Loader()
+
+    results = await asyncio.gather(*(flight.run("key", load) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert load.calls == 1
+    assert flight.snapshot() == {
+        "in_flight": 0,
+        "timeout": 1,
+        "leaders": 1,
+        "coalesced": 4,
+        "timeouts": 0,
+        "errors": 0,
+    }
+    assert FLIGHTS["test-share"] is flight
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_load_again():
+    flight = SingleFlight("test-keys", timeout=1)
+    load = Loader()
+
+    await asyncio.gather(flight.run("a", load), flight.run("b", load))
+    await flight.run("a", load)
+
+    assert load.calls == 3
+    assert flight.stats.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_leader_error_is_raised_to_every_caller():
+    flight = SingleFlight("test-error", timeout=1)
+
+    async def fail() -> str:
+        await asyncio.sleep(0.01)
+        raise LookupError("missing")
+
+    results = await asyncio.gather(
+        *(flight.run("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, LookupError) for result in results)
+    assert flight.stats.errors == 1
+    assert flight.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_follower_loads_itself_after_timeout():
+    flight = SingleFlight("test-timeout", timeout=0.01)
+    slow = Loader("slow", delay=0.2)
+    fast = Loader("fast", delay=0)
+
+    leader = asyncio.create_task(flight.run("key", slow))
+    await asyncio.sleep(0)
+
+    assert await flight.run("key", fast) == "fast"
+    assert await leader == "slow"
+    assert flight.stats.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_loads_itself_when_leader_is_cancelled():
+    flight = SingleFlight("test-cancel", timeout=1)
+    slow = Loader("slow", delay=1)
+    load = Loader()
+
+    leader = asyncio.create_task(flight.run("key", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.run("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flight.snapshot()["in_flight"] == 0